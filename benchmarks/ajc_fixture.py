@@ -0,0 +1,114 @@
+"""
+Local stand-in for an AJC warn_lookups site, built from a saved data/<state>.json.
+Serves a paginated search list and one detail page per record, with an
+artificial per-request latency so concurrency shows up in timings.
+
+    $env:PYTHONPATH="."; uv run benchmarks/ajc_fixture.py
+"""
+import html
+import json
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+LIST_PATH = "/search/warn_lookups"
+
+
+def _us_date(value):
+    return date.fromisoformat(value).strftime("%m/%d/%Y") if value else ""
+
+
+def list_page(notices, page, per_page):
+    start = (page - 1) * per_page
+    rows = "".join(
+        f'<tr><td><a href="{LIST_PATH}/{notice_id}">{html.escape(r["employer"]["name"] or "")}</a></td>'
+        f'<td>{_us_date(r["warn_date"])}</td></tr>'
+        for notice_id, r in notices[start:start + per_page]
+    )
+    next_link = f'<a class="next_page" rel="next" href="{LIST_PATH}?page={page + 1}">Next</a>' if start + per_page < len(notices) else ""
+    return f"<html><body><table>{rows}</table>{next_link}</body></html>"
+
+
+def detail_page(record):
+    location = record["location"]
+    city_line = f'{location["municipality"]}, {(location["state"] or "").upper()} {location["zip"] or ""}'.strip()
+    address = "<br>".join(html.escape(part) for part in [location["street"], city_line if location["municipality"] else None] if part)
+    fields = [
+        ("Address", address),
+        ("Notice Date", _us_date(record["warn_date"])),
+        ("Number of Employees Affected", "" if record["impacted"] is None else record["impacted"]),
+        ("Layoff Date", _us_date(record["layoff_date"])),
+    ]
+    body = "".join(f"<h3>{label}</h3><div>{value}</div>" for label, value in fields)
+    return f'<html><body><h1>{html.escape(record["employer"]["name"] or "")}</h1>{body}</body></html>'
+
+
+class FixtureServer:
+    """Serves `records` on 127.0.0.1 from a background thread; use as a context manager."""
+
+    def __init__(self, records, per_page=20, latency=0.05):
+        self.notices = list(enumerate(records, start=1))
+        self.per_page = per_page
+        self.latency = latency
+        self.requests = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}{LIST_PATH}?commit=Search"
+
+    def _handler(self):
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                fixture.requests += 1
+                time.sleep(fixture.latency)
+                parsed = urlparse(self.path)
+                if parsed.path == LIST_PATH:
+                    page = int(parse_qs(parsed.query).get("page", ["1"])[0])
+                    self._send(list_page(fixture.notices, page, fixture.per_page))
+                elif parsed.path.startswith(LIST_PATH + "/") and parsed.path.rsplit("/", 1)[-1].isdigit():
+                    index = int(parsed.path.rsplit("/", 1)[-1]) - 1
+                    if 0 <= index < len(fixture.notices):
+                        self._send(detail_page(fixture.notices[index][1]))
+                    else:
+                        self.send_error(404)
+                else:
+                    self.send_error(404)
+
+            def _send(self, body):
+                data = body.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def load_records(path="data/az.json", limit=None):
+    with open(path) as f:
+        records = json.load(f)
+    return records[:limit] if limit else records
+
+
+if __name__ == "__main__":
+    with FixtureServer(load_records()) as server:
+        print(f"Serving {len(server.notices)} notices at {server.url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,40 @@
+"""
+Serial vs concurrent detail-page fetching in the browser engine of scrape_ajc,
+against the local fixture server (benchmarks/ajc_fixture.py) serving the first
+120 AZ notices.
+
+    $env:PYTHONPATH="."; uv run benchmarks/bench_ajc_concurrency.py
+"""
+import os
+import tempfile
+import time
+from benchmarks.ajc_fixture import FixtureServer, load_records
+from src import scrape_ajc
+
+RECORDS = 120
+LATENCY = 0.1
+
+
+def timed(url, concurrency, output_file):
+    start = time.perf_counter()
+    results = scrape_ajc.scrape_ajc(url, "az", output_file, concurrency=concurrency, engine="browser")
+    return results, time.perf_counter() - start
+
+
+def main():
+    # The pause between result pages is politeness towards the real site
+    scrape_ajc.PAGE_DELAY = 0
+    records = load_records(limit=RECORDS)
+    with FixtureServer(records, latency=LATENCY) as server, tempfile.TemporaryDirectory() as tmp:
+        output_file = os.path.join(tmp, "az.json")
+        serial, serial_time = timed(server.url, 1, output_file)
+        concurrent, concurrent_time = timed(server.url, scrape_ajc.DEFAULT_CONCURRENCY, output_file)
+
+    assert [r["link"] for r in serial] == [r["link"] for r in concurrent], "concurrent run changed record order"
+    print(f"{len(serial)} notices, {LATENCY * 1000:.0f} ms latency per request")
+    print(f"serial:       {serial_time:6.1f}s")
+    print(f"concurrent:   {concurrent_time:6.1f}s ({scrape_ajc.DEFAULT_CONCURRENCY} at once, {serial_time / concurrent_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
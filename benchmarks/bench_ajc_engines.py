@@ -0,0 +1,52 @@
+"""
+Wall time and peak memory of the http and browser engines of scrape_ajc
+against the local fixture server (benchmarks/ajc_fixture.py) with all AZ notices.
+Each engine runs in a fresh process; memory includes child processes that
+have exited (the Playwright driver, not Chromium's own helpers).
+
+    $env:PYTHONPATH="."; uv run benchmarks/bench_ajc_engines.py
+"""
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from benchmarks.ajc_fixture import FixtureServer, load_records
+from src import scrape_ajc
+
+LATENCY = 0.02
+
+
+def run_engine(url, engine, output_file, queue):
+    scrape_ajc.PAGE_DELAY = 0
+    try:
+        start = time.perf_counter()
+        count = len(scrape_ajc.scrape_ajc(url, "az", output_file, engine=engine))
+        elapsed = time.perf_counter() - start
+    except Exception as e:
+        queue.put((engine, None, f"{type(e).__name__}: {e}".splitlines()[0], None))
+        return
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    queue.put((engine, count, elapsed, peak / 1024))
+
+
+def main():
+    records = load_records()
+    queue = multiprocessing.Queue()
+    with FixtureServer(records, latency=LATENCY) as server, tempfile.TemporaryDirectory() as tmp:
+        for engine in scrape_ajc.ENGINES:
+            worker = multiprocessing.Process(target=run_engine, args=(server.url, engine, os.path.join(tmp, f"{engine}.json"), queue))
+            worker.start()
+            worker.join()
+
+    print(f"\n{len(records)} notices, {LATENCY * 1000:.0f} ms latency per request")
+    while not queue.empty():
+        engine, count, elapsed, peak_mb = queue.get()
+        if count is None:
+            print(f"{engine:<8} failed: {elapsed}")
+        else:
+            print(f"{engine:<8} {count} records in {elapsed:6.1f}s, peak RSS {peak_mb:,.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Time of diffing a state's output against its previous snapshot for `rows`
+synthetic records and its multiples, with a few percent of notices added,
+corrected and withdrawn between the two runs, to show the diff stays linear.
+
+    $env:PYTHONPATH="."; uv run benchmarks/bench_change_feed.py [rows]
+"""
+import random
+import sys
+import time
+from datetime import date, timedelta
+from src.changes import diff, keyed
+
+
+def synthetic_records(count, seed=0):
+    rng = random.Random(seed)
+    start = date(2010, 1, 1)
+    return [{
+        "employer": {"name": f"Employer {i}", "address": None},
+        "location": {"street": None, "municipality": f"City {rng.randrange(500)}", "state": "ca", "zip": None},
+        "union": None, "contact": None,
+        "warn_date": (start + timedelta(days=rng.randrange(5000))).isoformat(), "layoff_date": None, "type": None,
+        "impacted": rng.randrange(1, 500), "notes": None, "link": None, "employer_id": None,
+    } for i in range(count)]
+
+
+def next_run(records, seed=1):
+    rng = random.Random(seed)
+    kept = [dict(r, impacted=r["impacted"] + 1) if rng.random() < 0.02 else r for r in records if rng.random() >= 0.01]
+    return kept + synthetic_records(len(records) // 50, seed=seed)[:len(records) // 50]
+
+
+def main():
+    base = int(sys.argv[1]) if len(sys.argv) > 1 else 25_000
+    for count in (base, base * 2, base * 4, base * 8):
+        before = synthetic_records(count)
+        after = next_run(before)
+        previous = {key: (digest, record) for key, digest, record in keyed(before, "ca")}
+        start = time.perf_counter()
+        counts = {}
+        for change, *_ in diff(previous, keyed(after, "ca")):
+            counts[change] = counts.get(change, 0) + 1
+        elapsed = time.perf_counter() - start
+        print(f"{count:>8} records: {elapsed:6.2f}s  {elapsed / count * 1e6:5.1f} us/record  {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Time of Deduper over `rows` synthetic records and its multiples, where about
+a tenth are exact repeats and a few percent are misspelled repeats, to show
+the cost per record stays flat as the history grows.
+
+    $env:PYTHONPATH="."; uv run benchmarks/bench_dedup.py [rows]
+"""
+import random
+import sys
+import time
+from datetime import date, timedelta
+from src.dedup import Deduper
+
+CITIES = ["Sunnyvale", "San Jose", "Fresno", "Oakland", "Los Angeles", "San Diego", "Irvine", None]
+SUFFIXES = ["Inc.", "LLC", "Corp", "", "Company"]
+
+
+def synthetic_records(count, seed=0):
+    rng = random.Random(seed)
+    start = date(2010, 1, 1)
+    records = []
+    for i in range(count):
+        if records and rng.random() < 0.1:
+            repeat = dict(rng.choice(records))
+            if rng.random() < 0.3:
+                name = repeat["employer"]["name"]
+                cut = rng.randrange(1, len(name))
+                repeat["employer"] = {"name": name[:cut] + name[cut + 1:], "address": None}
+            records.append(repeat)
+            continue
+        warn_date = start + timedelta(days=rng.randrange(5000))
+        records.append({
+            "employer": {"name": f"Employer Number {i} {rng.choice(SUFFIXES)}".strip(), "address": None},
+            "location": {"street": None, "municipality": rng.choice(CITIES), "state": "ca", "zip": f"9{rng.randrange(4000, 6000)}"},
+            "union": None, "contact": None,
+            "warn_date": warn_date.isoformat(), "layoff_date": None, "type": None,
+            "impacted": rng.randrange(1, 500), "notes": None, "link": None,
+        })
+    return records
+
+
+def main():
+    base = int(sys.argv[1]) if len(sys.argv) > 1 else 25_000
+    for count in (base, base * 2, base * 4, base * 8):
+        records = synthetic_records(count)
+        deduper = Deduper("bench")
+        start = time.perf_counter()
+        kept = deduper.filter(records, "synthetic")
+        elapsed = time.perf_counter() - start
+        counts = deduper.counts["synthetic"]
+        print(f"{count:>8} records: {elapsed:6.2f}s  {elapsed / count * 1e6:5.1f} us/record  "
+              f"{len(kept)} kept, {counts['exact']} exact, {counts['near']} near")
+
+
+if __name__ == "__main__":
+    main()
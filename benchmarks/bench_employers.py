@@ -0,0 +1,83 @@
+"""
+Time of each step of employer resolution over `rows` synthetic records: a few
+thousand base employers written with different suffixes, punctuation, site
+names and typos, like the same company across states. canonical_name,
+cluster_names and assign_ids are timed on the names, then resolve_states end
+to end on the records spread over five state outputs in a temporary
+directory: a first run (no known ids, every output rewritten) and a rerun
+(ids reused, nothing rewritten).
+
+    $env:PYTHONPATH="."; uv run benchmarks/bench_employers.py [rows]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from src.employers import assign_ids, canonical_name, cluster_names, resolve_states
+from src.models import record_dict
+from src.output import write_records
+
+WORDS = ["acme", "global", "pacific", "general", "united", "national", "american", "premier", "summit",
+         "health", "logistics", "foods", "services", "systems", "manufacturing", "solutions", "energy",
+         "retail", "technologies", "partners", "medical", "transport", "security", "brands", "airlines"]
+SUFFIXES = ["Inc.", "LLC", ", L.L.C.", "Corp", "Corporation", "", "", "Co."]
+SITES = ["Austin", "Dallas Plant 2", "North Yard", "Building B", "DC 17", "Fresno"]
+
+
+def employer_names(count, seed=0):
+    rng = random.Random(seed)
+    bases = []
+    for i in range(max(count // 40, 50)):
+        # A made-up distinctive word keeps unrelated employers apart, as real names mostly do
+        word = "".join(rng.choice("bcdfghklmnprstvz") + rng.choice("aeiou") for _ in range(rng.randrange(2, 4)))
+        bases.append(" ".join([word.title()] + rng.sample(WORDS, rng.randrange(0, 3))).title())
+    names = []
+    for _ in range(count):
+        name = rng.choice(bases)
+        roll = rng.random()
+        if roll < 0.2:
+            name = name.upper()
+        elif roll < 0.3:
+            cut = rng.randrange(1, len(name))
+            name = name[:cut] + name[cut + 1:]
+        if rng.random() < 0.2:
+            name = f"{name} - {rng.choice(SITES)}"
+        names.append(f"{name} {rng.choice(SUFFIXES)}".strip())
+    return names
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    names = employer_names(count)
+    start = time.perf_counter()
+    canonical = {name: canonical_name(name) for name in set(names)}
+    normalized = time.perf_counter()
+    groups = cluster_names(canonical.values())
+    clustered = time.perf_counter()
+    ids = assign_ids(groups)
+    assigned = time.perf_counter()
+    distinct = len(set(canonical.values()))
+    assert len(set(ids.values())) == len(groups)
+    print(f"{count} records, {len(canonical)} distinct names, {distinct} canonical names, {len(groups)} employers")
+    print(f"canonical_name: {normalized - start:.2f}s  cluster_names: {clustered - normalized:.2f}s  "
+          f"assign_ids: {assigned - clustered:.2f}s ({distinct * (distinct - 1) // 2:,} pairs without blocking)")
+
+    states = ["ca", "tx", "wa", "az", "md"]
+    with tempfile.TemporaryDirectory() as root:
+        cwd = os.getcwd()
+        os.chdir(root)
+        try:
+            for i, state in enumerate(states):
+                records = [record_dict(company=name, state=state) for name in names[i::len(states)]]
+                write_records(f"data/{state}.json", records, compress=False, legacy_json=False)
+            for run in ("first run", "rerun"):
+                start = time.perf_counter()
+                resolve_states(states)
+                print(f"resolve_states {run}: {time.perf_counter() - start:.2f}s")
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
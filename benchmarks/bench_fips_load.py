@@ -0,0 +1,35 @@
+"""
+Startup benchmark for the FIPS gazetteer.
+Compares reparsing data/fips.txt against loading the compiled cache.
+
+    $env:PYTHONPATH="."; uv run benchmarks/bench_fips_load.py
+"""
+import os
+import time
+from src.utils import FIPS_CACHE_FILE, load_fips_places, parse_fips_file
+
+
+def time_it(fn, repeat=20):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    # Make sure the compiled cache exists before timing the warm path
+    load_fips_places()
+    print(f"Cache file: {FIPS_CACHE_FILE} ({os.path.getsize(FIPS_CACHE_FILE)} bytes)")
+
+    parse_time = time_it(parse_fips_file)
+    cache_time = time_it(load_fips_places)
+    print(f"Reparse fips.txt:  {parse_time * 1000:.2f} ms")
+    print(f"Load cache:        {cache_time * 1000:.2f} ms")
+    print(f"Speedup:           {parse_time / cache_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
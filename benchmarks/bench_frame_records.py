@@ -0,0 +1,115 @@
+"""
+Records/sec of the whole-column conversion (tx.parse_sheet / ca.parse_sheet)
+against the previous per-row iterrows loop, on sheets rebuilt from data/tx.json
+and data/ca.json.
+
+    $env:PYTHONPATH="."; uv run benchmarks/bench_frame_records.py
+"""
+import json
+import time
+import pandas as pd
+from src import ca, tx
+from src.models import WarnRecord, Employee, Address
+from src.utils import clean_impacted, derive_warn_type, parse_address, _parse_address_cached
+
+LINK = "https://example.com/warn.xlsx"
+
+
+def tx_sheet():
+    with open("data/tx.json") as f:
+        records = json.load(f)
+    return pd.DataFrame({
+        'NOTICE_DATE': pd.to_datetime([r['warn_date'] for r in records]),
+        'JOB_SITE_NAME': [r['employer']['name'] for r in records],
+        'COUNTY_NAME': [(r['notes'] or '').replace('County: ', '') or None for r in records],
+        'TOTAL_LAYOFF_NUMBER': [r['impacted'] for r in records],
+        'LayOff_Date': pd.to_datetime([r['layoff_date'] for r in records]),
+        'CITY_NAME': [r['location']['municipality'] for r in records],
+    })
+
+
+def ca_sheet():
+    with open("data/ca.json") as f:
+        records = json.load(f)
+    return pd.DataFrame({
+        'Notice Date': pd.to_datetime([r['warn_date'] for r in records]),
+        'Effective Date': [r['layoff_date'] for r in records],
+        'Company': [r['employer']['name'] for r in records],
+        'No. Of\nEmployees': [r['impacted'] for r in records],
+        'Layoff/Closure': [r['type'] and f"{r['type']} Permanent" for r in records],
+        'Address': [" ".join(filter(None, [r['location']['street'], r['location']['municipality'], 'CA', r['location']['zip']])) for r in records],
+    })
+
+
+def tx_per_row(df, url):
+    results = []
+    for _, row in df.iterrows():
+        row_dict = row.to_dict()
+        company = row_dict.get('JOB_SITE_NAME')
+        city = row_dict.get('CITY_NAME')
+        county = row_dict.get('COUNTY_NAME')
+        impacted = row_dict.get('TOTAL_LAYOFF_NUMBER')
+        if not company or pd.isna(company):
+            continue
+        notes = f"County: {county}" if county and not pd.isna(county) else None
+        warn_date = row_dict['NOTICE_DATE']
+        layoff_date = row_dict['LayOff_Date']
+        record = WarnRecord(
+            employer=Employee(name=str(company).strip()),
+            location=Address(municipality=str(city).strip() if city and not pd.isna(city) else None, state="tx"),
+            warn_date=warn_date.date() if pd.notna(warn_date) else None,
+            layoff_date=layoff_date.date() if pd.notna(layoff_date) else None,
+            impacted=clean_impacted(str(impacted)) if impacted and not pd.isna(impacted) else None,
+            notes=notes,
+            link=url
+        )
+        results.append(record.model_dump(mode='json'))
+    return results
+
+
+def ca_per_row(df, url):
+    results = []
+    for _, row in df.iterrows():
+        row_dict = row.to_dict()
+        company = row_dict.get('Company')
+        type_str = row_dict.get('Layoff/Closure')
+        impacted = row_dict.get('No. Of\nEmployees')
+        if not company or pd.isna(company):
+            continue
+        parsed = parse_address(row_dict.get('Address'), state_fips='06')
+        record = WarnRecord(
+            employer=Employee(name=str(company).strip()),
+            location=Address(street=parsed['street'], municipality=parsed['municipality'], state="ca", zip=parsed['zip']),
+            warn_date=ca.parse_date(row_dict['Notice Date']),
+            layoff_date=ca.parse_date(row_dict['Effective Date']),
+            type=derive_warn_type(str(type_str)) if type_str else None,
+            impacted=clean_impacted(str(impacted)),
+            link=url
+        )
+        results.append(record.model_dump(mode='json'))
+    return results
+
+
+def rate(fn, df, repeat=3):
+    best = None
+    for _ in range(repeat):
+        _parse_address_cached.cache_clear()
+        start = time.perf_counter()
+        count = len(fn(df, LINK))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return count, count / best
+
+
+def main():
+    for name, sheet, per_row, columnar in [
+        ("tx", tx_sheet(), tx_per_row, tx.parse_sheet),
+        ("ca", ca_sheet(), ca_per_row, ca.parse_sheet),
+    ]:
+        count, old_rate = rate(per_row, sheet)
+        _, new_rate = rate(columnar, sheet)
+        print(f"{name}: {count} records | per-row {old_rate:,.0f} rec/s | columnar {new_rate:,.0f} rec/s | {new_rate / old_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Time to get a state/year slice of the national dataset: parsing every
+data/<state>.json and flattening it by hand, against load_parquet reading only
+the matching partitions and columns of an export of the same files.
+
+    $env:PYTHONPATH="."; uv run --extra parquet benchmarks/bench_parquet_load.py [state] [year]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+from src.export import export_parquet, load_parquet
+from src.registry import state_modules
+
+COLUMNS = ["employer_name", "location_municipality", "warn_date", "impacted"]
+
+
+def json_slice(state, year):
+    """What analysts did before: load every file, flatten, then filter."""
+    frames = []
+    for name in state_modules():
+        path = f"data/{name}.json"
+        if not os.path.exists(path):
+            continue
+        with open(path) as f:
+            frame = pd.json_normalize(json.load(f), sep="_")
+        frame["state"] = name
+        frames.append(frame)
+    df = pd.concat(frames, ignore_index=True)
+    df = df[(df["state"] == state) & df["warn_date"].fillna("").str.startswith(str(year))]
+    return df[COLUMNS]
+
+
+def best_of(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    state = sys.argv[1] if len(sys.argv) > 1 else "tx"
+    year = int(sys.argv[2]) if len(sys.argv) > 2 else 2024
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "warn.parquet")
+        start = time.perf_counter()
+        count = export_parquet(root)
+        print(f"export: {count} records in {time.perf_counter() - start:.2f}s")
+
+        expected, json_time = best_of(lambda: json_slice(state, year))
+        sliced, slice_time = best_of(lambda: load_parquet(root, columns=COLUMNS, states=[state], years=[year]))
+        _, full_time = best_of(lambda: load_parquet(root))
+        assert len(sliced) == len(expected), "the Parquet slice has different rows"
+
+        print(f"{state} {year}: {len(sliced)} records")
+        print(f"json parse + flatten + filter: {json_time * 1000:7.1f} ms")
+        print(f"load_parquet slice:            {slice_time * 1000:7.1f} ms  {json_time / slice_time:.0f}x")
+        print(f"load_parquet everything:       {full_time * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Serial vs process-pool table extraction (src/pdf_tables.py) on a generated
+CA-style PDF (benchmarks/pdf_fixture.py), checking every worker count returns
+the same tables in the same page order.
+
+    $env:PYTHONPATH="."; uv run benchmarks/bench_pdf_extraction.py [pages]
+"""
+import os
+import sys
+import tempfile
+import time
+from benchmarks.pdf_fixture import write_fixture
+from src.pdf_tables import extract_page_tables
+
+WORKER_COUNTS = (1, 2, 4, 8)
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_fixture(os.path.join(tmp, "ca_fixture.pdf"), pages)
+        print(f"{pages} pages, {os.cpu_count()} CPUs")
+
+        baseline = None
+        for workers in WORKER_COUNTS:
+            start = time.perf_counter()
+            tables = extract_page_tables(path, "extract_table", workers=workers)
+            elapsed = time.perf_counter() - start
+            if baseline is None:
+                baseline = (tables, elapsed)
+            assert tables == baseline[0], f"{workers} workers changed the extracted tables"
+            print(f"{workers} worker(s): {elapsed:6.2f}s  {pages / elapsed:6.1f} pages/s  {baseline[1] / elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
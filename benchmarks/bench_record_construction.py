@@ -0,0 +1,109 @@
+"""
+Records/sec of building WarnRecord dicts for `rows` synthetic normalized rows
+(like frame_to_records gets from the column converters): per-row models plus
+model_dump (the previous frame_to_records), one TypeAdapter(list[WarnRecord])
+batch, and models.record_dict. All three must produce the same dicts.
+
+    $env:PYTHONPATH="."; uv run benchmarks/bench_record_construction.py [rows]
+"""
+import gc
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pydantic import TypeAdapter
+from src.models import WarnRecord, Employee, Address, WarnType, record_dict
+
+LINK = "https://www.twc.texas.gov/sites/default/files/ui/docs/warn-act-listings-2024-twc.xlsx"
+CITIES = ["Austin", "Dallas", "Houston", "San Antonio", None]
+TYPES = [WarnType.CLOSURE, WarnType.PERMANENT_LAYOFF, WarnType.TEMPORARY_LAYOFF, None]
+
+
+def synthetic_rows(count, seed=0):
+    rng = random.Random(seed)
+    start = date(2015, 1, 1)
+    rows = []
+    for i in range(count):
+        warn_date = start + timedelta(days=rng.randrange(4000))
+        rows.append({
+            'company': f"Company {i}",
+            'street': f"{rng.randrange(1, 9999)} Main St" if i % 3 else None,
+            'municipality': rng.choice(CITIES),
+            'zip': f"{rng.randrange(70000, 80000)}" if i % 2 else None,
+            'warn_date': warn_date,
+            'layoff_date': warn_date + timedelta(days=60) if i % 4 else None,
+            'type': rng.choice(TYPES),
+            'impacted': rng.randrange(1, 2000) if i % 10 else None,
+            'notes': f"County: {rng.choice(CITIES)}" if i % 5 else None,
+            'link': LINK,
+            'union': None,
+        })
+    return rows
+
+
+def per_row_models(rows, state):
+    records = []
+    for row in rows:
+        record = WarnRecord(
+            employer=Employee(name=row['company']),
+            location=Address(street=row['street'], municipality=row['municipality'], state=state, zip=row['zip']),
+            union=row['union'],
+            warn_date=row['warn_date'],
+            layoff_date=row['layoff_date'],
+            type=row['type'],
+            impacted=row['impacted'],
+            notes=row['notes'],
+            link=row['link'],
+        )
+        records.append(record.model_dump(mode='json'))
+    return records
+
+
+RECORDS = TypeAdapter(list[WarnRecord])
+
+
+def batch_adapter(rows, state):
+    nested = [{
+        'employer': {'name': row['company']},
+        'location': {'street': row['street'], 'municipality': row['municipality'], 'state': state, 'zip': row['zip']},
+        'union': row['union'],
+        'warn_date': row['warn_date'],
+        'layoff_date': row['layoff_date'],
+        'type': row['type'],
+        'impacted': row['impacted'],
+        'notes': row['notes'],
+        'link': row['link'],
+    } for row in rows]
+    return RECORDS.dump_python(RECORDS.validate_python(nested), mode='json')
+
+
+def fast_path(rows, state):
+    return [record_dict(state=state, **row) for row in rows]
+
+
+def rate(fn, rows, repeat=3):
+    best = None
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = fn(rows, "tx")
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, len(rows) / best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = synthetic_rows(count)
+    baseline, base_rate = rate(per_row_models, rows)
+    print(f"{count} rows")
+    print(f"per-row models:     {base_rate:10,.0f} rec/s")
+    for name, fn in [("TypeAdapter batch:", batch_adapter), ("record_dict:", fast_path)]:
+        records, fn_rate = rate(fn, rows)
+        assert records == baseline, f"{name} changed the records"
+        print(f"{name:<19} {fn_rate:10,.0f} rec/s  {fn_rate / base_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Full refresh of one state in the SQLite store (src/store.py): a first load
+and a re-ingest of `rows` records built from data/tx.json, each in a single
+transaction, against committing every upsert on its own.
+
+    $env:PYTHONPATH="."; uv run benchmarks/bench_store_ingest.py [rows]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from src.store import UPSERT, _row, connect, ingest
+
+
+def synthetic_records(count):
+    with open("data/tx.json") as f:
+        records = json.load(f)
+    # Vary the employer so every row has its own key
+    return [dict(records[i % len(records)], employer={"name": f"{records[i % len(records)]['employer']['name']} #{i}", "address": None})
+            for i in range(count)]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    records = synthetic_records(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = connect(os.path.join(tmp, "single.db"))
+        first, first_time = timed(lambda: ingest(conn, "tx", records))
+        again, again_time = timed(lambda: ingest(conn, "tx", records))
+        conn.close()
+        assert first["inserted"] == count and again["updated"] == count
+
+        conn = connect(os.path.join(tmp, "per_row.db"))
+        now = time.time()
+
+        def per_row():
+            for record in records:
+                with conn:
+                    conn.execute(UPSERT, _row(record, "tx", now))
+        _, per_row_time = timed(per_row)
+        conn.close()
+
+    print(f"{count} records")
+    print(f"single transaction, first load: {first_time:6.2f}s  {count / first_time:9,.0f} rec/s")
+    print(f"single transaction, refresh:    {again_time:6.2f}s  {count / again_time:9,.0f} rec/s")
+    print(f"commit per row, first load:     {per_row_time:6.2f}s  {count / per_row_time:9,.0f} rec/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Peak memory and time of the streaming XLSX reader (src/xlsx.py, tx.read_xlsx)
+against loading the whole sheet with pd.read_excel, on a TX-style workbook of
+`rows` rows rebuilt from data/tx.json. Both must produce the same records.
+Also the scraper's path, records streamed through the parse cache into the
+RecordWriter, on a cache miss and on a hit.
+
+    $env:PYTHONPATH="."; uv run benchmarks/bench_xlsx_streaming.py [rows]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+import openpyxl
+import pandas as pd
+from src import tx
+from src.output import RecordWriter
+from src.parse_cache import cached_records
+
+LINK = "https://example.com/warn.xlsx"
+HEADERS = ['NOTICE_DATE', 'JOB_SITE_NAME', 'COUNTY_NAME', 'TOTAL_LAYOFF_NUMBER', 'LayOff_Date', 'CITY_NAME']
+
+
+def write_workbook(path, rows):
+    with open("data/tx.json") as f:
+        records = json.load(f)
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("WARN")
+    sheet.append(HEADERS)
+    for i in range(rows):
+        r = records[i % len(records)]
+        sheet.append([
+            datetime.fromisoformat(r['warn_date']) if r['warn_date'] else None,
+            r['employer']['name'],
+            (r['notes'] or '').replace('County: ', '') or None,
+            r['impacted'],
+            # Mix date cells and text like the published sheets
+            r['layoff_date'] and (datetime.fromisoformat(r['layoff_date']) if i % 2 else datetime.fromisoformat(r['layoff_date']).strftime("%m/%d/%Y")),
+            r['location']['municipality'],
+        ])
+    workbook.save(path)
+
+
+def read_whole_sheet(path, url):
+    """The previous reader: the whole sheet as one DataFrame."""
+    with pd.ExcelFile(path) as xls:
+        df = pd.read_excel(xls, sheet_name=xls.sheet_names[0])
+    return tx.parse_sheet(df, url)
+
+
+def measure(read, path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    records = read(path, LINK)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return records, elapsed, peak
+
+
+def write_through_cache(path, output_file, cache_dir):
+    """What scrape_tx does with one workbook."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    with RecordWriter(output_file, compress=False, legacy_json=True) as writer:
+        writer.write_all(cached_records(path, LINK, "tx-xlsx", tx.PARSER_VERSION, lambda: tx.iter_xlsx(path, LINK), cache_dir))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return writer.count, elapsed, peak
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tx_fixture.xlsx")
+        write_workbook(path, rows)
+        print(f"{rows} rows, {os.path.getsize(path) / 1024 / 1024:.1f} MB workbook")
+
+        baseline, whole_time, whole_peak = measure(read_whole_sheet, path)
+        records, stream_time, stream_peak = measure(tx.read_xlsx, path)
+        assert records == baseline, "streaming reader changed the records"
+        # Records still collected into a list; how much of the peak is the reader itself
+        streamed = 0
+        tracemalloc.start()
+        for _ in tx.iter_xlsx(path, LINK):
+            streamed += 1
+        _, iter_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"pd.read_excel: {whole_time:6.2f}s  peak {whole_peak / 1024 / 1024:7.1f} MB")
+        print(f"streaming:     {stream_time:6.2f}s  peak {stream_peak / 1024 / 1024:7.1f} MB")
+        print(f"iter_xlsx:     {streamed} records, peak {iter_peak / 1024 / 1024:7.1f} MB without keeping them")
+        output_file, cache_dir = os.path.join(tmp, "tx.json"), os.path.join(tmp, "parse_cache")
+        for run in ("cache miss", "cache hit"):
+            count, elapsed, peak = write_through_cache(path, output_file, cache_dir)
+            print(f"scraper, {run}: {elapsed:6.2f}s  peak {peak / 1024 / 1024:7.1f} MB for {count} records written")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Writes multi-page PDFs with ruled tables in the layout of the CA WARN report,
+filled from data/ca.json, for benchmarking PDF table extraction without
+downloading the real reports.
+
+    $env:PYTHONPATH="."; uv run benchmarks/pdf_fixture.py data/ca_fixture.pdf 200
+"""
+import json
+import sys
+
+PAGE_WIDTH, PAGE_HEIGHT = 792, 612
+MARGIN = 36
+ROW_HEIGHT = 14
+FONT_SIZE = 7
+# (header, width, record -> cell text)
+COLUMNS = [
+    ("Notice Date", 70, lambda r: _us_date(r["warn_date"])),
+    ("Effective Date", 70, lambda r: _us_date(r["layoff_date"])),
+    ("Company", 190, lambda r: r["employer"]["name"]),
+    ("No. Of Employees", 70, lambda r: r["impacted"]),
+    ("Layoff/Closure", 90, lambda r: {"Closure": "Closure Permanent", "TemporaryLayoff": "Layoff Temporary"}.get(r["type"], "Layoff Permanent")),
+    ("Address", 230, lambda r: " ".join(filter(None, [r["location"]["street"], r["location"]["municipality"], "CA", r["location"]["zip"]]))),
+]
+ROWS_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // ROW_HEIGHT - 1
+
+
+def _us_date(value):
+    return f"{value[5:7]}/{value[8:10]}/{value[:4]}" if value else ""
+
+
+def _pdf_text(value, width):
+    text = "" if value is None else str(value)
+    # Helvetica averages about half the font size per character
+    text = text[:int(width / (FONT_SIZE * 0.5)) - 1]
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def page_content(rows):
+    ops = ["0.5 w"]
+    top = PAGE_HEIGHT - MARGIN
+    table_width = sum(width for _, width, _ in COLUMNS)
+    bottom = top - ROW_HEIGHT * (len(rows) + 1)
+    # Horizontal rules, then vertical rules
+    for i in range(len(rows) + 2):
+        y = top - i * ROW_HEIGHT
+        ops.append(f"{MARGIN} {y} m {MARGIN + table_width} {y} l S")
+    x = MARGIN
+    for _, width, _ in COLUMNS:
+        ops.append(f"{x} {top} m {x} {bottom} l S")
+        x += width
+    ops.append(f"{x} {top} m {x} {bottom} l S")
+
+    cells = [[header for header, _, _ in COLUMNS]] + [[get(r) for _, _, get in COLUMNS] for r in rows]
+    for i, row in enumerate(cells):
+        y = top - (i + 1) * ROW_HEIGHT + 4
+        x = MARGIN
+        for value, (_, width, _) in zip(row, COLUMNS):
+            ops.append(f"BT /F1 {FONT_SIZE} Tf {x + 2} {y} Td ({_pdf_text(value, width)}) Tj ET")
+            x += width
+    return "\n".join(ops).encode("latin-1")
+
+
+def build_pdf(records, pages):
+    """PDF bytes with `pages` pages of ROWS_PER_PAGE records each, cycling through records."""
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    kids = []
+    for p in range(pages):
+        rows = [records[(p * ROWS_PER_PAGE + i) % len(records)] for i in range(ROWS_PER_PAGE)]
+        content = page_content(rows)
+        page_id, content_id = 4 + 2 * p, 5 + 2 * p
+        objects[content_id] = b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream"
+        objects[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>").encode()
+        kids.append(f"{page_id} 0 R")
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += b"%d 0 obj\n" % obj_id + objects[obj_id] + b"\nendobj\n"
+    xref = len(out)
+    size = max(objects) + 1
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % size
+    for obj_id in range(1, size):
+        out += b"%010d 00000 n \n" % offsets[obj_id]
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref)
+    return bytes(out)
+
+
+def write_fixture(path, pages, source="data/ca.json"):
+    with open(source) as f:
+        records = json.load(f)
+    with open(path, "wb") as f:
+        f.write(build_pdf(records, pages))
+    return path
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "data/ca_fixture.pdf"
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    write_fixture(path, pages)
+    print(f"Wrote {pages} pages ({pages * ROWS_PER_PAGE} rows) to {path}")
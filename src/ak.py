@@ -1,13 +1,14 @@
 import pandas as pd
-import json
-from src.models import WarnRecord, Employee, Address
-from src.utils import clean_impacted, derive_warn_type
+from src.convert import date_column, frame_to_records, impacted_column, is_present, warn_type_column
+from src.output import write_records
+from src.registry import ScraperKind, register
 
 def add_prefix(link):
     if isinstance(link, str):
         return "https://jobs.alaska.gov" + link
     return link
 
+@register("ak", ScraperKind.HTML, cadence="weekly")
 def scrape_ak():
     df = pd.read_html('https://jobs.alaska.gov/rr/WARN_notices.htm', extract_links='body')
     df = df[0]
@@ -26,31 +27,19 @@ def scrape_ak():
     # Drop the last row because it's a blank line
     df = df.head(-1)
 
-    records = []
-    for _, row in df.iterrows():
-        try:
-            warn_date = pd.to_datetime(row['warn_date_str'], errors='coerce')
-            layoff_date = pd.to_datetime(row['layoff_date_str'], errors='coerce')
-
-            record = WarnRecord(
-                employer=Employee(name=row['company_name']),
-                location=Address(
-                    municipality=row['municipality_name'],
-                    state="ak"
-                ),
-                warn_date=warn_date.date() if pd.notna(warn_date) else None,
-                layoff_date=layoff_date.date() if pd.notna(layoff_date) else None,
-                type=derive_warn_type(row['note_str']),
-                impacted=clean_impacted(row['impacted_str']),
-                notes=row['note_str'] if row['note_str'] and pd.notna(row['note_str']) else None,
-                link=add_prefix(row['link']) if pd.notna(row['link']) else None
-            )
-            records.append(record.model_dump(mode='json'))
-        except Exception as e:
-            print(f"Error parsing row: {e}")
-
-    with open("./data/ak.json", "w") as f:
-        json.dump(records, f, indent=2)
+    frame = pd.DataFrame({
+        'company': df['company_name'],
+        'municipality': df['municipality_name'],
+        'warn_date': date_column(df['warn_date_str']),
+        'layoff_date': date_column(df['layoff_date_str']),
+        'type': warn_type_column(df['note_str']),
+        'impacted': impacted_column(df['impacted_str']),
+        'notes': df['note_str'].where(is_present(df['note_str']), None),
+        'link': df['link'].map(add_prefix, na_action='ignore'),
+    }, index=df.index)
+    records = frame_to_records(frame, "ak")
+
+    return write_records("data/ak.json", records)
 
 if __name__ == "__main__":
     scrape_ak()
\ No newline at end of file
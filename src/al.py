@@ -1,8 +1,10 @@
 import pandas as pd
-import json
-from src.models import WarnRecord, Employee, Address, WarnType
-from src.utils import clean_impacted
+from src.models import WarnType
+from src.convert import date_column, frame_to_records, impacted_column
+from src.output import write_records
+from src.registry import ScraperKind, register
 
+@register("al", ScraperKind.HTML, cadence="weekly")
 def scrape_al():
     df = pd.read_html('https://www.madeinalabama.com/warn-list/')
     df = df[0]
@@ -10,39 +12,27 @@ def scrape_al():
     
     df = df.head(-8) # This removes the 1998 data
 
-    records = []
-    for _, row in df.iterrows():
-        try:
-            # Map AL specific types
-            warn_type = None
-            type_low = str(row['type_str']).lower()
-            if 'closing' in type_low or 'closure' in type_low:
-                warn_type = WarnType.CLOSURE
-            elif 'layoff' in type_low:
-                warn_type = WarnType.PERMANENT_LAYOFF
+    # Map AL specific types
+    type_low = df['type_str'].astype(str).str.lower()
+    closure = type_low.str.contains('closing', regex=False) | type_low.str.contains('closure', regex=False)
+    warn_type = pd.Series(None, index=df.index, dtype=object)
+    warn_type[type_low.str.contains('layoff', regex=False)] = WarnType.PERMANENT_LAYOFF
+    warn_type[closure] = WarnType.CLOSURE
 
-            warn_date = pd.to_datetime(row['warn_date'], errors='coerce')
-            layoff_date = pd.to_datetime(row['layoff_date'], errors='coerce')
-            if layoff_date == pd.to_datetime('01/01/0001'):
-                layoff_date = pd.NaT
+    layoff_date = pd.to_datetime(df['layoff_date'], errors='coerce', format='mixed')
+    layoff_date[layoff_date == pd.to_datetime('01/01/0001')] = pd.NaT
 
-            record = WarnRecord(
-                employer=Employee(name=row['company'] if pd.notna(row['company']) else None),
-                location=Address(
-                    municipality=row['municipality'] if pd.notna(row['municipality']) else None,
-                    state="al"
-                ),
-                warn_date=warn_date.date() if pd.notna(warn_date) else None,
-                layoff_date=layoff_date.date() if pd.notna(layoff_date) else None,
-                type=warn_type,
-                impacted=clean_impacted(row['employees_impacted'])
-            )
-            records.append(record.model_dump(mode='json'))
-        except Exception as e:
-            print(f"Error parsing row: {e}")
+    frame = pd.DataFrame({
+        'company': df['company'],
+        'municipality': df['municipality'],
+        'warn_date': date_column(df['warn_date']),
+        'layoff_date': date_column(layoff_date),
+        'type': warn_type,
+        'impacted': impacted_column(df['employees_impacted']),
+    }, index=df.index)
+    records = frame_to_records(frame, "al")
 
-    with open("./data/al.json", "w") as f:
-        json.dump(records, f, indent=2)
+    return write_records("data/al.json", records)
 
 if __name__ == "__main__":
-    scrape_al()
\ No newline at end of file
+    scrape_al()
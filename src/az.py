@@ -1,5 +1,11 @@
+from src.registry import ScraperKind, register
 from src.scrape_ajc import scrape_ajc
 
+URL = "https://www.azjobconnection.gov/search/warn_lookups?q%5Bnotice_eq%5D=true&commit=Search"
+
+@register("az", ScraperKind.HTML)
+def scrape_az():
+    return scrape_ajc(URL, "az", "data/az.json")
+
 if __name__ == "__main__":
-    url = "https://www.azjobconnection.gov/search/warn_lookups?q%5Bnotice_eq%5D=true&commit=Search"
-    scrape_ajc(url, "az", "data/az.json")
+    scrape_az()
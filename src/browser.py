@@ -0,0 +1,132 @@
+import asyncio
+import os
+import socket
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from playwright.async_api import async_playwright
+from playwright.sync_api import sync_playwright
+
+# Set while a BrowserPool is running; inherited by scraper threads and worker processes
+BROWSER_ENDPOINT_ENV = "WARN_BROWSER_ENDPOINT"
+DEFAULT_MAX_CONTEXTS = 4
+
+# Limits concurrent contexts on the shared browser within this process
+_context_slots = None
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class BrowserPool:
+    """
+    One headless Chromium shared by every browser-based scraper in a run.
+
+    Playwright's sync objects cannot cross threads, so the pool only owns the
+    browser process. Scrapers connect to it over CDP from their own thread (or
+    worker process) through browser_context() and each get an isolated context.
+    At most max_contexts contexts are open at once in the pool's process.
+    """
+
+    def __init__(self, max_contexts=DEFAULT_MAX_CONTEXTS, headless=True):
+        self.max_contexts = max_contexts
+        self.headless = headless
+        self.endpoint = None
+        self._playwright = None
+        self._browser = None
+
+    def start(self):
+        global _context_slots
+        port = _free_port()
+        self._playwright = sync_playwright().start()
+        try:
+            self._browser = self._playwright.chromium.launch(
+                headless=self.headless,
+                args=[f"--remote-debugging-port={port}"]
+            )
+        except Exception:
+            self._playwright.stop()
+            self._playwright = None
+            raise
+        self.endpoint = f"http://127.0.0.1:{port}"
+        _context_slots = threading.BoundedSemaphore(self.max_contexts)
+        os.environ[BROWSER_ENDPOINT_ENV] = self.endpoint
+        print(f"Shared browser listening on {self.endpoint} (max {self.max_contexts} contexts)")
+        return self
+
+    def close(self):
+        global _context_slots
+        os.environ.pop(BROWSER_ENDPOINT_ENV, None)
+        _context_slots = None
+        if self._browser:
+            self._browser.close()
+            self._browser = None
+        if self._playwright:
+            self._playwright.stop()
+            self._playwright = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@contextmanager
+def browser_context(**context_options):
+    """
+    An isolated browser context, closed on exit.
+    Uses the run's shared browser when a BrowserPool is running, otherwise
+    launches a private headless Chromium, e.g. when a scraper is run on its own.
+    """
+    endpoint = os.environ.get(BROWSER_ENDPOINT_ENV)
+    slots = _context_slots if endpoint else None
+    if slots:
+        slots.acquire()
+    try:
+        with sync_playwright() as p:
+            if endpoint:
+                browser = p.chromium.connect_over_cdp(endpoint)
+            else:
+                browser = p.chromium.launch(headless=True)
+            try:
+                context = browser.new_context(**context_options)
+                try:
+                    yield context
+                finally:
+                    context.close()
+            finally:
+                # Only disconnects when attached to the shared browser
+                browser.close()
+    finally:
+        if slots:
+            slots.release()
+
+
+@asynccontextmanager
+async def async_browser_context(**context_options):
+    """browser_context() for the Playwright async API."""
+    endpoint = os.environ.get(BROWSER_ENDPOINT_ENV)
+    slots = _context_slots if endpoint else None
+    if slots:
+        # The semaphore is shared with sync scrapers, wait for it off the event loop
+        await asyncio.to_thread(slots.acquire)
+    try:
+        async with async_playwright() as p:
+            if endpoint:
+                browser = await p.chromium.connect_over_cdp(endpoint)
+            else:
+                browser = await p.chromium.launch(headless=True)
+            try:
+                context = await browser.new_context(**context_options)
+                try:
+                    yield context
+                finally:
+                    await context.close()
+            finally:
+                await browser.close()
+    finally:
+        if slots:
+            slots.release()
@@ -1,12 +1,22 @@
-import json
-import requests
 import pandas as pd
-import pdfplumber
 import os
 from datetime import datetime
-from playwright.sync_api import sync_playwright
-from src.models import WarnRecord, Employee, Address
-from src.utils import clean_impacted, derive_warn_type, parse_address
+from src.browser import browser_context
+from src.models import record_dict
+from src.utils import clean_impacted, derive_warn_type, parse_addresses, address_cache_info
+from src.convert import ColumnMap, date_column, frame_to_records, impacted_column, is_present, text_column, warn_type_column
+from src.dedup import Deduper
+from src.output import RecordWriter
+from src.registry import PartialScrape, ScraperKind, register
+from src.http_cache import DownloadCache
+from src.parse_cache import cached_records
+from src.pdf_tables import extract_page_tables
+from src.xlsx import SheetReader, open_workbook
+
+# Bump when parsing changes so cached records from the parse cache are rebuilt
+PARSER_VERSION = 4
+
+DATE_FORMATS = ("%m/%d/%Y", "%Y-%m-%d", "%m-%d-%Y", "%d/%m/%Y")
 
 def parse_date(val):
     if pd.isna(val) or val is None:
@@ -14,173 +24,147 @@ def parse_date(val):
     if isinstance(val, (datetime, pd.Timestamp)):
         return val.date()
     date_str = str(val).strip()
-    for fmt in ("%m/%d/%Y", "%Y-%m-%d", "%m-%d-%Y", "%d/%m/%Y"):
+    for fmt in DATE_FORMATS:
         try:
             return datetime.strptime(date_str, fmt).date()
         except ValueError:
             continue
     return None
 
-def get_col(row, aliases):
-    for alias in aliases:
-        if alias in row:
-            return row[alias]
-        for k in row.keys():
-            if str(k).replace('\n', ' ').strip().lower() == alias.lower():
-                return row[k]
-    return None
+# Column names of the detailed XLSX report, first match wins
+COLUMNS = {
+    'company': ['Company'],
+    'address': ['Address'],
+    'warn_date': ['Processed Date', 'Received Date', 'Notice Date'],
+    'layoff_date': ['Effective Date'],
+    'impacted': ['No. Of Employees', 'No. of Employees', 'Number of Employees'],
+    'type': ['Layoff/Closure', 'Type of Action'],
+}
 
+def parse_sheet(df, url, columns=None):
+    """Convert (a chunk of) the detailed CA WARN sheet into WarnRecord dicts."""
+    # Resolve columns once for the whole sheet
+    if columns is None:
+        columns = ColumnMap(df.columns, COLUMNS)
+        if columns.missing:
+            print(f"CA columns: {columns.describe()}")
+    company = columns.column(df, 'company')
 
+    # Parse every distinct address in one batch up front
+    parsed = parse_addresses(columns.column(df, 'address'), state_fips='06')
 
-def process_xlsx(url):
-    print(f"Processing XLSX: {url}")
-    local_file = "data/ca_current.xlsx"
-    xls = None
+    frame = pd.DataFrame({
+        'company': text_column(company),
+        'street': parsed['street'],
+        'municipality': parsed['municipality'],
+        'zip': parsed['zip'],
+        'warn_date': date_column(columns.column(df, 'warn_date'), DATE_FORMATS),
+        'layoff_date': date_column(columns.column(df, 'layoff_date'), DATE_FORMATS),
+        'type': warn_type_column(columns.column(df, 'type')),
+        'impacted': impacted_column(columns.column(df, 'impacted')),
+        'link': url,
+    }, index=df.index)
+    frame = frame[is_present(company)]
+
+    return frame_to_records(frame, "ca")
+
+def iter_xlsx(path, url):
+    """Stream records from the detailed sheet of the workbook, a chunk of rows at a time."""
+    workbook = open_workbook(path)
     try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.get(url, headers=headers)
-        with open(local_file, "wb") as f:
-            f.write(response.content)
-        
-        xls = pd.ExcelFile(local_file)
-        sheets = [s for s in xls.sheet_names if 'Detailed' in s]
-        sheet_name = sheets[0] if sheets else xls.sheet_names[0]
+        sheets = [s for s in workbook.sheetnames if 'Detailed' in s]
+        sheet_name = sheets[0] if sheets else workbook.sheetnames[0]
+        reader = SheetReader(workbook[sheet_name], COLUMNS, header=1)
+        if reader.columns.missing:
+            print(f"CA columns: {reader.columns.describe()}")
+        for chunk in reader.chunks():
+            yield from parse_sheet(chunk, url, reader.columns)
+    finally:
+        workbook.close()
+
+def process_xlsx(url, cache=None):
+    print(f"Processing XLSX: {url}")
+    cache = cache or DownloadCache()
+    headers = {"User-Agent": "Mozilla/5.0"}
+    download = cache.get(url, headers=headers)
+    return cached_records(download.path, url, "ca-xlsx", PARSER_VERSION, lambda: iter_xlsx(download.path, url))
+
+def parse_pdf(path, url, workers=None):
+    results = []
+    for table in extract_page_tables(path, "extract_table", workers):
+        if not table or len(table) < 2:
+            continue
         
-        df = pd.read_excel(xls, sheet_name=sheet_name, header=1)
-        # Close handle immediately
-        xls.close()
-        xls = None
+        raw_headers = [str(h).replace('\n', ' ').strip() for h in table[0]]
+        idx_map = {}
+        for i, h in enumerate(raw_headers):
+            h_lower = h.lower()
+            if 'company' in h_lower: idx_map['company'] = i
+            elif 'received' in h_lower or 'processed' in h_lower or 'notice date' in h_lower: idx_map['warn'] = i
+            elif 'effective' in h_lower: idx_map['layoff'] = i
+            elif 'no. of' in h_lower or 'number' in h_lower or 'emp' in h_lower: idx_map['impacted'] = i
+            elif 'layoff/closure' in h_lower or 'action' in h_lower: idx_map['type'] = i
+            elif 'address' in h_lower: idx_map['address'] = i
+            elif 'city' in h_lower: idx_map['city'] = i
         
-        results = []
-        for _, row in df.iterrows():
-            row_dict = row.to_dict()
-            company = get_col(row_dict, ['Company'])
-            address_str = get_col(row_dict, ['Address'])
-            warn_date = parse_date(get_col(row_dict, ['Processed Date', 'Received Date', 'Notice Date']))
-            layoff_date = parse_date(get_col(row_dict, ['Effective Date']))
-            impacted = get_col(row_dict, ['No. Of Employees', 'No. of Employees', 'Number of Employees'])
-            type_str = get_col(row_dict, ['Layoff/Closure', 'Type of Action'])
-            
-            if not company or pd.isna(company):
+        if 'company' not in idx_map:
+            continue
+
+        rows = []
+        for row in table[1:]:
+            if not row or len(row) <= idx_map['company']:
                 continue
+                
+            company = row[idx_map['company']]
+            if not company or str(company).strip().lower() == 'company':
+                continue
+            rows.append(row)
+
+        # Parse the page's addresses in one batch
+        address_strs = [row[idx_map['address']] if 'address' in idx_map else None for row in rows]
+        parsed_addresses = parse_addresses(address_strs, state_fips='06').to_dict('records')
+
+        for row, parsed in zip(rows, parsed_addresses):
+            company = row[idx_map['company']]
+            warn_date = parse_date(row[idx_map['warn']]) if 'warn' in idx_map else None
+            layoff_date = parse_date(row[idx_map['layoff']]) if 'layoff' in idx_map else None
+            impacted_raw = row[idx_map['impacted']] if 'impacted' in idx_map else None
+            type_str = row[idx_map['type']] if 'type' in idx_map else None
+            city_str = row[idx_map['city']] if 'city' in idx_map else None
             
-            parsed = parse_address(address_str, state_fips='06')
-            
-            record = WarnRecord(
-                employer=Employee(name=str(company).strip()),
-                location=Address(
-                    street=parsed['street'],
-                    municipality=parsed['municipality'],
-                    state="ca",
-                    zip=parsed['zip']
-                ),
+            # If city was explicit in table, override
+            if city_str:
+                 parsed['municipality'] = str(city_str).strip()
+
+            results.append(record_dict(
+                company=str(company).strip(),
+                street=parsed['street'],
+                municipality=parsed['municipality'],
+                state="ca",
+                zip=parsed['zip'],
                 warn_date=warn_date,
                 layoff_date=layoff_date,
-                type=derive_warn_type(str(type_str)) if type_str else None,
-                impacted=clean_impacted(str(impacted)),
+                type=derive_warn_type(str(type_str)),
+                impacted=clean_impacted(str(impacted_raw)),
                 link=url
-            )
-            results.append(record.model_dump(mode='json'))
-        return results
-    except Exception as e:
-        print(f"Error processing XLSX {url}: {e}")
-        return []
-    finally:
-        if xls:
-            xls.close()
-        if os.path.exists(local_file):
-            try:
-                os.remove(local_file)
-            except Exception as e:
-                print(f"Wait, could not delete {local_file}: {e}")
+            ))
+    return results
 
-def process_pdf(url):
+def process_pdf(url, cache=None):
     print(f"Processing PDF: {url}")
-    filename = url.split('/')[-1]
-    local_path = f"data/{filename}"
-    try:
-        if not os.path.exists(local_path):
-            headers = {"User-Agent": "Mozilla/5.0"}
-            response = requests.get(url, headers=headers)
-            with open(local_path, "wb") as f:
-                f.write(response.content)
-        
-        results = []
-        with pdfplumber.open(local_path) as pdf:
-            for page in pdf.pages:
-                table = page.extract_table()
-                if not table or len(table) < 2:
-                    continue
-                
-                raw_headers = [str(h).replace('\n', ' ').strip() for h in table[0]]
-                idx_map = {}
-                for i, h in enumerate(raw_headers):
-                    h_lower = h.lower()
-                    if 'company' in h_lower: idx_map['company'] = i
-                    elif 'received' in h_lower or 'processed' in h_lower or 'notice date' in h_lower: idx_map['warn'] = i
-                    elif 'effective' in h_lower: idx_map['layoff'] = i
-                    elif 'no. of' in h_lower or 'number' in h_lower or 'emp' in h_lower: idx_map['impacted'] = i
-                    elif 'layoff/closure' in h_lower or 'action' in h_lower: idx_map['type'] = i
-                    elif 'address' in h_lower: idx_map['address'] = i
-                    elif 'city' in h_lower: idx_map['city'] = i
-                
-                if 'company' not in idx_map:
-                    continue
-
-                for row in table[1:]:
-                    if not row or len(row) <= idx_map['company']:
-                        continue
-                        
-                    company = row[idx_map['company']]
-                    if not company or str(company).strip().lower() == 'company':
-                        continue
-                        
-                    warn_date = parse_date(row[idx_map['warn']]) if 'warn' in idx_map else None
-                    layoff_date = parse_date(row[idx_map['layoff']]) if 'layoff' in idx_map else None
-                    impacted_raw = row[idx_map['impacted']] if 'impacted' in idx_map else None
-                    type_str = row[idx_map['type']] if 'type' in idx_map else None
-                    address_str = row[idx_map['address']] if 'address' in idx_map else None
-                    city_str = row[idx_map['city']] if 'city' in idx_map else None
-                    
-                    parsed = parse_address(address_str, state_fips='06')
-                    
-                    # If city was explicit in table, override
-                    if city_str:
-                         parsed['municipality'] = str(city_str).strip()
-
-                    record = WarnRecord(
-                        employer=Employee(name=str(company).strip()),
-                        location=Address(
-                            street=parsed['street'],
-                            municipality=parsed['municipality'],
-                            state="ca",
-                            zip=parsed['zip']
-                        ),
-                        warn_date=warn_date,
-                        layoff_date=layoff_date,
-                        type=derive_warn_type(str(type_str)),
-                        impacted=clean_impacted(str(impacted_raw)),
-                        link=url
-                    )
-                    results.append(record.model_dump(mode='json'))
-        return results
-    except Exception as e:
-        print(f"Error parsing PDF {url}: {e}")
-        return []
-    finally:
-        if os.path.exists(local_path):
-            os.remove(local_path)
+    cache = cache or DownloadCache()
+    headers = {"User-Agent": "Mozilla/5.0"}
+    download = cache.get(url, headers=headers)
+    return cached_records(download.path, url, "ca-pdf", PARSER_VERSION, lambda: parse_pdf(download.path, url))
 
+@register("ca", ScraperKind.PDF, browser=True)
 def scrape_ca():
     base_url = "https://edd.ca.gov/en/jobs_and_training/Layoff_Services_WARN/"
-    all_results = []
-    
     if not os.path.exists('data'):
         os.makedirs('data')
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+    with browser_context() as context:
+        page = context.new_page()
         print(f"Finding links on {base_url}")
         page.goto(base_url)
         
@@ -205,21 +189,40 @@ def scrape_ca():
                 return results;
             }
         """)
-        browser.close()
         
     unique_links = {l['href']: l for l in links}.values()
     
-    for l in unique_links:
-        url = l['href']
-        if url.endswith('.xlsx'):
-            all_results.extend(process_xlsx(url))
-        elif url.endswith('.pdf'):
-            all_results.extend(process_pdf(url))
-            
-    with open("data/ca.json", "w") as f:
-        json.dump(all_results, f, indent=2)
-    
-    print(f"Scraped {len(all_results)} records across all CA reports to data/ca.json")
+    downloads = DownloadCache()
+    # Records stream from each report (or its parse cache entry) straight to the output;
+    # none are kept in memory. Historical PDFs overlap each other and the current XLSX,
+    # so repeats are dropped on the way.
+    deduper = Deduper("ca")
+    failed = []
+    with RecordWriter("data/ca.json") as writer:
+        for l in unique_links:
+            url = l['href']
+            try:
+                if url.endswith('.xlsx'):
+                    records = process_xlsx(url, downloads)
+                elif url.endswith('.pdf'):
+                    records = process_pdf(url, downloads)
+                else:
+                    continue
+                writer.write_all(record for record in records if deduper.add(record, url))
+            except Exception as e:
+                # Records already written from this report stay; the run is reported PARTIAL
+                print(f"Error processing {url}: {e}")
+                failed.append(url)
+    all_results = writer.records()
+
+    print(deduper.report())
+    print(f"Scraped {len(all_results)} records across all CA reports to {writer.path}")
+    cache = address_cache_info()
+    print(f"Address cache: {cache.hits} hits, {cache.misses} misses ({cache.currsize} cached)")
+    print(f"CA {downloads.stats()}")
+    if failed:
+        raise PartialScrape("ca", failed, all_results)
+    return all_results
 
 if __name__ == "__main__":
     scrape_ca()
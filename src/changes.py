@@ -0,0 +1,124 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+from collections import Counter
+from datetime import datetime, timezone
+from src.output import read_records
+from src.registry import state_modules
+from src.store import unique_keys, vanished_links
+
+FEED_PATH = "data/changes.jsonl"
+SNAPSHOT_DIR = "data/snapshots"
+# Filled in after scraping (src/employers.py), not part of what the source published
+DERIVED_FIELDS = ("employer_id",)
+
+
+def content_hash(record) -> str:
+    content = {k: v for k, v in record.items() if k not in DERIVED_FIELDS}
+    return hashlib.blake2b(json.dumps(content, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+
+def keyed(records, state):
+    """(record_key, content hash, record) for each record, keys made unique as in the store."""
+    for key, record in unique_keys(records, state):
+        yield key, content_hash(record), record
+
+
+def diff(previous: dict, current):
+    """
+    The changes from previous ({key: (hash, record)}) to current ((key, hash,
+    record) tuples) as (change, key, record, previous record) tuples: one dict
+    lookup per record, never a pairwise compare.
+    """
+    remaining = dict(previous)
+    for key, digest, record in current:
+        before = remaining.pop(key, None)
+        if before is None:
+            yield "added", key, record, None
+        elif before[0] != digest:
+            yield "changed", key, record, before[1]
+    for key, (_, record) in remaining.items():
+        yield "removed", key, record, None
+
+
+def snapshot_path(state, snapshot_dir=SNAPSHOT_DIR):
+    return os.path.join(snapshot_dir, f"{state}.jsonl.gz")
+
+
+def load_snapshot(state, snapshot_dir=SNAPSHOT_DIR):
+    """{key: (hash, record)} of the state as of the last feed update, None before the first."""
+    try:
+        with gzip.open(snapshot_path(state, snapshot_dir), "rt", encoding="utf-8") as f:
+            return {entry["key"]: (entry["hash"], entry["record"]) for entry in map(json.loads, f)}
+    except FileNotFoundError:
+        return None
+
+
+def save_snapshot(state, entries, snapshot_dir=SNAPSHOT_DIR):
+    os.makedirs(snapshot_dir, exist_ok=True)
+    path = snapshot_path(state, snapshot_dir)
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        for key, digest, record in entries:
+            f.write(json.dumps({"key": key, "hash": digest, "record": record}) + "\n")
+    os.replace(tmp_path, path)
+
+
+def update_feed(states=None, feed_path=FEED_PATH, snapshot_dir=SNAPSHOT_DIR, run=None) -> dict:
+    """
+    Append what changed in each state's output since its last snapshot to the
+    JSONL feed at feed_path, one line per added, changed or removed notice,
+    all stamped with this run's UTC timestamp, then snapshot the output. A
+    state's first update only takes the snapshot. Notices of a report that
+    produced no records this time (see store.vanished_links) are not reported
+    removed; they stay in the snapshot until the report comes back. Changes
+    are appended before the snapshot is replaced, so a crash in between
+    repeats them next run rather than losing them.
+    Returns counts of added, changed and removed records per state (None
+    where the first snapshot was taken).
+    """
+    run = run or datetime.now(timezone.utc).isoformat(timespec="seconds")
+    results = {}
+    for state in states or state_modules():
+        try:
+            current = list(keyed(read_records(f"data/{state}.json"), state))
+        except FileNotFoundError:
+            continue
+        previous = load_snapshot(state, snapshot_dir)
+        counts = {"added": 0, "changed": 0, "removed": 0}
+        held = []
+        if previous is not None:
+            links = vanished_links(Counter(record.get("link") for _, record in previous.values()), {record.get("link") for _, _, record in current})
+            if links:
+                print(f"[{state}] Not reporting removals from {len(links)} sources with no records this run: {', '.join(sorted(map(str, links)))}")
+                held = [(key, digest, record) for key, (digest, record) in previous.items() if record.get("link") in links]
+                previous = {key: entry for key, entry in previous.items() if entry[1].get("link") not in links}
+            os.makedirs(os.path.dirname(feed_path) or ".", exist_ok=True)
+            with open(feed_path, "a", encoding="utf-8") as f:
+                for change, key, record, before in diff(previous, current):
+                    entry = {"run": run, "state": state, "change": change, "key": key, "record": record}
+                    if before is not None:
+                        entry["previous"] = before
+                    f.write(json.dumps(entry) + "\n")
+                    counts[change] += 1
+        save_snapshot(state, current + held, snapshot_dir)
+        results[state] = counts if previous is not None else None
+    return results
+
+
+def describe(state, counts) -> str:
+    if counts is None:
+        return f"{state}: first snapshot taken"
+    return f"{state}: {counts['added']} added, {counts['changed']} changed, {counts['removed']} removed"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=f"Append what changed in each state's output since the last run to {FEED_PATH}")
+    parser.add_argument("--states", type=lambda v: [s.strip().lower() for s in v.split(',') if s.strip()], help="Comma-separated states to diff (default: all)")
+    parser.add_argument("--feed", default=FEED_PATH, help=f"JSONL change feed (default: {FEED_PATH})")
+    args = parser.parse_args()
+
+    for state, counts in update_feed(args.states, args.feed).items():
+        print(describe(state, counts))
@@ -0,0 +1,91 @@
+import json
+import os
+from src.output import write_records
+
+# Set (e.g. by run_all --resume) to continue scrapes from their checkpoint
+RESUME_ENV = "WARN_RESUME"
+
+
+def checkpoint_path(output_file):
+    """data/<state>.json -> data/<state>.checkpoint.jsonl"""
+    root, _ = os.path.splitext(output_file)
+    return f"{root}.checkpoint.jsonl"
+
+
+class Checkpoint:
+    """
+    Append-only progress log for a paginated scrape.
+
+    Each finished results page appends one line per record followed by a page
+    marker holding the page number and the URL of the next page, so a crash
+    costs at most the page in flight. With resume, the records and position of
+    the last complete page are loaded back; otherwise the log starts empty.
+    compact() writes the canonical output once at the end.
+    """
+
+    def __init__(self, output_file, resume=None):
+        self.output_file = output_file
+        self.path = checkpoint_path(output_file)
+        self.records = []
+        self.page = 0
+        self.next_url = None
+        self.complete = False
+
+        if resume is None:
+            resume = bool(os.environ.get(RESUME_ENV))
+        if resume and os.path.exists(self.path):
+            self._load()
+            print(f"Resuming from {self.path}: {len(self.records)} records, {self.page} pages done")
+        else:
+            if resume:
+                print(f"No checkpoint at {self.path}, starting from the beginning")
+            open(self.path, "w").close()
+
+    def _load(self):
+        pending = []
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A line cut short by the crash; nothing after it was written
+                    break
+                if "record" in entry:
+                    pending.append(entry["record"])
+                else:
+                    self.records.extend(pending)
+                    pending = []
+                    self.page = entry["page"]
+                    self.next_url = entry.get("next")
+                    self.complete = entry.get("last", False)
+        # Rewrite without the records of the page that never finished,
+        # so they are not picked up again after the next page's marker
+        with open(self.path, "w") as f:
+            for record in self.records:
+                f.write(json.dumps({"record": record}) + "\n")
+            if self.page:
+                f.write(json.dumps({"page": self.page, "next": self.next_url, "last": self.complete}) + "\n")
+
+    def done(self, page_num):
+        """Whether page_num was already scraped by the run being resumed."""
+        return page_num <= self.page
+
+    def add_page(self, page_num, records, next_url=None, last=False):
+        """Append a finished page's records; next_url is where a resumed run continues."""
+        with open(self.path, "a") as f:
+            for record in records:
+                f.write(json.dumps({"record": record}) + "\n")
+            f.write(json.dumps({"page": page_num, "next": next_url, "last": last}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.records.extend(records)
+        self.page = page_num
+        self.next_url = next_url
+        self.complete = last
+
+    def compact(self, records=None):
+        """Write `records` (default: everything checkpointed) to the output file and drop the log."""
+        records = self.records if records is None else records
+        write_records(self.output_file, records)
+        os.remove(self.path)
+        return records
@@ -0,0 +1,169 @@
+from datetime import date
+import numpy as np
+import pandas as pd
+from src.models import WarnType, record_dict
+
+# Canonical columns understood by frame_to_records
+RECORD_COLUMNS = (
+    'company', 'street', 'municipality', 'zip', 'warn_date', 'layoff_date',
+    'type', 'impacted', 'notes', 'link', 'union'
+)
+
+
+def normalize_header(header) -> str:
+    """Header text as compared against aliases: single line, trimmed, lowercase."""
+    return str(header).replace('\n', ' ').strip().lower()
+
+
+class ColumnMap:
+    """
+    Canonical fields (company, warn_date, ...) resolved against a sheet's headers once.
+    `columns` maps each found field to its header and `positions` to its index,
+    so hot loops never rescan headers.
+    """
+
+    def __init__(self, headers, aliases: dict, contains: dict = None):
+        headers = list(headers)
+        normalized = [normalize_header(h) for h in headers]
+        contains = contains or {}
+
+        self.columns = {}
+        self.positions = {}
+        self.matched = {}
+        self.missing = []
+        for field, field_aliases in aliases.items():
+            position = None
+            for alias in field_aliases:
+                # Exact header first, then the normalized header
+                if alias in headers:
+                    position = headers.index(alias)
+                elif alias.lower() in normalized:
+                    position = normalized.index(alias.lower())
+                if position is not None:
+                    self.matched[field] = alias
+                    break
+            if position is None and field in contains:
+                # Fall back to a header containing the text, e.g. "Company Name (* Denotes...)"
+                needle = contains[field].lower()
+                position = next((i for i, h in enumerate(normalized) if needle in h), None)
+                if position is not None:
+                    self.matched[field] = f"*{contains[field]}*"
+
+            if position is None:
+                self.missing.append(field)
+            else:
+                self.columns[field] = headers[position]
+                self.positions[field] = position
+
+    def column(self, df: pd.DataFrame, field: str) -> pd.Series:
+        """The sheet column for a field, or an all-None column when it is missing."""
+        if field in self.columns:
+            return df[self.columns[field]]
+        return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+    def describe(self) -> str:
+        found = ", ".join(f"{field}={self.columns[field]!r}" for field in self.columns)
+        return f"matched [{found}]; missing [{', '.join(self.missing)}]"
+
+
+def _series(values, index=None) -> pd.Series:
+    if isinstance(values, pd.Series):
+        return values
+    return pd.Series(values, index=index, dtype=object)
+
+
+def _none_where(values: pd.Series, mask) -> pd.Series:
+    """Object series with None wherever mask is False."""
+    return values.astype(object).where(mask, None)
+
+
+def is_present(values) -> pd.Series:
+    """Whole-column version of `value and not pd.isna(value)`."""
+    values = _series(values)
+    return values.notna() & values.astype(bool)
+
+
+def text_column(values, strip=True) -> pd.Series:
+    """str(value).strip() for present values, None otherwise."""
+    values = _series(values)
+    text = values.astype(str)
+    if strip:
+        text = text.str.strip()
+    return _none_where(text, is_present(values))
+
+
+def date_column(values, formats=None) -> pd.Series:
+    """
+    Parse a column into datetime.date objects (None when unparseable).
+    With formats, date/datetime cells are kept and strings are tried against
+    each format in order, like the per-scraper parse_date helpers.
+    Without formats, each cell is parsed like pd.to_datetime(value, errors='coerce').
+    """
+    values = _series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        parsed = values
+    elif formats is None:
+        parsed = pd.to_datetime(values, errors='coerce', format='mixed')
+    else:
+        # date/datetime cells (Timestamp is a datetime subclass) need no parsing
+        is_date = values.map(lambda v: isinstance(v, date), na_action='ignore').fillna(False).astype(bool)
+        parsed = pd.to_datetime(values.where(is_date), errors='coerce')
+
+        strings = values.where(~is_date & values.notna()).astype(object)
+        strings = strings.where(strings.isna(), strings.astype(str).str.strip())
+        for fmt in formats:
+            pending = parsed.isna() & strings.notna()
+            if not pending.any():
+                break
+            parsed[pending] = pd.to_datetime(strings[pending], format=fmt, errors='coerce')
+
+    return _none_where(parsed.dt.date, parsed.notna())
+
+
+def impacted_column(values) -> pd.Series:
+    """Whole-column utils.clean_impacted: numbers rounded, text as its number or else its digits."""
+    values = _series(values)
+    numbers = pd.to_numeric(values, errors='coerce')
+    if not pd.api.types.is_numeric_dtype(values):
+        text = values.astype(str).str.strip().str.replace(',', '', regex=False).where(values.notna())
+        numbers = pd.to_numeric(text, errors='coerce')
+        digits = text.str.replace(r'[^\d]', '', regex=True)
+        numbers = numbers.fillna(pd.to_numeric(digits.where(numbers.isna() & digits.ne('')), errors='coerce'))
+    numbers = numbers.where(np.isfinite(numbers)).abs().round()
+    return _none_where(numbers.fillna(0).astype(np.int64), numbers.notna())
+
+
+def warn_type_column(values) -> pd.Series:
+    """Whole-column derive_warn_type."""
+    values = _series(values)
+    text = values.astype(str).str.lower().where(is_present(values), '')
+    conditions = [
+        text.str.contains('closure', regex=False) | text.str.contains('closing', regex=False),
+        text.str.contains('temporary', regex=False),
+        text.str.contains('permanent', regex=False) | text.str.contains('no recall', regex=False) | text.str.contains('layoff', regex=False),
+    ]
+    choices = [WarnType.CLOSURE, WarnType.TEMPORARY_LAYOFF, WarnType.PERMANENT_LAYOFF]
+    # Apply lowest priority first so earlier conditions win, like the if-chain in derive_warn_type
+    result = np.full(len(values), None, dtype=object)
+    for condition, choice in reversed(list(zip(conditions, choices))):
+        result[condition.to_numpy()] = choice
+    return pd.Series(result, index=values.index, dtype=object)
+
+
+def frame_to_records(frame: pd.DataFrame, state: str) -> list[dict]:
+    """
+    Materialize WarnRecord dicts from a frame of already-normalized columns.
+    Column names are the canonical RECORD_COLUMNS; missing columns are None.
+    Rows go through models.record_dict, so normalized values skip building the
+    models; rows that fail validation are reported and skipped.
+    """
+    frame = frame.reindex(columns=list(RECORD_COLUMNS)).astype(object)
+    frame = frame.where(frame.notna(), None)
+
+    records = []
+    for row in frame.to_dict('records'):
+        try:
+            records.append(record_dict(state=state, **row))
+        except Exception as e:
+            print(f"Error parsing row: {e}")
+    return records
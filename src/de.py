@@ -1,5 +1,11 @@
+from src.registry import ScraperKind, register
 from src.scrape_ajc import scrape_ajc
 
+URL = "https://joblink.delaware.gov/search/warn_lookups?q%5Bnotice_eq%5D=true&commit=Search"
+
+@register("de", ScraperKind.HTML)
+def scrape_de():
+    return scrape_ajc(URL, "de", "data/de.json")
+
 if __name__ == "__main__":
-    de_url = "https://joblink.delaware.gov/search/warn_lookups?q%5Bnotice_eq%5D=true&commit=Search"
-    scrape_ajc(de_url, "de", "data/de.json")
+    scrape_de()
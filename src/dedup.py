@@ -0,0 +1,99 @@
+import difflib
+from collections import defaultdict
+from src.utils import LEGAL_SUFFIXES, normalize_name
+
+# Name similarity (difflib ratio) above which records in the same block are near duplicates
+NEAR_RATIO = 0.92
+# Kept records compared per block; bounds the near pass when one date and place has many notices
+MAX_BLOCK = 64
+
+
+def employer_tokens(name) -> tuple:
+    return tuple(t for t in normalize_name(name).split() if t not in LEGAL_SUFFIXES)
+
+
+def _place(record) -> str:
+    """Normalized street, city and 5-digit zip: two sites of one employer are two notices."""
+    location = record.get("location") or {}
+    return " ".join((
+        normalize_name(location.get("street")),
+        normalize_name(location.get("municipality")),
+        (location.get("zip") or "")[:5],
+    ))
+
+
+def fingerprint(record) -> str:
+    """Normalized employer | place | warn date | impacted; equal fingerprints are the same notice."""
+    return "|".join((
+        " ".join(employer_tokens((record.get("employer") or {}).get("name"))),
+        _place(record),
+        record.get("warn_date") or "",
+        str(record.get("impacted") if record.get("impacted") is not None else ""),
+    ))
+
+
+class Deduper:
+    """
+    Drops repeated notices from a stream of records, keeping the first one seen.
+
+    Exact duplicates are found with a hash index of fingerprints. Near duplicates
+    are looked for only among kept records with the same warn date and place
+    (street, city and zip; the block): the employer names must be at least
+    NEAR_RATIO similar, contain the same tokens with digits (so "Cepheid B3"
+    and "Cepheid B6" stay apart) and the impacted counts must agree where both
+    are known. Each record costs one
+    lookup plus a comparison against its block, so a whole history stays near
+    linear. Counts are kept per source (the report or page a record came from).
+    """
+
+    def __init__(self, name=""):
+        self.name = name
+        self._fingerprints = set()
+        self._blocks = defaultdict(list)
+        self.counts = defaultdict(lambda: {"records": 0, "exact": 0, "near": 0})
+
+    def _is_near(self, tokens, impacted, block):
+        text = " ".join(tokens)
+        digits = [t for t in tokens if any(c.isdigit() for c in t)]
+        for other_text, other_digits, other_impacted in block:
+            if digits != other_digits:
+                continue
+            if impacted is not None and other_impacted is not None and impacted != other_impacted:
+                continue
+            matcher = difflib.SequenceMatcher(None, text, other_text)
+            if matcher.real_quick_ratio() >= NEAR_RATIO and matcher.quick_ratio() >= NEAR_RATIO and matcher.ratio() >= NEAR_RATIO:
+                return True
+        return False
+
+    def add(self, record, source=None) -> bool:
+        """Whether record is new; duplicates are counted against source and should be dropped."""
+        counts = self.counts[source]
+        counts["records"] += 1
+        key = fingerprint(record)
+        if key in self._fingerprints:
+            counts["exact"] += 1
+            return False
+
+        tokens = employer_tokens((record.get("employer") or {}).get("name"))
+        impacted = record.get("impacted")
+        block = None
+        if record.get("warn_date"):
+            block = self._blocks[(record["warn_date"], _place(record))]
+            if self._is_near(tokens, impacted, block):
+                counts["near"] += 1
+                return False
+        self._fingerprints.add(key)
+        if block is not None and len(block) < MAX_BLOCK:
+            block.append((" ".join(tokens), [t for t in tokens if any(c.isdigit() for c in t)], impacted))
+        return True
+
+    def filter(self, records, source=None) -> list[dict]:
+        return [record for record in records if self.add(record, source)]
+
+    def report(self) -> str:
+        total = {k: sum(c[k] for c in self.counts.values()) for k in ("records", "exact", "near")}
+        lines = [f"[{self.name}] Dedup: {total['records']} records, {total['exact']} exact and {total['near']} near duplicates merged"]
+        for source, c in self.counts.items():
+            if c["exact"] or c["near"]:
+                lines.append(f"  {source}: {c['records']} records, {c['exact']} exact, {c['near']} near")
+        return "\n".join(lines)
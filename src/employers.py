@@ -0,0 +1,257 @@
+import argparse
+import bisect
+import difflib
+import hashlib
+import json
+import os
+import re
+import time
+from collections import Counter, defaultdict
+from src.output import jsonl_path, read_records, write_records
+from src.registry import state_modules
+from src.utils import LEGAL_SUFFIXES, normalize_name
+
+EMPLOYERS_PATH = "data/employers.json"
+
+# Also dropped from employer names: "Amazon.com Services" is "Amazon Services"
+NAME_SUFFIXES = LEGAL_SUFFIXES | {'com', 'net', 'org'}
+# "X LLC d/b/a Y": X is the employer, Y a trade name shared by unrelated franchisees
+DBA = re.compile(r"\b(?:d b a|doing business as|a k a|aka|f k a|fka|formerly)\b.*$")
+# Runs of single letters are spelled-out initials: "l l c", "u s a"
+INITIALS = re.compile(r"(?<!\S)[a-z](?: [a-z](?!\S))+")
+# Name similarity (difflib ratio) above which two names in the same block are one employer
+NAME_RATIO = 0.9
+# Words two names do not share must be typos of each other: "amazn"/"amazon", but not
+# "si"/"stg" or "austin"/"houston" (two hotels) or "gist"/"lindsey" (two jails)
+WORD_RATIO = 0.85
+# Left out of one spelling or the other: "black and decker" is "black decker"
+FILLER_WORDS = frozenset({'and'})
+# Never a typo of another word: "tcc northeast" and "tcc northwest" are two sites
+DIRECTIONS = frozenset({
+    'north', 'south', 'east', 'west', 'northeast', 'northwest', 'southeast', 'southwest',
+    'n', 's', 'e', 'w', 'ne', 'nw', 'se', 'sw',
+})
+# Names compared pairwise per block; bigger blocks (common first words) are split further
+MAX_BLOCK = 200
+
+
+def canonical_name(name) -> str:
+    """
+    The comparable form of an employer name: normalized, the part before a
+    d/b/a, spelled-out initials joined ("L.L.C." -> "llc") and legal suffixes
+    dropped. "AMAZON.COM SERVICES, LLC" -> "amazon services".
+    """
+    text = normalize_name(name)
+    legal = DBA.sub("", text).strip()
+    if legal:
+        text = legal
+    tokens = INITIALS.sub(lambda m: m.group().replace(" ", ""), text).split()
+    return " ".join(t for t in tokens if t not in NAME_SUFFIXES)
+
+
+class _Clusters:
+    """Union-find over name indexes."""
+
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i, j):
+        i, j = self.find(i), self.find(j)
+        if i != j:
+            self.parent[max(i, j)] = min(i, j)
+
+
+def _digits(tokens):
+    return [t for t in tokens if any(c.isdigit() for c in t)]
+
+
+def _same_word(x, y) -> bool:
+    if x in DIRECTIONS or y in DIRECTIONS:
+        return False
+    # A word cut short by a column width ("adhes", "serv") is the whole word
+    if min(len(x), len(y)) >= 3 and (x.startswith(y) or y.startswith(x)):
+        return True
+    return difflib.SequenceMatcher(None, x, y).ratio() >= WORD_RATIO
+
+
+def _typos_only(tokens_a, tokens_b) -> bool:
+    """
+    Whether the words only one name has are, in order, typos or truncations of
+    the other's, or the same words split differently ("wal mart", "walmart").
+    """
+    only_a = [t for t in tokens_a if t not in tokens_b and t not in FILLER_WORDS]
+    only_b = [t for t in tokens_b if t not in tokens_a and t not in FILLER_WORDS]
+    if len(only_a) != len(only_b):
+        only_a, only_b = ["".join(only_a)], ["".join(only_b)]
+    return all(_same_word(x, y) for x, y in zip(only_a, only_b))
+
+
+def _similar(a, b, tokens_a, tokens_b) -> bool:
+    if _digits(tokens_a) != _digits(tokens_b):
+        return False
+    if not _typos_only(tokens_a, tokens_b):
+        return False
+    matcher = difflib.SequenceMatcher(None, a, b)
+    return matcher.real_quick_ratio() >= NAME_RATIO and matcher.quick_ratio() >= NAME_RATIO and matcher.ratio() >= NAME_RATIO
+
+
+def _blocks(names, tokens):
+    """
+    Indexes of names that may be the same employer: names sharing their first
+    word, and names sharing everything after it (which catches typos in the
+    first word). Blocks over MAX_BLOCK are split on the second word and on the
+    start of the first word respectively.
+    """
+    by_head, by_rest = defaultdict(list), defaultdict(list)
+    for i, words in enumerate(tokens):
+        by_head[words[0]].append(i)
+        if len(words) > 1:
+            by_rest[" ".join(words[1:])].append(i)
+    for blocks, split_key in ((by_head, lambda words: words[1:2]), (by_rest, lambda words: words[0][:3])):
+        for block in blocks.values():
+            if len(block) <= MAX_BLOCK:
+                yield block
+                continue
+            split = defaultdict(list)
+            for i in block:
+                split[str(split_key(tokens[i]))].append(i)
+            yield from (part for part in split.values() if len(part) <= MAX_BLOCK)
+
+
+def cluster_names(names) -> list[list[str]]:
+    """
+    Group canonical names into employers. Names in the same block are joined
+    when at least NAME_RATIO similar with the same numbers ("Plant 3" is not
+    "Plant 4") and the words only one of them has are typos of the other's,
+    so sites named by place or building ("hotel austin", "hotel houston")
+    stay apart. A name is then joined to the longer names starting with it
+    ("amazon" -> "amazon services") when those are all one employer; this
+    is intended, and also puts a bare "four seasons hotel" with its only site.
+    Returns the groups, largest first.
+    """
+    names = sorted(set(n for n in names if n))
+    tokens = [n.split() for n in names]
+    clusters = _Clusters(len(names))
+
+    for block in _blocks(names, tokens):
+        for x, i in enumerate(block):
+            for j in block[x + 1:]:
+                if clusters.find(i) != clusters.find(j) and _similar(names[i], names[j], tokens[i], tokens[j]):
+                    clusters.union(i, j)
+
+    # Sorted names starting with "<name> " are contiguous
+    for i, name in enumerate(names):
+        if len(tokens[i][0]) < 4:
+            continue
+        end = bisect.bisect_left(names, name + "!", i + 1)
+        roots = {clusters.find(j) for j in range(i + 1, end) if names[j].startswith(name + " ")}
+        if len(roots) == 1:
+            clusters.union(i, roots.pop())
+
+    groups = defaultdict(list)
+    for i, name in enumerate(names):
+        groups[clusters.find(i)].append(name)
+    return sorted(groups.values(), key=lambda g: (-len(g), g[0]))
+
+
+def _new_id(name, taken):
+    digest = hashlib.sha1(name.encode()).hexdigest()
+    for start in range(0, len(digest) - 10):
+        employer_id = f"emp-{digest[start:start + 10]}"
+        if employer_id not in taken:
+            return employer_id
+    raise ValueError(f"No free employer id for {name!r}")
+
+
+def assign_ids(groups, known=None) -> dict:
+    """
+    An employer_id for every canonical name. A group keeps the id most of its
+    names already had in known (so ids survive reruns and new spellings); a
+    new group gets one derived from its first name. Names in known that are
+    no longer seen keep their ids.
+    """
+    known = dict(known or {})
+    # Ids given to a group in this run, and every id ever given (which new ids must avoid)
+    taken = set()
+    used = set(known.values())
+    for group in groups:
+        previous = Counter(known[name] for name in group if name in known)
+        employer_id = next((i for i, _ in sorted(previous.items(), key=lambda p: (-p[1], p[0])) if i not in taken), None)
+        if employer_id is None:
+            employer_id = _new_id(group[0], used)
+        taken.add(employer_id)
+        used.add(employer_id)
+        for name in group:
+            known[name] = employer_id
+    return known
+
+
+def load_ids(path=EMPLOYERS_PATH) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_ids(ids, path=EMPLOYERS_PATH):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(ids, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def resolve_states(states=None, path=EMPLOYERS_PATH) -> dict:
+    """
+    Cluster the employers of every state's output, set employer_id on each
+    record and rewrite the outputs whose ids changed. The name -> id map is
+    kept in path so ids stay the same from run to run.
+    Returns the number of records per state.
+    """
+    outputs = {}
+    for state in states or state_modules():
+        try:
+            outputs[state] = list(read_records(f"data/{state}.json"))
+        except FileNotFoundError:
+            continue
+
+    canonical = {}
+    for records in outputs.values():
+        for record in records:
+            name = (record.get("employer") or {}).get("name")
+            if name not in canonical:
+                canonical[name] = canonical_name(name)
+    groups = cluster_names(canonical.values())
+    ids = assign_ids(groups, load_ids(path))
+
+    for state, records in outputs.items():
+        changed = False
+        for record in records:
+            employer_id = ids.get(canonical[(record.get("employer") or {}).get("name")])
+            if record.get("employer_id") != employer_id:
+                record["employer_id"] = employer_id
+                changed = True
+        if changed:
+            output_file = f"data/{state}.json"
+            # Keep the output in the format it was written in
+            write_records(output_file, records, compress=os.path.exists(jsonl_path(output_file, True)))
+    save_ids(ids, path)
+    print(f"{len(canonical)} employer names in {len(groups)} employers")
+    return {state: len(records) for state, records in outputs.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Set employer_id on every state's records")
+    parser.add_argument("--states", type=lambda v: [s.strip().lower() for s in v.split(',') if s.strip()], help="Comma-separated states to resolve (default: all)")
+    parser.add_argument("--ids", default=EMPLOYERS_PATH, help=f"Name -> employer_id map (default: {EMPLOYERS_PATH})")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = resolve_states(args.states, args.ids)
+    print(f"Resolved employers of {sum(counts.values())} records in {len(counts)} states in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,137 @@
+import argparse
+import os
+import shutil
+import time
+import pandas as pd
+from src.output import read_records
+from src.registry import state_modules
+
+PARQUET_DIR = "data/warn.parquet"
+PARTITION_COLUMNS = ("state", "warn_year")
+
+# Flat columns of one WarnRecord, in file order; the partition columns are added by the dataset
+COLUMNS = (
+    "employer_name", "employer_id", "employer_street", "employer_municipality", "employer_state", "employer_zip",
+    "location_street", "location_municipality", "location_state", "location_zip",
+    "union_name", "union_street", "union_municipality", "union_state", "union_zip",
+    "contact_name", "contact_phone",
+    "warn_date", "layoff_date", "type", "impacted", "notes", "link",
+)
+ADDRESS_FIELDS = ("street", "municipality", "state", "zip")
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Parquet export needs pyarrow: uv sync --extra parquet") from e
+    return pyarrow
+
+
+def _schema(pa):
+    string = pa.string()
+    # Few distinct values per column, stored once per file and read back as pandas categoricals
+    category = pa.dictionary(pa.int32(), pa.string())
+    types = {column: string for column in COLUMNS}
+    types.update(warn_date=pa.date32(), layoff_date=pa.date32(), impacted=pa.int64(), type=category, link=category)
+    return pa.schema([(column, types[column]) for column in COLUMNS] + [("state", category), ("warn_year", pa.int32())])
+
+
+def _partitioning(pa):
+    return pa.dataset.partitioning(pa.schema([("state", pa.string()), ("warn_year", pa.int32())]), flavor="hive")
+
+
+def flatten_record(record: dict, state: str) -> dict:
+    """One WarnRecord dict as a row of COLUMNS plus its partition keys."""
+    row = {"employer_name": (record.get("employer") or {}).get("name"), "employer_id": record.get("employer_id")}
+    for prefix, address in (
+        ("employer", (record.get("employer") or {}).get("address")),
+        ("location", record.get("location")),
+        ("union", (record.get("union") or {}).get("address")),
+    ):
+        address = address or {}
+        for field in ADDRESS_FIELDS:
+            row[f"{prefix}_{field}"] = address.get(field)
+    row["union_name"] = (record.get("union") or {}).get("name")
+    contact = record.get("contact") or {}
+    row["contact_name"] = contact.get("name")
+    row["contact_phone"] = contact.get("phone")
+    for field in ("warn_date", "layoff_date", "type", "impacted", "notes", "link"):
+        row[field] = record.get(field)
+    row["state"] = state
+    row["warn_year"] = int(record["warn_date"][:4]) if record.get("warn_date") else None
+    return row
+
+
+def national_frame(states=None) -> pd.DataFrame:
+    """Every state's output (data/<state>.jsonl or the legacy JSON) as one flat frame."""
+    rows = []
+    for state in states or state_modules():
+        try:
+            rows.extend(flatten_record(record, state) for record in read_records(f"data/{state}.json"))
+        except FileNotFoundError:
+            print(f"No output for {state}, skipping")
+    frame = pd.DataFrame(rows, columns=list(COLUMNS) + list(PARTITION_COLUMNS))
+    for column in ("warn_date", "layoff_date"):
+        frame[column] = pd.to_datetime(frame[column], errors="coerce").dt.date
+    return frame
+
+
+def export_parquet(root=PARQUET_DIR, states=None) -> int:
+    """
+    Write all state outputs to a Parquet dataset at root, partitioned into
+    state=<state>/warn_year=<year> directories (records without a warn date go
+    to the __HIVE_DEFAULT_PARTITION__ year). The previous dataset is replaced
+    only once the new one is complete. Returns the number of rows written.
+    """
+    pa = _pyarrow()
+    frame = national_frame(states)
+    # The loader has its own schema; pandas metadata would be repeated in every one of the small files
+    table = pa.Table.from_pandas(frame, schema=_schema(pa), preserve_index=False).replace_schema_metadata(None)
+
+    tmp_root = f"{root}.tmp"
+    shutil.rmtree(tmp_root, ignore_errors=True)
+    options = pa.dataset.ParquetFileFormat().make_write_options(compression="zstd")
+    pa.dataset.write_dataset(table, tmp_root, format="parquet", partitioning=_partitioning(pa), file_options=options)
+    if os.path.exists(root):
+        shutil.rmtree(root)
+    os.replace(tmp_root, root)
+    return len(frame)
+
+
+def load_parquet(root=PARQUET_DIR, columns=None, states=None, years=None) -> pd.DataFrame:
+    """
+    Read the exported dataset back as a flat frame. Only the requested columns
+    are read, and only the partition directories matching states and years
+    (warn years) are opened.
+    """
+    pa = _pyarrow()
+    schema = _schema(pa)
+    # state comes from the directory names, as plain strings
+    schema = schema.set(schema.get_field_index("state"), pa.field("state", pa.string()))
+    dataset = pa.dataset.dataset(root, schema=schema, format="parquet", partitioning=_partitioning(pa))
+    condition = None
+    if states:
+        condition = pa.dataset.field("state").isin([s.lower() for s in states])
+    if years:
+        by_year = pa.dataset.field("warn_year").isin([int(y) for y in years])
+        condition = by_year if condition is None else condition & by_year
+    table = dataset.to_table(columns=list(columns) if columns else None, filter=condition)
+    # Nullable integers rather than floats with NaN
+    frame = table.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype(), pa.int32(): pd.Int32Dtype()}.get)
+    if "state" in frame:
+        frame["state"] = frame["state"].astype("category")
+    return frame
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export all state outputs to a partitioned Parquet dataset")
+    parser.add_argument("--states", type=lambda v: [s.strip().lower() for s in v.split(',') if s.strip()], help="Comma-separated states to export (default: all)")
+    parser.add_argument("--out", default=PARQUET_DIR, help=f"Dataset directory (default: {PARQUET_DIR})")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    count = export_parquet(args.out, args.states)
+    print(f"Exported {count} records to {args.out} in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,69 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_WORKERS = 6
+# Requests in flight against any one host; state sites are easily overwhelmed
+DEFAULT_PER_HOST = 4
+
+
+def make_session(pool_size=DEFAULT_WORKERS, headers=None, verify=True):
+    """Session keeping up to pool_size connections per host alive, retrying transient errors."""
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(headers or {})
+    if not verify:
+        # Some state sites have broken certificate chains
+        session.verify = False
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    return session
+
+
+def get_text(session, url, timeout=30):
+    """GET a page through session, raising for error statuses."""
+    print('Visiting ' + url)
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.text
+
+
+def not_found(error):
+    """Whether error is an HTTP 404, e.g. for a year that is not published yet."""
+    return isinstance(error, requests.HTTPError) and error.response is not None and error.response.status_code == 404
+
+
+def fetch_partitions(urls, fetch, workers=DEFAULT_WORKERS, per_host=DEFAULT_PER_HOST):
+    """
+    fetch(url) for every url of a partitioned source (one page or file per
+    year) on a thread pool: at most `workers` at once and `per_host` against
+    any one host, so the total time approaches the slowest partition rather
+    than the sum. Returns [(url, result, error)] in the order of urls, with
+    the exception fetch raised as error.
+    """
+    host_slots = {}
+    lock = threading.Lock()
+
+    def slot(url):
+        host = urlparse(url).netloc
+        with lock:
+            if host not in host_slots:
+                host_slots[host] = threading.BoundedSemaphore(per_host)
+            return host_slots[host]
+
+    def run(url):
+        with slot(url):
+            try:
+                return url, fetch(url), None
+            except Exception as e:
+                return url, None, e
+
+    urls = list(urls)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(urls)))) as pool:
+        return list(pool.map(run, urls))
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+import requests
+
+CACHE_DIR = "data/http_cache"
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+@dataclass
+class Download:
+    url: str
+    # The body on disk, valid until the entry is evicted
+    path: str
+    # 200 when the body was downloaded, 304 when the cached copy was still current
+    status: int
+    size: int
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+    @property
+    def content(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+
+class DownloadCache:
+    """
+    On-disk HTTP cache for the spreadsheets and PDFs scrapers download every run.
+
+    Bodies are stored with their ETag/Last-Modified and revalidated with a
+    conditional GET, so an unchanged file costs a 304 instead of a download.
+    Each entry is a <key>.body / <key>.json pair (no shared index, so scrapers
+    in other processes can use the same directory). Once the bodies exceed
+    max_bytes the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, session=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.session = session or requests.Session()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.bytes_downloaded = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode()).hexdigest()[:32]
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}.body", f"{base}.json"
+
+    def _read_meta(self, meta_path, body_path):
+        if not os.path.exists(body_path):
+            return None
+        try:
+            with open(meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, url, headers=None, timeout=60):
+        """
+        The body of url, revalidating any cached copy.
+        Raises requests.HTTPError for error statuses, like raise_for_status().
+        """
+        body_path, meta_path = self._paths(url)
+        meta = self._read_meta(meta_path, body_path)
+
+        request_headers = dict(headers or {})
+        if meta and meta.get("etag"):
+            request_headers["If-None-Match"] = meta["etag"]
+        if meta and meta.get("last_modified"):
+            request_headers["If-Modified-Since"] = meta["last_modified"]
+
+        with self.session.get(url, headers=request_headers, timeout=timeout, stream=True) as response:
+            if response.status_code == 304 and meta:
+                # Mark as recently used for eviction
+                os.utime(body_path)
+                with self._lock:
+                    self.hits += 1
+                    self.bytes_saved += meta["size"]
+                return Download(url=url, path=body_path, status=304, size=meta["size"])
+            response.raise_for_status()
+
+            tmp_path = f"{body_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            size = 0
+            with open(tmp_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    f.write(chunk)
+                    size += len(chunk)
+            os.replace(tmp_path, body_path)
+            meta = {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "size": size,
+            }
+            with open(f"{meta_path}.tmp", "w") as f:
+                json.dump(meta, f)
+            os.replace(f"{meta_path}.tmp", meta_path)
+
+        with self._lock:
+            self.misses += 1
+            self.bytes_downloaded += size
+        self.evict(keep=body_path)
+        return Download(url=url, path=body_path, status=response.status_code, size=size)
+
+    def evict(self, keep=None):
+        """Remove least recently used entries until the bodies fit in max_bytes."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".body"):
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            for stale in (path, path[:-len(".body")] + ".json"):
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+            total -= size
+
+    def stats(self):
+        return (f"download cache: {self.hits} not modified, {self.misses} downloaded, "
+                f"{format_bytes(self.bytes_saved)} saved, {format_bytes(self.bytes_downloaded)} fetched")
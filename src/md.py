@@ -1,57 +1,59 @@
+import io
 import pandas as pd
-import json
-from src.models import WarnRecord, Employee, Address
-from src.utils import clean_impacted, derive_warn_type
+from src.convert import date_column, frame_to_records, impacted_column, text_column, warn_type_column
+from src.fetch import get_text, make_session
+from src.dedup import Deduper
+from src.partitions import PartitionStore
+from src.registry import PartialScrape, ScraperKind, register
 
-def parse(url):
-    print('Visiting ' + url)
-    df = pd.read_html(url)
+# Bump when the records change shape; sealed years are refetched once
+PARSER_VERSION = 2
+
+def parse(url, html):
+    df = pd.read_html(io.StringIO(html))
     df = df[0]
 
     df = df.tail(-1) # The first row is headers
     # Rename columns to match our processing logic
     df = df.rename(columns={0: "warn_date", 2: "company", 3: "street_address", 4: "municipality", 5: "employees_impacted", 6: "layoff_date", 7: "note"})
     df = df[["warn_date", "company", "street_address", "municipality", "employees_impacted", "layoff_date", "note"]]
-    df['state'] = 'md'
-
-    records = []
-    for _, row in df.iterrows():
-        try:
-            # Handle potential NaN in company
-            company_name = str(row['company']) if pd.notna(row['company']) else None
-            if not company_name or company_name == "NO WARNS REPORTED":
-                continue
-
-            warn_date = pd.to_datetime(row['warn_date'], errors='coerce')
-            layoff_date = pd.to_datetime(row['layoff_date'], errors='coerce')
-
-            record = WarnRecord(
-                employer=Employee(name=company_name),
-                location=Address(
-                    street=str(row['street_address']) if pd.notna(row['street_address']) else None,
-                    municipality=str(row['municipality']) if pd.notna(row['municipality']) else None,
-                    state="md"
-                ),
-                warn_date=warn_date.date() if pd.notna(warn_date) else None,
-                layoff_date=layoff_date.date() if pd.notna(layoff_date) else None,
-                type=derive_warn_type(row['note']),
-                impacted=clean_impacted(row['employees_impacted']),
-                notes=str(row['note']) if pd.notna(row['note']) else None
-            )
-            records.append(record.model_dump(mode='json'))
-        except Exception as e:
-            print(f"Error parsing row: {e}")
+
+    company = df['company']
+    keep = company.notna() & ~company.astype(str).isin(['', 'NO WARNS REPORTED'])
+
+    frame = pd.DataFrame({
+        'company': text_column(company, strip=False),
+        'street': text_column(df['street_address'], strip=False),
+        'municipality': text_column(df['municipality'], strip=False),
+        'warn_date': date_column(df['warn_date']),
+        'layoff_date': date_column(df['layoff_date']),
+        'type': warn_type_column(df['note']),
+        'impacted': impacted_column(df['employees_impacted']),
+        'notes': text_column(df['note'], strip=False),
+    }, index=df.index)
+    records = frame_to_records(frame[keep], "md")
     
     return records
 
-urls = ['https://www.dllr.state.md.us/employment/warn.shtml']
-# Add years 2025 down to 2010
-for year in range(2025, 2009, -1):
-    urls.append(f'https://www.dllr.state.md.us/employment/warn{year}.shtml')
-
-all_records = []
-for url in urls:
-    all_records.extend(parse(url))
+@register("md", ScraperKind.HTML, cadence="weekly")
+def scrape_md():
+    # The current year's page has no year in its name, it never seals
+    urls = {'current': 'https://www.dllr.state.md.us/employment/warn.shtml'}
+    # Add years 2025 down to 2010
+    for year in range(2025, 2009, -1):
+        urls[year] = f'https://www.dllr.state.md.us/employment/warn{year}.shtml'
+    store = PartitionStore("md", version=PARSER_VERSION)
+
+    with make_session() as session:
+        failed = store.refresh(urls, lambda url: get_text(session, url), parse)
+
+    # The current page repeats notices from the latest yearly pages
+    deduper = Deduper("md")
+    records = store.assemble(urls, deduper)
+    print(deduper.report())
+    if failed:
+        raise PartialScrape("md", failed, records)
+    return records
 
-with open("./data/md.json", "w") as f:
-    json.dump(all_records, f, indent=2)
+if __name__ == "__main__":
+    scrape_md()
@@ -1,5 +1,11 @@
+from src.registry import ScraperKind, register
 from src.scrape_ajc import scrape_ajc
 
+URL = "https://joblink.maine.gov/search/warn_lookups?q%5Bnotice_eq%5D=true&commit=Search"
+
+@register("me", ScraperKind.HTML)
+def scrape_me():
+    return scrape_ajc(URL, "me", "data/me.json")
+
 if __name__ == "__main__":
-    url = "https://joblink.maine.gov/search/warn_lookups?q%5Bnotice_eq%5D=true&commit=Search"
-    scrape_ajc(url, "me", "data/me.json")
+    scrape_me()
@@ -1,7 +1,8 @@
 from enum import Enum
+from functools import lru_cache
 from typing import Optional
 from datetime import date
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, HttpUrl, TypeAdapter, ValidationError
 
 class WarnType(str, Enum):
     CLOSURE = "Closure"
@@ -33,3 +34,69 @@ class WarnRecord(BaseModel):
     impacted: Optional[int] = None
     notes: Optional[str] = None
     link: Optional[HttpUrl] = None
+    # Same employer across states and spellings; filled in by src/employers.py
+    employer_id: Optional[str] = None
+
+
+_LINK = TypeAdapter(HttpUrl)
+
+
+@lru_cache(maxsize=1024)
+def _link_json(link: str) -> str:
+    """A link as model_dump(mode='json') writes it, validated once per distinct value."""
+    return str(_LINK.validate_python(link))
+
+
+# Exact types of already-normalized values; subclasses (datetime, Timestamp, numpy ints) are validated fully
+_TEXT = {str, type(None)}
+_DATE = {date, type(None)}
+_INT = {int, type(None)}
+_WARN_TYPE = {WarnType, type(None)}
+
+
+def _normalized(texts, dates, impacted, warn_type, link) -> bool:
+    return (set(map(type, texts)) <= _TEXT and set(map(type, dates)) <= _DATE
+            and type(impacted) in _INT and type(warn_type) in _WARN_TYPE and type(link) in _TEXT)
+
+
+def record_dict(company=None, street=None, municipality=None, state=None, zip=None, union=None,
+                warn_date=None, layoff_date=None, type=None, impacted=None, notes=None, link=None) -> dict:
+    """
+    WarnRecord(...).model_dump(mode='json') for one row, skipping the models when
+    the values are already normalized: str, date, int and WarnType (or None), as
+    the converters in src/convert.py produce them. The link is validated once per
+    distinct URL. Anything else, including a union, goes through full WarnRecord
+    validation, which raises ValidationError for bad rows as before.
+    """
+    if union is None and _normalized((company, street, municipality, state, zip, notes), (warn_date, layoff_date), impacted, type, link):
+        try:
+            link = _link_json(link) if link is not None else None
+        except ValidationError:
+            pass
+        else:
+            return {
+                'employer': {'name': company, 'address': None},
+                'location': {'street': street, 'municipality': municipality, 'state': state, 'zip': zip},
+                'union': None,
+                'contact': None,
+                'warn_date': warn_date.isoformat() if warn_date is not None else None,
+                'layoff_date': layoff_date.isoformat() if layoff_date is not None else None,
+                'type': type.value if type is not None else None,
+                'impacted': impacted,
+                'notes': notes,
+                'link': link,
+                'employer_id': None,
+            }
+
+    record = WarnRecord(
+        employer=Employee(name=company),
+        location=Address(street=street, municipality=municipality, state=state, zip=zip),
+        union=union,
+        warn_date=warn_date,
+        layoff_date=layoff_date,
+        type=type,
+        impacted=impacted,
+        notes=notes,
+        link=link,
+    )
+    return record.model_dump(mode='json')
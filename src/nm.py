@@ -1,13 +1,18 @@
-import requests
-import pdfplumber
 import pandas as pd
-import io
-import json
 import re
 from datetime import datetime
 
-from src.models import WarnRecord, Employee, Address
+from src.models import record_dict
 from src.utils import clean_impacted, derive_warn_type
+from src.registry import PartialScrape, ScraperKind, register
+from src.fetch import make_session
+from src.http_cache import DownloadCache
+from src.parse_cache import cached_parse
+from src.partitions import PartitionStore
+from src.pdf_tables import extract_page_tables
+
+# Bump when parsing changes so cached records from the parse cache are rebuilt
+PARSER_VERSION = 3
 
 def parse_date(date_str):
     if not date_str:
@@ -18,76 +23,72 @@ def parse_date(date_str):
     except ValueError:
         return None
 
-def _parse_pdf(pdf_file, url):
-    """Extract WARN records from an NM PDF file object."""
+def _parse_pdf(pdf_file, url, workers=None):
+    """Extract WARN records from an NM PDF file."""
     records = []
-    with pdfplumber.open(pdf_file) as pdf:
-        for page in pdf.pages:
-            tables = page.extract_tables()
-            if not tables:
+    for tables in extract_page_tables(pdf_file, "extract_tables", workers):
+        if not tables:
+            continue
+
+        for table in tables:
+            if len(table) < 2:
                 continue
 
-            for table in tables:
-                if len(table) < 2:
-                    continue
+            # Locate header row
+            header_row_idx = -1
+            for i, row in enumerate(table):
+                row_str = " ".join([str(cell).replace('\n', ' ') for cell in row if cell]).upper()
+                if "NOTICE DATE" in row_str and "JOB SITE NAME" in row_str:
+                    header_row_idx = i
+                    break
 
-                # Locate header row
-                header_row_idx = -1
-                for i, row in enumerate(table):
-                    row_str = " ".join([str(cell).replace('\n', ' ') for cell in row if cell]).upper()
-                    if "NOTICE DATE" in row_str and "JOB SITE NAME" in row_str:
-                        header_row_idx = i
-                        break
+            if header_row_idx == -1:
+                continue
 
-                if header_row_idx == -1:
+            # Identify column indices by header text
+            header_map = {}
+            raw_header_row = table[header_row_idx]
+            for idx, cell in enumerate(raw_header_row):
+                if not cell:
+                    continue
+                text = str(cell).replace('\n', ' ').strip().upper()
+                if "NOTICE DATE" in text:   header_map['warn_date'] = idx
+                elif "JOB SITE NAME" in text: header_map['company'] = idx
+                elif "TOTAL LAYOFF" in text:  header_map['impacted'] = idx
+                elif "LAYOFF DATE" in text:   header_map['layoff_date'] = idx
+                elif "CITY NAME" in text:     header_map['city'] = idx
+
+            # Process data rows
+            for row in table[header_row_idx + 1:]:
+                if not row:
                     continue
+                try:
+                    def _get(key):
+                        idx = header_map.get(key)
+                        return row[idx] if idx is not None and idx < len(row) else None
 
-                # Identify column indices by header text
-                header_map = {}
-                raw_header_row = table[header_row_idx]
-                for idx, cell in enumerate(raw_header_row):
-                    if not cell:
-                        continue
-                    text = str(cell).replace('\n', ' ').strip().upper()
-                    if "NOTICE DATE" in text:   header_map['warn_date'] = idx
-                    elif "JOB SITE NAME" in text: header_map['company'] = idx
-                    elif "TOTAL LAYOFF" in text:  header_map['impacted'] = idx
-                    elif "LAYOFF DATE" in text:   header_map['layoff_date'] = idx
-                    elif "CITY NAME" in text:     header_map['city'] = idx
-
-                # Process data rows
-                for row in table[header_row_idx + 1:]:
-                    if not row:
-                        continue
-                    try:
-                        def _get(key):
-                            idx = header_map.get(key)
-                            return row[idx] if idx is not None and idx < len(row) else None
-
-                        company_raw = _get('company')
-                        if not company_raw:
-                            continue
-
-                        record = WarnRecord(
-                            employer=Employee(name=str(company_raw).strip()),
-                            location=Address(
-                                municipality=str(_get('city')).strip() if _get('city') else None,
-                                state="nm"
-                            ),
-                            warn_date=parse_date(_get('warn_date')),
-                            layoff_date=parse_date(_get('layoff_date')),
-                            type=None,
-                            impacted=clean_impacted(str(_get('impacted'))) if _get('impacted') else None,
-                            link=url,
-                            notes=None
-                        )
-                        records.append(record.model_dump(mode='json'))
-                    except Exception as e:
-                        print(f"Error processing row: {row} - {e}")
+                    company_raw = _get('company')
+                    if not company_raw:
                         continue
+
+                    records.append(record_dict(
+                        company=str(company_raw).strip(),
+                        municipality=str(_get('city')).strip() if _get('city') else None,
+                        state="nm",
+                        warn_date=parse_date(_get('warn_date')),
+                        layoff_date=parse_date(_get('layoff_date')),
+                        type=None,
+                        impacted=clean_impacted(str(_get('impacted'))) if _get('impacted') else None,
+                        link=url,
+                        notes=None
+                    ))
+                except Exception as e:
+                    print(f"Error processing row: {row} - {e}")
+                    continue
     return records
 
 
+@register("nm", ScraperKind.PDF, cadence="weekly")
 def scrape_nm():
     base_url = "https://www.dws.state.nm.us/Portals/0/DM/Business/{year}_WARN.pdf"
     headers = {
@@ -98,29 +99,32 @@ def scrape_nm():
     # NM posts WARN PDFs starting around 2016; adjust START_YEAR if needed
     START_YEAR = 2016
 
-    all_records = []
-    for year in range(START_YEAR, current_year + 1):
-        url = base_url.format(year=year)
-        print(f"Fetching {url}")
-        try:
-            response = requests.get(url, headers=headers, timeout=30)
-            if response.status_code == 404:
-                print(f"  No PDF found for {year} (404), skipping.")
-                continue
-            response.raise_for_status()
-
-            pdf_file = io.BytesIO(response.content)
-            year_records = _parse_pdf(pdf_file, url)
-            print(f"  Found {len(year_records)} records for {year}.")
-            all_records.extend(year_records)
-        except Exception as e:
-            print(f"  Error fetching/parsing {year}: {e}")
-            continue
+    urls = {year: base_url.format(year=year) for year in range(START_YEAR, current_year + 1)}
+    store = PartitionStore("nm", version=PARSER_VERSION)
+    session = make_session(headers=headers)
+    downloads = DownloadCache(session=session)
 
-    output_file = "data/nm.json"
-    with open(output_file, "w") as f:
-        json.dump(all_records, f, indent=2)
-    print(f"Successfully scraped {len(all_records)} total records to {output_file}")
+    def fetch(url):
+        print(f"Fetching {url}")
+        return downloads.get(url, timeout=30)
+
+    def parse(url, download):
+        if download.not_modified:
+            print(f"  {url} not modified since last run, using cached PDF.")
+        records = cached_parse(download.path, url, "nm-pdf", PARSER_VERSION, lambda: _parse_pdf(download.path, url))
+        print(f"  Found {len(records)} records in {url}.")
+        return records
+
+    with session:
+        # Years are downloaded concurrently; parsing stays in order, it is CPU bound
+        failed = store.refresh(urls, fetch, parse)
+
+    all_records = store.assemble(urls)
+    print(f"Successfully scraped {len(all_records)} total records to {store.output_file}")
+    print(f"NM {downloads.stats()}")
+    if failed:
+        raise PartialScrape("nm", failed, all_records)
+    return all_records
 
 
 if __name__ == "__main__":
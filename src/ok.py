@@ -1,17 +1,20 @@
-import json
-from playwright.sync_api import sync_playwright
+from src.browser import browser_context
 from datetime import datetime
 import time
 from src.models import WarnRecord, Employee, Address, WarnType
 from src.utils import clean_impacted, derive_warn_type
+from src.registry import ScraperKind, register
+from src.checkpoint import Checkpoint
 
+@register("ok", ScraperKind.BROWSER)
 def scrape_ok():
     url = "https://www.employoklahoma.gov/Participants/s/warnnotices"
-    results = []
-    
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+    checkpoint = Checkpoint("data/ok.json")
+    if checkpoint.complete:
+        return checkpoint.compact()
+
+    with browser_context() as context:
+        page = context.new_page()
         
         print(f"Navigating to {url}")
         page.goto(url, wait_until="networkidle")
@@ -56,6 +59,7 @@ def scrape_ok():
             """)
             
             print(f"Found {len(rows)} records on page {page_num}")
+            page_records = []
             for row in rows:
                 if len(row) < 6:
                     continue
@@ -83,7 +87,7 @@ def scrape_ok():
                     warn_date=warn_date,
                     type=derive_warn_type(type_str)
                 )
-                results.append(record.model_dump(mode='json'))
+                page_records.append(record.model_dump(mode='json'))
             
             # Next button - also inside shadow root
             has_next = page.evaluate("""
@@ -112,19 +116,20 @@ def scrape_ok():
                 }
             """)
             
+            # Pages done by a resumed run are only paged through
+            if not checkpoint.done(page_num):
+                checkpoint.add_page(page_num, page_records, last=not has_next)
+
             if not has_next:
                 print("No more pages.")
                 break
                 
             page_num += 1
             time.sleep(3) # Wait for page transition
-            
-        browser.close()
         
-    with open("data/ok.json", "w") as f:
-        json.dump(results, f, indent=2)
-    
+    results = checkpoint.compact()
     print(f"Scraped {len(results)} records to data/ok.json")
+    return results
 
 if __name__ == "__main__":
     scrape_ok()
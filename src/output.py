@@ -0,0 +1,146 @@
+import gzip
+import json
+import os
+
+# Set to 1 (e.g. by run_all --gzip) to write data/<state>.jsonl.gz instead of data/<state>.jsonl
+OUTPUT_GZIP_ENV = "WARN_OUTPUT_GZIP"
+# Set to 0 (e.g. by run_all --no-legacy-json) to stop also writing the pretty data/<state>.json
+LEGACY_JSON_ENV = "WARN_LEGACY_JSON"
+
+
+def _env_flag(name, default):
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return default
+    return value.lower() not in ("0", "false", "no")
+
+
+def jsonl_path(output_file, compress=False):
+    """data/<state>.json -> data/<state>.jsonl (or .jsonl.gz)"""
+    root, _ = os.path.splitext(output_file)
+    return f"{root}.jsonl.gz" if compress else f"{root}.jsonl"
+
+
+def _open(path, mode, compress):
+    if compress:
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def write_legacy_json(records, path):
+    """
+    Write records as json.dump(records, f, indent=2) would, one record at a
+    time, so the pretty file never needs the whole list in memory.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        first = True
+        for record in records:
+            f.write("[\n" if first else ",\n")
+            f.write("\n".join("  " + line for line in json.dumps(record, indent=2).split("\n")))
+            first = False
+        f.write("[]" if first else "\n]")
+    os.replace(tmp_path, path)
+
+
+class RecordWriter:
+    """
+    Streams a scraper's records to data/<state>.jsonl, one line per record.
+
+    Lines go to data/<state>.jsonl.partial as they are written (flushed after
+    every write_all, so other processes can follow a scrape in progress), which
+    replaces the previous output only when the block exits cleanly; on error
+    the previous output is left alone. With compress the file is gzipped. With
+    legacy_json the pretty data/<state>.json is rebuilt from the new file.
+    """
+
+    def __init__(self, output_file, compress=None, legacy_json=None):
+        if compress is None:
+            compress = _env_flag(OUTPUT_GZIP_ENV, False)
+        if legacy_json is None:
+            legacy_json = _env_flag(LEGACY_JSON_ENV, True)
+        self.output_file = output_file
+        self.path = jsonl_path(output_file, compress)
+        self.partial_path = f"{self.path}.partial"
+        self.compress = compress
+        self.legacy_json = legacy_json
+        self.count = 0
+        self._file = None
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = _open(self.partial_path, "w", self.compress)
+        return self
+
+    def write(self, record):
+        self._file.write(json.dumps(record) + "\n")
+        self.count += 1
+
+    def write_all(self, records):
+        for record in records:
+            self.write(record)
+        self._file.flush()
+
+    def records(self):
+        """The records written, read back from the output when iterated (after the block)."""
+        return OutputRecords(self.output_file, self.count)
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+        if exc_type is not None:
+            os.remove(self.partial_path)
+            return False
+        os.replace(self.partial_path, self.path)
+        # Drop the other variant so readers never pick up a stale file
+        other = jsonl_path(self.output_file, not self.compress)
+        if os.path.exists(other):
+            os.remove(other)
+        if self.legacy_json:
+            write_legacy_json(read_records(self.output_file), self.output_file)
+        return False
+
+
+class OutputRecords:
+    """
+    What a streaming scraper returns instead of the list of records it wrote:
+    len() is known without reading them, iterating reads them back from the
+    output file.
+    """
+
+    def __init__(self, output_file, count):
+        self.output_file = output_file
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return read_records(self.output_file)
+
+
+def write_records(output_file, records, compress=None, legacy_json=None):
+    """Write a finished list of records through a RecordWriter and return them."""
+    with RecordWriter(output_file, compress, legacy_json) as writer:
+        writer.write_all(records)
+    return records
+
+
+def read_records(output_file):
+    """
+    The records of data/<state>.json, one at a time: from data/<state>.jsonl.gz
+    or data/<state>.jsonl when present, otherwise from the legacy pretty JSON.
+    """
+    for compress in (True, False):
+        path = jsonl_path(output_file, compress)
+        if os.path.exists(path):
+            with _open(path, "r", compress) as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+            return
+    with open(output_file, encoding="utf-8") as f:
+        yield from json.load(f)
+
+
+def load_records(output_file) -> list[dict]:
+    return list(read_records(output_file))
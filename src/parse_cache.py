@@ -0,0 +1,84 @@
+import hashlib
+import json
+import os
+
+PARSE_CACHE_DIR = "data/parse_cache"
+# Entries kept across all parsers; the least recently used go first
+MAX_ENTRIES = 256
+
+
+def file_sha256(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _evict(cache_dir, keep):
+    entries = []
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        # .json entries are from before records were cached a line at a time
+        if name.endswith((".json", ".jsonl")) and path != keep:
+            try:
+                entries.append((os.stat(path).st_mtime, path))
+            except OSError:
+                continue
+    for _, path in sorted(entries)[:max(0, len(entries) + 1 - MAX_ENTRIES)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def cached_records(path, url, parser, version, produce, cache_dir=PARSE_CACHE_DIR):
+    """
+    The records produce() yields for the file at path, one at a time, reusing
+    the records built last time the same bytes were parsed from url by this
+    parser at this version. The entry is one header line and one line per
+    record, so neither a hit nor a miss holds all the records in memory; on a
+    miss each record is cached as it is passed on.
+    Bump the parser's version whenever its output would change; entries written
+    by another version are ignored and replaced. Errors from produce()
+    propagate and nothing is cached, as when the caller stops early.
+    """
+    sha = file_sha256(path)
+    entry_path = os.path.join(cache_dir, f"{parser}-{sha}.jsonl")
+    try:
+        f = open(entry_path)
+    except OSError:
+        f = None
+    if f is not None:
+        with f:
+            try:
+                header = json.loads(f.readline())
+                hit = header["version"] == version and header["url"] == url
+            except (ValueError, KeyError):
+                hit = False
+            if hit:
+                # Mark as recently used for eviction
+                os.utime(entry_path)
+                print(f"  Unchanged since last parse ({sha[:12]}), reusing cached records")
+                for line in f:
+                    yield json.loads(line)
+                return
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as out:
+            out.write(json.dumps({"parser": parser, "version": version, "url": url}) + "\n")
+            for record in produce():
+                out.write(json.dumps(record) + "\n")
+                yield record
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, entry_path)
+    _evict(cache_dir, keep=entry_path)
+
+
+def cached_parse(path, url, parser, version, parse, cache_dir=PARSE_CACHE_DIR) -> list[dict]:
+    """cached_records for a parse() that returns a finished list of records."""
+    return list(cached_records(path, url, parser, version, parse, cache_dir))
@@ -0,0 +1,126 @@
+import json
+import os
+from datetime import datetime
+from src.fetch import fetch_partitions, not_found
+from src.output import RecordWriter
+
+# Set (e.g. by run_all --reseal/--backfill) to refetch sealed partitions and seal them again
+RESEAL_ENV = "WARN_RESEAL"
+# Years refreshed on every run: the current and the previous year
+HORIZON_ENV = "WARN_PARTITION_HORIZON"
+DEFAULT_HORIZON = 2
+
+
+def partition_horizon():
+    value = os.environ.get(HORIZON_ENV)
+    return max(1, int(value)) if value else DEFAULT_HORIZON
+
+
+def _write_atomic(path, write):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+class PartitionStore:
+    """
+    Per-year storage for sources that publish one document per year:
+    data/<state>/<year>.jsonl, plus data/<state>/sealed.json listing the
+    years that are closed. Years older than the horizon are sealed once
+    written and skipped on later runs; data/<state>.json is assembled from
+    the partitions. Keys that are not years (e.g. "current") never seal.
+    Partitions are sealed by a parser version: a scraper bumps its version
+    when its records change shape, which refetches every sealed year once.
+    """
+
+    def __init__(self, state, horizon=None, reseal=None, root="data", version=1):
+        self.state = state
+        self.dir = os.path.join(root, state)
+        self.output_file = os.path.join(root, f"{state}.json")
+        self.manifest_file = os.path.join(self.dir, "sealed.json")
+        self.horizon = horizon or partition_horizon()
+        if reseal is None:
+            reseal = bool(os.environ.get(RESEAL_ENV))
+        self.reseal = reseal
+        self.version = version
+        self.sealed = set()
+        if not reseal and os.path.exists(self.manifest_file):
+            with open(self.manifest_file) as f:
+                manifest = json.load(f)
+            # Manifests from before versioning are a bare list of years
+            if isinstance(manifest, list):
+                manifest = {"version": 1, "sealed": manifest}
+            if manifest["version"] == version:
+                self.sealed = set(manifest["sealed"])
+            else:
+                print(f"[{state}] Partitions were sealed by parser version {manifest['version']}, refetching for version {version}")
+        os.makedirs(self.dir, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.dir, f"{key}.jsonl")
+
+    def sealable(self, key):
+        return isinstance(key, int) and key <= datetime.now().year - self.horizon
+
+    def is_sealed(self, key):
+        return str(key) in self.sealed and os.path.exists(self.path(key))
+
+    def pending(self, keys):
+        """The keys that have to be fetched this run, reporting the sealed ones skipped."""
+        keys = list(keys)
+        skipped = [k for k in keys if self.is_sealed(k)]
+        if skipped:
+            print(f"[{self.state}] Skipping {len(skipped)} sealed partitions: {', '.join(map(str, skipped))}")
+        return [k for k in keys if k not in skipped]
+
+    def write(self, key, records):
+        """Replace a partition, sealing it if it is older than the horizon."""
+        _write_atomic(self.path(key), lambda f: f.writelines(json.dumps(r) + "\n" for r in records))
+        # An empty old year is more likely a parse failure than a year without notices
+        if self.sealable(key) and records:
+            self.sealed.add(str(key))
+            _write_atomic(self.manifest_file, lambda f: json.dump({"version": self.version, "sealed": sorted(self.sealed)}, f))
+
+    def refresh(self, urls, fetch, parse):
+        """
+        Fetch the pending partitions of urls ({key: url}) concurrently with
+        fetch(url) and write each one, in key order, as parse(url, result).
+        A partition that fails to fetch or parse keeps its last written copy;
+        a 404 means it is not published and is skipped. Returns the failed keys.
+        """
+        pending = self.pending(urls)
+        failed = []
+        for key, (url, result, error) in zip(pending, fetch_partitions([urls[k] for k in pending], fetch)):
+            if not_found(error):
+                print(f"[{self.state}] Nothing published for {key} (404), skipping")
+                continue
+            try:
+                if error:
+                    raise error
+                self.write(key, parse(url, result))
+            except Exception as e:
+                print(f"[{self.state}] Error fetching/parsing {key}: {e}")
+                failed.append(key)
+        return failed
+
+    def read(self, key):
+        if not os.path.exists(self.path(key)):
+            return []
+        with open(self.path(key)) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def assemble(self, keys, deduper=None):
+        """
+        Stream the partitions in key order into the state's output file,
+        dropping repeated notices through deduper (a dedup.Deduper) if given.
+        """
+        records = []
+        with RecordWriter(self.output_file) as writer:
+            for key in keys:
+                partition = self.read(key)
+                if deduper is not None:
+                    partition = deduper.filter(partition, key)
+                writer.write_all(partition)
+                records.extend(partition)
+        return records
@@ -0,0 +1,54 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+import pdfplumber
+
+# Set to override the number of processes used per PDF, e.g. WARN_PDF_WORKERS=1 to stay in-process
+PDF_WORKERS_ENV = "WARN_PDF_WORKERS"
+DEFAULT_PDF_WORKERS = min(4, os.cpu_count() or 1)
+# Smaller documents are not worth starting processes for
+MIN_PAGES_PER_WORKER = 4
+METHODS = ("extract_table", "extract_tables")
+# ca and nm extract from scraper threads; forking a threaded process can deadlock the workers
+PROCESS_CONTEXT = multiprocessing.get_context("spawn")
+
+
+def pdf_workers():
+    value = os.environ.get(PDF_WORKERS_ENV)
+    return max(1, int(value)) if value else DEFAULT_PDF_WORKERS
+
+
+def _extract_range(path, method, start, stop):
+    """Run page.<method>() on pages[start:stop], in a worker or in-process."""
+    results = []
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages[start:stop]:
+            results.append(getattr(page, method)())
+            # Drop the parsed layout, it is only needed for this page
+            page.close()
+    return results
+
+
+def extract_page_tables(path, method="extract_table", workers=None):
+    """
+    page.extract_table() (or extract_tables()) for every page of the PDF at path,
+    in page order. Pages are split into contiguous ranges across a process pool;
+    each worker opens the document itself since pdfplumber objects do not pickle.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}', expected one of {', '.join(METHODS)}")
+    workers = workers or pdf_workers()
+    with pdfplumber.open(path) as pdf:
+        page_count = len(pdf.pages)
+
+    workers = min(workers, page_count // MIN_PAGES_PER_WORKER)
+    if workers <= 1:
+        return _extract_range(path, method, 0, page_count)
+
+    # A few ranges per worker so one slow range does not hold up the rest
+    chunks = min(page_count, workers * 4)
+    bounds = [page_count * i // chunks for i in range(chunks + 1)]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=PROCESS_CONTEXT) as pool:
+        futures = [pool.submit(_extract_range, path, method, start, stop) for start, stop in zip(bounds, bounds[1:])]
+        # Collect in submission order to keep page order
+        return [result for future in futures for result in future.result()]
@@ -0,0 +1,92 @@
+import importlib
+import os
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class ScraperKind(str, Enum):
+    HTML = "html"
+    XLSX = "xlsx"
+    PDF = "pdf"
+    BROWSER = "browser"
+
+
+# PDF/XLSX parsing is CPU bound, everything else mostly waits on the network or a browser
+CPU_BOUND_KINDS = {ScraperKind.XLSX, ScraperKind.PDF}
+
+
+@dataclass(frozen=True)
+class Scraper:
+    state: str
+    scrape: Callable[[], list[dict]]
+    kind: ScraperKind
+    # How often the source is expected to publish new notices
+    cadence: str = "daily"
+    # Needs a browser even though the data itself is not scraped from pages
+    browser: bool = False
+
+    @property
+    def output_file(self) -> str:
+        return f"data/{self.state}.json"
+
+    @property
+    def cpu_bound(self) -> bool:
+        return self.kind in CPU_BOUND_KINDS
+
+    @property
+    def uses_browser(self) -> bool:
+        return self.browser or self.kind == ScraperKind.BROWSER
+
+
+SCRAPERS: dict[str, Scraper] = {}
+
+
+class PartialScrape(Exception):
+    """
+    Raised by a scraper after writing its output when some of its sources
+    (reports, workbooks, years) failed, so the output lacks their notices.
+    run_all reports the state as PARTIAL and leaves it out of the change feed
+    and the store, where the missing notices would look withdrawn.
+    """
+
+    def __init__(self, state, failed, records):
+        super().__init__(f"{len(failed)} {state} sources failed: {', '.join(map(str, failed))}")
+        self.failed = failed
+        self.records = records
+
+
+def register(state: str, kind: ScraperKind, cadence: str = "daily", browser: bool = False):
+    """
+    Decorator for a state's entry point.
+    The function takes no arguments, writes data/<state>.json and returns the
+    WarnRecord dicts it wrote (scrapers that stream their records return an
+    output.OutputRecords rather than a list).
+    """
+    def decorator(fn):
+        SCRAPERS[state] = Scraper(state=state, scrape=fn, kind=kind, cadence=cadence, browser=browser)
+        return fn
+    return decorator
+
+
+def state_modules() -> list[str]:
+    """All 2-letter modules (state abbreviations) in src, sorted for consistent order."""
+    return sorted(f[:-3] for f in os.listdir(SRC_DIR) if f.endswith('.py') and len(f) == 5)
+
+
+def get_scraper(state: str) -> Scraper:
+    """Import src.<state> (registering it) and return its entry point."""
+    if state not in SCRAPERS:
+        if state not in state_modules():
+            raise KeyError(f"No scraper for state '{state}'")
+        importlib.import_module(f"src.{state}")
+    if state not in SCRAPERS:
+        raise KeyError(f"src.{state} does not register a scraper")
+    return SCRAPERS[state]
+
+
+def all_scrapers() -> dict[str, Scraper]:
+    """Import every state module and return the registry, sorted by state."""
+    return {state: get_scraper(state) for state in state_modules()}
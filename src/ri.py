@@ -1,182 +1,119 @@
 import requests
 import pandas as pd
-import os
-import json
-from datetime import datetime
-from src.models import WarnRecord, Employee, Address, WarnType
-from src.utils import clean_impacted, parse_address
+from src.models import WarnType
+from src.utils import parse_addresses
+from src.convert import date_column, frame_to_records, impacted_column, is_present, text_column
+from src.dedup import Deduper
+from src.output import RecordWriter
+from src.registry import ScraperKind, register
+from src.http_cache import DownloadCache
+from src.parse_cache import cached_records
+from src.xlsx import SheetReader, open_workbook
 
-def parse_date(val):
-    if pd.isna(val) or val is None:
-        return None
-    if isinstance(val, (datetime, pd.Timestamp)):
-        return val.date()
-    
-    date_str = str(val).strip()
-    for fmt in ("%Y-%m-%d", "%m/%d/%Y", "%m-%d-%Y", "%d/%m/%Y"):
-        try:
-            return datetime.strptime(date_str, fmt).date()
-        except ValueError:
-            continue
-    return None
+# Bump when parsing changes so cached records from the parse cache are rebuilt
+PARSER_VERSION = 3
 
-def get_col(row, aliases):
-    # Normalized search for columns
-    # We want to match if any alias is contained in the column name (or vice versa?)
-    # Usually exact match on normalized string is best.
-    # But here we have "Company Name (* Denotes...)"
-    
-    row_keys_clean = {k: str(k).replace('\n', ' ').strip().lower() for k in row.keys()}
-    
-    for alias in aliases:
-        alias_clean = alias.lower()
-        # Direct match
-        for k, k_clean in row_keys_clean.items():
-            if alias_clean == k_clean:
-                return row[k]
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%m-%d-%Y", "%d/%m/%Y")
+
+COLUMNS = {
+    'company': ['Company Name', 'Company'],
+    'city': ['Location', 'Location of Layoffs'],
+    'warn_date': ['WARN Date'],
+    'layoff_date': ['Effective Date'],
+    'impacted': ['Number Affected', 'Affected'],
+    'type': ['Closing Yes/No'],
+    'union': ['Union Yes/No'],
+    'union_address': ['Union Address'],
+}
+# Headers like "Company Name (* Denotes...)" only contain the alias.
+# Only used for company to avoid false positives on 'date'.
+CONTAINS = {'company': 'company'}
+
+def parse_chunk(df, columns, url, sheet_name):
+    company = columns.column(df, 'company')
+    closing = columns.column(df, 'type').astype(str).str.lower().str.strip()
+    union_yes = columns.column(df, 'union').astype(str).str.lower().str.strip() == 'yes'
+    union_address = columns.column(df, 'union_address')
+
+    # Determine type
+    warn_type = pd.Series(WarnType.TEMPORARY_LAYOFF, index=df.index, dtype=object)
+    warn_type[closing == 'yes'] = WarnType.CLOSURE
+    warn_type[closing == 'no'] = WarnType.PERMANENT_LAYOFF
+
+    # Handle Union
+    # The "Union Address" field seemingly contains "Union Name, Address",
+    # e.g. "Local Union 1033, 410 S Main Street 3rd floor, Providence, RI 02906".
+    # parse_address does not extract the name, so the name is left generic.
+    union = pd.Series(None, index=df.index, dtype=object)
+    if union_yes.any():
+        has_address = union_yes & is_present(union_address)
+        parsed = parse_addresses(union_address[has_address], state_fips='44')
+        addresses = {idx: {**p, 'state': "RI"} for idx, p in parsed.to_dict('index').items()}
+        union[union_yes] = [{'name': "Union", 'address': addresses.get(idx)} for idx in df.index[union_yes]]
+
+    frame = pd.DataFrame({
+        'company': text_column(company),
+        'municipality': text_column(columns.column(df, 'city')),
+        'warn_date': date_column(columns.column(df, 'warn_date'), DATE_FORMATS),
+        'layoff_date': date_column(columns.column(df, 'layoff_date'), DATE_FORMATS),
+        'type': warn_type,
+        'impacted': impacted_column(columns.column(df, 'impacted')),
+        'union': union,
+        'link': url,
+        'notes': f"Sheet: {sheet_name}",
+    }, index=df.index)
+    return frame_to_records(frame[is_present(company)], "RI")
+
+def iter_workbook(path, url):
+    """Stream records from the relevant sheets, a chunk of rows at a time."""
+    workbook = open_workbook(path)
+    try:
+        # Iterate through relevant sheets
+        sheets_to_process = [s for s in workbook.sheetnames if s in ['2026', '2025', '2024', 'Previous Years']]
         
-        # Check if alias is in k_clean (e.g. 'company' in 'company name (*...)')
-        # Only do this for 'company' to avoid false positives on 'date'
-        if 'company' in alias_clean:
-             for k, k_clean in row_keys_clean.items():
-                if 'company' in k_clean:
-                    return row[k]
+        if not sheets_to_process:
+             sheets_to_process = workbook.sheetnames
+
+        for sheet_name in sheets_to_process:
+            print(f"Processing sheet: {sheet_name}")
+
+            # User specified header is at index 3 (Row 4)
+            reader = SheetReader(workbook[sheet_name], COLUMNS, header=3, contains=CONTAINS)
+            if reader.columns.missing:
+                print(f"RI columns in {sheet_name}: {reader.columns.describe()}")
 
-    return None
+            for chunk in reader.chunks():
+                yield from parse_chunk(chunk, reader.columns, url, sheet_name)
+    finally:
+        workbook.close()
 
+@register("ri", ScraperKind.XLSX, cadence="weekly")
 def scrape_ri():
     url = "https://dlt.ri.gov/media/15796/download?language=en"
     print(f"Fetching RI data from {url}...")
     
     headers = {"User-Agent": "Mozilla/5.0"}
-    local_file = "data/ri_warn.xlsx"
-    
-    if not os.path.exists('data'):
-        os.makedirs('data')
+    downloads = DownloadCache()
 
+    # Failures propagate: the run is reported FAILED and the previous output is kept
     try:
-        response = requests.get(url, headers=headers)
-        if response.status_code != 200:
-            print(f"Failed to download RI file. Status: {response.status_code}")
-            return
-
-        with open(local_file, "wb") as f:
-            f.write(response.content)
-
-        all_records = []
-        with pd.ExcelFile(local_file) as xls:
-            # Iterate through relevant sheets
-            sheets_to_process = [s for s in xls.sheet_names if s in ['2026', '2025', '2024', 'Previous Years']]
-            
-            if not sheets_to_process:
-                 sheets_to_process = xls.sheet_names
-    
-            for sheet_name in sheets_to_process:
-                print(f"Processing sheet: {sheet_name}")
-                
-                # User specified header is at index 3 (Row 4)
-                df = pd.read_excel(xls, sheet_name=sheet_name, header=3)
-            
-            # Debug: Print columns to verify
-            # print(f"Columns in {sheet_name}: {df.columns.tolist()}")
-
-                for _, row in df.iterrows():
-                    row_dict = row.to_dict()
-                    
-                    company = get_col(row_dict, ['Company Name', 'Company'])
-                    location = get_col(row_dict, ['Location', 'Location of Layoffs'])
-                    warn_date_val = get_col(row_dict, ['WARN Date'])
-                    effective_date_val = get_col(row_dict, ['Effective Date'])
-                    affected_val = get_col(row_dict, ['Number Affected', 'Affected'])
-                    closing_val = get_col(row_dict, ['Closing Yes/No'])
-                    union_yes_no = get_col(row_dict, ['Union Yes/No'])
-                    union_address_val = get_col(row_dict, ['Union Address'])
-                    
-                    if not company or pd.isna(company):
-                        continue
-                        
-                    # Determine type
-                    warn_type = WarnType.TEMPORARY_LAYOFF
-                    if closing_val and str(closing_val).lower().strip() == 'yes':
-                        warn_type = WarnType.CLOSURE
-                    elif closing_val and str(closing_val).lower().strip() == 'no':
-                        warn_type = WarnType.PERMANENT_LAYOFF 
+        download = downloads.get(url, headers=headers)
+    except requests.HTTPError as e:
+        print(f"Failed to download RI file. Status: {e.response.status_code}")
+        raise
 
-                    # Handle Union
-                    union_obj = None
-                    if union_yes_no and str(union_yes_no).lower().strip() == 'yes':
-                        addr = None
-                        union_name = "Union" 
-                        
-                        if union_address_val and not pd.isna(union_address_val):
-                            # Use the parser from utils
-                            # "Local Union 1033, 410 S Main Street 3rd floor, Providence, RI 02906"
-                            parsed = parse_address(str(union_address_val), state_fips='44')
-                            
-                            addr = Address(
-                                street=parsed['street'],
-                                municipality=parsed['municipality'],
-                                state="RI",
-                                zip=parsed['zip']
-                            )
-                            
-                            # Can we extract union name?
-                            # Often the first part before the first comma if address parsing fails or leaves valid street
-                            # But parse_address logic focuses on address parts.
-                            # It doesn't extract name.
-                            # However, for RI, the field is "Union Address" but seemingly contains "Union Name, Address"
-                            # parse_address might actually treat "Local Union 1033" as part of street if not careful, 
-                            # OR if it finds "Providence, RI", it puts everything else in street?
-                            # Let's simple split by comma to try to get a name if possible, or just leave name generic.
-                            
-                            parts = str(union_address_val).split(',', 1)
-                            if len(parts) > 1:
-                                possible_name = parts[0].strip()
-                                # If "street" starts with this, maybe remove it?
-                                # But for now, let's keep it simple as requested: just parse address.
-                                # We will assume the full string is the address mostly.
-                                pass
-
-                        union_obj = Employee(name=union_name, address=addr)
-
-                    record = WarnRecord(
-                        employer=Employee(name=str(company).strip()),
-                        location=Address(
-                            municipality=str(location).strip() if location and not pd.isna(location) else None,
-                            state="RI"
-                        ),
-                        warn_date=parse_date(warn_date_val),
-                        layoff_date=parse_date(effective_date_val),
-                        type=warn_type,
-                        impacted=clean_impacted(affected_val),
-                        union=union_obj,
-                        link=url,
-                        notes=f"Sheet: {sheet_name}"
-                    )
-                    all_records.append(record.model_dump(mode='json'))
-
-        output_file = "data/ri.json"
-        with open(output_file, "w") as f:
-            json.dump(all_records, f, indent=2)
-            
-        print(f"Successfully scraped {len(all_records)} records to {output_file}")
-        
-    except Exception as e:
-        print(f"Error processing RI data: {e}")
-    finally:
-        if os.path.exists(local_file):
-            try:
-                os.remove(local_file)
-            except:
-                pass
-        
-        # User mentioned .xlsxc, explicitly try to remove it too just in case
-        xlsxc_file = local_file + "c"
-        if os.path.exists(xlsxc_file):
-            try:
-                os.remove(xlsxc_file)
-            except:
-                pass
+    records = cached_records(download.path, url, "ri-xlsx", PARSER_VERSION, lambda: iter_workbook(download.path, url))
+    # A notice can be listed on both the current year's sheet and 'Previous Years'
+    deduper = Deduper("ri")
+    output_file = "data/ri.json"
+    # Records stream from the workbook (or its parse cache entry) straight to the output
+    with RecordWriter(output_file) as writer:
+        writer.write_all(r for r in records if deduper.add(r, r['notes']))
+    all_records = writer.records()
+    print(deduper.report())
+    print(f"Successfully scraped {len(all_records)} records to {output_file}")
+    print(f"RI {downloads.stats()}")
+    return all_records
 
 if __name__ == "__main__":
     scrape_ri()
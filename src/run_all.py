@@ -1,47 +1,251 @@
+import argparse
+import multiprocessing
 import os
-import subprocess
-import sys
-
-def run_all():
-    # Get the root directory (one level up from src)
-    src_dir = os.path.dirname(os.path.abspath(__file__))
-    root_dir = os.path.dirname(src_dir)
-    
-    # Find all 2-letter .py files (state abbreviations)
-    state_files = [f for f in os.listdir(src_dir) if f.endswith('.py') and len(f) == 5]
-    
-    # Sort for consistent execution order
-    state_files.sort()
-    
-    print(f"Found {len(state_files)} state files: {', '.join(state_files)}")
-    
-    for state_file in state_files:
-        module_name = f"src.{state_file[:-3]}"
-        print(f"\n{'='*60}")
-        print(f"RUNNING: {module_name}")
-        print(f"{'='*60}")
-        
-        # Run using uv run src/state.py with PYTHONPATH="."
-        # This follows the guideline in CLAUDE.md
+import signal
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import nullcontext
+from src.browser import BrowserPool, DEFAULT_MAX_CONTEXTS
+from src.changes import FEED_PATH, describe, update_feed
+from src.checkpoint import RESUME_ENV
+from src.employers import resolve_states
+from src.export import PARQUET_DIR, export_parquet
+from src.output import LEGACY_JSON_ENV, OUTPUT_GZIP_ENV
+from src.partitions import RESEAL_ENV
+from src.registry import PartialScrape, all_scrapers, get_scraper
+from src.scrape_ajc import FULL_REFRESH_ENV
+from src.store import DB_PATH, ingest_states
+
+# Root directory (one level up from src)
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SRC_DIR)
+
+DEFAULT_WORKERS = 4
+DEFAULT_TIMEOUT = 30 * 60
+# Seconds a killed scraper process gets to exit before it is killed outright
+KILL_GRACE = 5
+# Exit code of a scraper process that wrote its output but had sources fail
+PARTIAL_EXIT_CODE = 3
+
+# Scraper threads and the browser driver are already running when processes start;
+# a forked child could inherit a lock one of them held and deadlock
+PROCESS_CONTEXT = multiprocessing.get_context("spawn")
+
+
+def run_scraper(state):
+    """Run a registered scraper in this interpreter and return its records."""
+    return get_scraper(state).scrape() or []
+
+
+def _run_in_process(state, record_count):
+    if hasattr(os, "setpgrp"):
+        # Its own process group, so a timeout also stops the PDF workers and browser it starts
+        os.setpgrp()
+    os.chdir(ROOT_DIR)
+    try:
+        record_count.value = len(run_scraper(state))
+    except PartialScrape as e:
+        print(f"PARTIAL: src.{state}: {e}")
+        record_count.value = len(e.records)
+        raise SystemExit(PARTIAL_EXIT_CODE)
+
+
+class ScraperJob:
+    """One scraper run, either in a worker process (killable) or a daemon thread."""
+
+    def __init__(self, scraper):
+        self.state = scraper.state
+        # PDF/XLSX parsing is CPU bound and gets its own process.
+        # Everything else waits on the network or a browser and runs in a thread.
+        self.kind = "process" if scraper.cpu_bound else "thread"
+        self.status = "PENDING"
+        self.error = None
+        self.partial = False
+        self.started = None
+        self.duration = None
+        self.records = None
+        self._worker = None
+        self._record_count = PROCESS_CONTEXT.Value('i', -1)
+
+    def start(self):
+        self.started = time.time()
+        self.status = "RUNNING"
+        if self.kind == "process":
+            self._worker = PROCESS_CONTEXT.Process(target=_run_in_process, args=(self.state, self._record_count), name=f"scrape-{self.state}")
+        else:
+            self._worker = threading.Thread(target=self._run_thread, name=f"scrape-{self.state}", daemon=True)
+        self._worker.start()
+
+    def _run_thread(self):
+        try:
+            self._record_count.value = len(run_scraper(self.state))
+        except PartialScrape as e:
+            self._record_count.value = len(e.records)
+            self.partial = True
+            self.error = str(e)
+        except BaseException as e:
+            traceback.print_exc()
+            self.error = f"{type(e).__name__}: {e}"
+
+    def elapsed(self):
+        return time.time() - self.started
+
+    def is_alive(self):
+        return self._worker.is_alive()
+
+    def finish(self):
+        self.duration = self.elapsed()
+        if self.kind == "process":
+            self._worker.join()
+            if self._worker.exitcode == PARTIAL_EXIT_CODE:
+                self.partial = True
+                self.error = "some sources failed"
+            elif self._worker.exitcode != 0:
+                self.error = f"exit code {self._worker.exitcode}"
+        # PARTIAL output is written but incomplete: it is kept out of --changes and --store
+        self.status = "PARTIAL" if self.partial else "FAILED" if self.error else "SUCCESS"
+        if self._record_count.value >= 0:
+            self.records = self._record_count.value
+
+    def kill(self):
+        self.duration = self.elapsed()
+        self.status = "TIMEOUT"
+        self.error = f"exceeded {self.duration:.0f}s"
+        if self.kind == "process":
+            self._stop_process()
+        # Threads cannot be stopped; the daemon thread is abandoned and dies with the run
+
+    def _stop_process(self):
+        """SIGTERM the scraper's process group, then SIGKILL whatever is left of it."""
+        if not hasattr(os, "killpg"):
+            # No process groups on Windows; only the scraper process itself is stopped
+            self._worker.terminate()
+            self._worker.join()
+            return
         try:
-            # On Windows, we set the environment variable in the subprocess call
-            env = os.environ.copy()
-            env["PYTHONPATH"] = "."
-            
-            script_path = f"src/{state_file}"
-            result = subprocess.run(
-                ["uv", "run", script_path],
-                cwd=root_dir,
-                env=env,
-                capture_output=False,
-                text=True
-            )
-            if result.returncode == 0:
-                print(f"SUCCESS: {module_name}")
-            else:
-                print(f"FAILED: {module_name} with return code {result.returncode}")
-        except Exception as e:
-            print(f"ERROR: Could not run {module_name}: {e}")
+            os.killpg(self._worker.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            # Killed before it made its own group
+            self._worker.terminate()
+        self._worker.join(KILL_GRACE)
+        # The group can outlive the scraper: pool workers or a browser driver it left behind
+        try:
+            os.killpg(self._worker.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        self._worker.join()
+
+def print_summary(jobs):
+    print(f"\n{'='*60}")
+    print(f"{'STATE':<6} {'KIND':<8} {'STATUS':<8} {'SECONDS':>8} {'RECORDS':>8}  ERROR")
+    for job in jobs:
+        duration = f"{job.duration:.1f}" if job.duration is not None else "-"
+        records = job.records if job.records is not None else "-"
+        print(f"{job.state:<6} {job.kind:<8} {job.status:<8} {duration:>8} {records:>8}  {job.error or ''}")
+    failed = [job.state for job in jobs if job.status != "SUCCESS"]
+    print(f"{'='*60}")
+    print(f"{len(jobs) - len(failed)}/{len(jobs)} succeeded" + (f"; failed: {', '.join(failed)}" if failed else ""))
+
+
+def start_browser_pool(max_contexts):
+    """Shared browser for the run, or a no-op if Chromium cannot be started."""
+    try:
+        return BrowserPool(max_contexts=max_contexts).start()
+    except Exception as e:
+        print(f"Could not start shared browser, scrapers will launch their own: {e}")
+        return nullcontext()
+
+
+def run_all(states=None, workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT, browser_contexts=DEFAULT_MAX_CONTEXTS):
+    """
+    Run scrapers concurrently, at most `workers` at a time.
+    Each scraper is stopped (process) or abandoned (thread) after `timeout` seconds.
+    Browser-based scrapers share one Chromium with at most `browser_contexts` open contexts.
+    """
+    # Importing every scraper up front lets them share warmed-up imports and caches
+    scrapers = all_scrapers()
+    if states:
+        unknown = [s for s in states if s not in scrapers]
+        if unknown:
+            raise ValueError(f"Unknown states: {', '.join(unknown)}")
+    else:
+        states = list(scrapers)
+
+    # Scrapers use paths relative to the repository root
+    os.chdir(ROOT_DIR)
+    print(f"Running {len(states)} scrapers with {workers} workers: {', '.join(states)}")
+
+    jobs = [ScraperJob(scrapers[state]) for state in states]
+    needs_browser = any(scrapers[state].uses_browser for state in states)
+    with start_browser_pool(browser_contexts) if needs_browser else nullcontext():
+        pending = deque(jobs)
+        running = []
+        while pending or running:
+            while pending and len(running) < workers:
+                job = pending.popleft()
+                print(f"STARTING: src.{job.state} ({job.kind})")
+                job.start()
+                running.append(job)
+
+            time.sleep(0.2)
+            for job in list(running):
+                if not job.is_alive():
+                    job.finish()
+                elif timeout and job.elapsed() > timeout:
+                    job.kill()
+                else:
+                    continue
+                running.remove(job)
+                print(f"{job.status}: src.{job.state} in {job.duration:.1f}s")
+
+    print_summary(jobs)
+    return jobs
+
+
+def parse_states(value):
+    return [s.strip().lower() for s in value.split(',') if s.strip()]
+
 
 if __name__ == "__main__":
-    run_all()
+    parser = argparse.ArgumentParser(description="Run WARN scrapers concurrently.")
+    parser.add_argument("--states", type=parse_states, help="Comma separated states to run, e.g. az,de,me,vt (default: all)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help=f"Scrapers to run at once (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help=f"Per-scraper wall clock limit in seconds (default: {DEFAULT_TIMEOUT})")
+    parser.add_argument("--full", action="store_true", help="Rescrape everything instead of only new notices where scrapers support it")
+    parser.add_argument("--resume", action="store_true", help="Continue scrapers from the checkpoint of a run that stopped part way")
+    parser.add_argument("--reseal", "--backfill", dest="reseal", action="store_true", help="Refetch sealed yearly partitions (md, ct, nm) and seal them again")
+    parser.add_argument("--gzip", action="store_true", help="Write data/<state>.jsonl.gz instead of data/<state>.jsonl")
+    parser.add_argument("--no-legacy-json", dest="legacy_json", action="store_false", help="Only write the JSONL output, not the pretty data/<state>.json")
+    parser.add_argument("--employers", action="store_true", help="Set employer_id on the records of every scraper that succeeded (before --store and --parquet)")
+    parser.add_argument("--changes", action="store_true", help=f"Append what changed in the output of every scraper that succeeded to {FEED_PATH}")
+    parser.add_argument("--parquet", action="store_true", help=f"Export every state's output to {PARQUET_DIR} after the scrapers finish (needs pyarrow)")
+    parser.add_argument("--store", action="store_true", help=f"Upsert the output of every scraper that succeeded into {DB_PATH}")
+    parser.add_argument("--browser-contexts", type=int, default=DEFAULT_MAX_CONTEXTS, help=f"Browser contexts open at once on the shared browser (default: {DEFAULT_MAX_CONTEXTS})")
+    args = parser.parse_args()
+    if args.full:
+        # Inherited by scraper threads and worker processes
+        os.environ[FULL_REFRESH_ENV] = "1"
+    if args.resume:
+        os.environ[RESUME_ENV] = "1"
+    if args.reseal:
+        os.environ[RESEAL_ENV] = "1"
+    if args.gzip:
+        os.environ[OUTPUT_GZIP_ENV] = "1"
+    if not args.legacy_json:
+        os.environ[LEGACY_JSON_ENV] = "0"
+
+    jobs = run_all(args.states, workers=args.workers, timeout=args.timeout, browser_contexts=args.browser_contexts)
+    succeeded = [job.state for job in jobs if job.status == "SUCCESS"]
+    if args.employers and succeeded:
+        resolve_states(succeeded)
+    if args.changes and succeeded:
+        for state, counts in update_feed(succeeded).items():
+            print(f"{FEED_PATH} {describe(state, counts)}")
+    if args.store:
+        for state, counts in ingest_states(succeeded).items():
+            print(f"{DB_PATH} {state}: {counts['inserted']} inserted, {counts['updated']} updated, {counts['removed']} removed")
+    if args.parquet:
+        print(f"Exported {export_parquet()} records to {PARQUET_DIR}")
+    raise SystemExit(0 if all(job.status == "SUCCESS" for job in jobs) else 1)
@@ -1,165 +1,434 @@
-import json
-from playwright.sync_api import sync_playwright
+import argparse
+import asyncio
+import os
+from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+from src.browser import async_browser_context
+from src.checkpoint import Checkpoint
+from src.fetch import make_session
+from src.output import load_records
 from datetime import datetime
 import time
-import os
-from src.models import WarnRecord, Employee, Address, Contact
+from src.models import WarnRecord, Employee, Address
 from src.utils import clean_impacted, derive_warn_type
 
-def scrape_ajc(base_url, state_code, output_file):
-    print(f"Starting scrape for {state_code} at {base_url}")
-    results = []
-    
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            ignore_https_errors=True
-        )
-        page = context.new_page()
-        
-        page.goto(base_url)
-        
+# Detail pages loaded at once; 1 visits them one by one
+DEFAULT_CONCURRENCY = 6
+# Pause between search result pages
+PAGE_DELAY = 2
+# "http" parses the server-rendered HTML, "browser" drives Chromium
+ENGINES = ("http", "browser")
+DEFAULT_ENGINE = "http"
+# Set (e.g. by run_all --full) to revisit every notice instead of only new ones
+FULL_REFRESH_ENV = "WARN_FULL_REFRESH"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Field -> label text on the detail page
+DETAIL_LABELS = {
+    "address": "Address",
+    "warn_date": "Notice Date",
+    "impacted": "Number of Employees Affected",
+    "layoff_date": "Layoff Date",
+    "effective_date": "Effective Date",
+    "type": "Type",
+    "notice_type": "Notice Type",
+}
+
+# Reads every field in one round trip. For each label, the first element after
+# an h3/h4/strong (or a div after a div) containing the label, matched
+# case-insensitively like Playwright's :has-text().
+EXTRACT_DETAIL_JS = """
+labels => {
+    const text = el => (el.innerText || '').trim();
+    const has = (el, needle) => el.textContent.replace(/\\s+/g, ' ').toLowerCase().includes(needle);
+    const find = label => {
+        const needle = label.toLowerCase();
+        for (const tag of ['h3', 'h4', 'strong']) {
+            for (const el of document.querySelectorAll(tag)) {
+                if (el.nextElementSibling && has(el, needle)) return text(el.nextElementSibling);
+            }
+        }
+        for (const el of document.querySelectorAll('div')) {
+            const next = el.nextElementSibling;
+            if (next && next.tagName === 'DIV' && has(el, needle)) return text(next);
+        }
+        return null;
+    };
+    const h1 = document.querySelector('h1');
+    const fields = {company: h1 ? text(h1) : null};
+    for (const [key, label] of Object.entries(labels)) fields[key] = find(label);
+    return fields;
+}
+"""
+
+
+class NeedsBrowser(Exception):
+    """The server-rendered HTML is missing what we need, e.g. the page is built by JS."""
+
+
+def _text(el):
+    return el.get_text().strip()
+
+
+def _has_text(el, needle):
+    return needle in " ".join(el.get_text().split()).lower()
+
+
+def extract_detail_fields(html):
+    """
+    Python version of EXTRACT_DETAIL_JS for a detail page's HTML.
+    Returns None when the page has no heading and none of the labels.
+    """
+    soup = BeautifulSoup(html, "lxml")
+    # innerText renders <br> as a newline, the address is split on it
+    for br in soup.find_all("br"):
+        br.replace_with("\n")
+
+    def find(label):
+        needle = label.lower()
+        for tag in ("h3", "h4", "strong"):
+            for el in soup.find_all(tag):
+                sibling = el.find_next_sibling()
+                if sibling is not None and _has_text(el, needle):
+                    return _text(sibling)
+        for el in soup.find_all("div"):
+            sibling = el.find_next_sibling()
+            if sibling is not None and sibling.name == "div" and _has_text(el, needle):
+                return _text(sibling)
+        return None
+
+    h1 = soup.find("h1")
+    fields = {"company": _text(h1) if h1 else None}
+    for key, label in DETAIL_LABELS.items():
+        fields[key] = find(label)
+    if not any(fields.values()):
+        return None
+    return fields
+
+
+def notice_id(link):
+    """The numeric ID at the end of a /search/warn_lookups/<id> link."""
+    return str(link).rstrip('/').split('/')[-1]
+
+
+class KnownNotices:
+    """
+    Notices already in the output file, so incremental runs only visit new
+    detail pages. Result pages list the newest notices first, so a page with
+    only known IDs means the rest of the list is known too.
+    """
+
+    def __init__(self, output_file, full=False):
+        self.records = []
+        if not full:
+            try:
+                self.records = load_records(output_file)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, EOFError) as e:
+                print(f"Could not read {output_file}, scraping everything: {e}")
+        self.ids = {notice_id(r["link"]) for r in self.records if r.get("link")}
+
+    def new_links(self, links):
+        return [l for l in links if notice_id(l) not in self.ids]
+
+    def merge(self, results):
+        """New records first (newest first, like the site), then the known ones not revisited."""
+        new_ids = {notice_id(r["link"]) for r in results}
+        return results + [r for r in self.records if notice_id(r.get("link")) not in new_ids]
+
+
+def detail_links(soup, page_url):
+    """Detail page URLs (numeric IDs only) on a result page, deduped in page order."""
+    links = [urljoin(page_url, a["href"]) for a in soup.select("a[href*='/search/warn_lookups/']")]
+    links = [l for l in links if l.rstrip('/').split('/')[-1].isdigit()]
+    return list(dict.fromkeys(links))
+
+
+def parse_date(date_str, formats=("%m/%d/%Y", "%b %d, %Y")):
+    if not date_str:
+        return None
+    for fmt in formats:
+        try:
+            return datetime.strptime(date_str, fmt).date()
+        except ValueError:
+            pass
+    return None
+
+
+def parse_detail(fields, link, state_code):
+    """WarnRecord dict from the fields read off a detail page."""
+    # Handle Address
+    street = None
+    municipality = None
+    zip_code = None
+    address_text = fields.get("address")
+    if address_text:
+        parts = address_text.split('\n')
+        street = parts[0].strip() if len(parts) > 0 else None
+        if len(parts) > 1:
+            # City, State Zip
+            city_state = parts[1].split(',')
+            municipality = city_state[0].strip()
+            if len(city_state) > 1:
+                sz = city_state[1].strip().rsplit(' ', 1)
+                zip_code = sz[-1] if len(sz) > 1 else None
+
+    layoff_date_str = fields.get("layoff_date") or fields.get("effective_date")
+    warn_type_str = fields.get("type") or fields.get("notice_type")
+
+    record = WarnRecord(
+        employer=Employee(name=fields.get("company") or "Unknown"),
+        location=Address(
+            street=street,
+            municipality=municipality,
+            state=state_code,
+            zip=zip_code
+        ),
+        warn_date=parse_date(fields.get("warn_date")),
+        layoff_date=parse_date(layoff_date_str, formats=("%m/%d/%Y",)),
+        type=derive_warn_type(warn_type_str) if warn_type_str else None,
+        impacted=clean_impacted(fields.get("impacted")),
+        link=link
+    )
+    return record.model_dump(mode='json')
+
+
+async def scrape_detail(context, link, state_code, slots):
+    async with slots:
+        # Use a new page to keep search results alive
+        detail_page = await context.new_page()
+        try:
+            print(f"[{state_code}] Scraping detail: {link}")
+            await detail_page.goto(link, timeout=30000)
+            fields = await detail_page.evaluate(EXTRACT_DETAIL_JS, DETAIL_LABELS)
+            return parse_detail(fields, link, state_code)
+        except Exception as e:
+            print(f"[{state_code}] Error on {link}: {e}")
+            return None
+        finally:
+            await detail_page.close()
+
+
+def skip_known(known, links, state_code, page_num):
+    """The links still to visit, or None when the whole page is known and paging can stop."""
+    new_links = known.new_links(links)
+    if links and not new_links:
+        print(f"[{state_code}] Every notice on page {page_num} is already known, stopping")
+        return None
+    if len(new_links) < len(links):
+        print(f"[{state_code}] Skipping {len(links) - len(new_links)} known notices")
+    return new_links
+
+
+async def scrape_ajc_async(base_url, state_code, known, checkpoint, concurrency=DEFAULT_CONCURRENCY):
+    """Drive the site in Chromium, appending each results page's new records to the checkpoint."""
+    print(f"Starting scrape for {state_code} at {base_url} ({concurrency} detail pages at once)")
+    slots = asyncio.Semaphore(concurrency)
+
+    async with async_browser_context(user_agent=USER_AGENT, ignore_https_errors=True) as context:
+        page = await context.new_page()
+
+        await page.goto(checkpoint.next_url or base_url)
+
         # In some cases we might need to click search if it's the base lookup page
-        if "commit=Search" not in base_url and page.query_selector("input[name='commit']"):
-             page.click("input[name='commit']")
-        
-        page_num = 1
+        if not checkpoint.next_url and "commit=Search" not in base_url and await page.query_selector("input[name='commit']"):
+            await page.click("input[name='commit']")
+
+        page_num = checkpoint.page + 1
         while True:
             print(f"[{state_code}] Processing page {page_num}...")
-            
+
             # Wait for table
             try:
-                page.wait_for_selector("table", timeout=15000)
-            except:
+                await page.wait_for_selector("table", timeout=15000)
+            except Exception:
                 print(f"[{state_code}] Table not found on page {page_num}")
                 break
-                
+
             # Find all detail links (numeric IDs only)
-            all_links = page.eval_on_selector_all(
+            all_links = await page.eval_on_selector_all(
                 "a[href*='/search/warn_lookups/']",
                 "links => links.map(a => a.href)"
             )
-            # Filter for numeric IDs
+            # Filter for numeric IDs, dedup keeping page order
             links = [l for l in all_links if l.rstrip('/').split('/')[-1].isdigit()]
-            # Dedup links
-            links = list(set(links))
+            links = list(dict.fromkeys(links))
             print(f"[{state_code}] Found {len(links)} records on page {page_num}")
-            
-            for link in links:
-                # Use a new page to keep search results alive
-                detail_page = context.new_page()
-                try:
-                    print(f"[{state_code}] Scraping detail: {link}")
-                    detail_page.goto(link, timeout=30000)
-                    
-                    # Extract Data
-                    # Helper to get field by label
-                    def get_field(label):
-                        # Try a few variations of selectors
-                        selectors = [
-                            f"h3:has-text('{label}') + *",
-                            f"h4:has-text('{label}') + *",
-                            f"strong:has-text('{label}') + *",
-                            f"div:has-text('{label}') + div"
-                        ]
-                        for sel in selectors:
-                            loc = detail_page.locator(sel)
-                            if loc.count() > 0:
-                                return loc.first.inner_text().strip()
-                        return None
-
-                    # Specific fields
-                    company = detail_page.locator("h1").first.inner_text().strip() if detail_page.locator("h1").count() > 0 else "Unknown"
-                    address_text = get_field("Address")
-                    warn_date_str = get_field("Notice Date")
-                    impacted_str = get_field("Number of Employees Affected")
-                    
-                    # Check for layoff date or type if available
-                    layoff_date_str = get_field("Layoff Date") or get_field("Effective Date")
-                    warn_type_str = get_field("Type") or get_field("Notice Type")
-                    
-                    # Handle Address
-                    street = None
-                    municipality = None
-                    zip_code = None
-                    if address_text:
-                        parts = address_text.split('\n')
-                        street = parts[0].strip() if len(parts) > 0 else None
-                        if len(parts) > 1:
-                            # City, State Zip
-                            city_state = parts[1].split(',')
-                            municipality = city_state[0].strip()
-                            if len(city_state) > 1:
-                                sz = city_state[1].strip().rsplit(' ', 1)
-                                zip_code = sz[-1] if len(sz) > 1 else None
-
-                    # Parse dates
-                    warn_date = None
-                    if warn_date_str:
-                        try:
-                            warn_date = datetime.strptime(warn_date_str, "%m/%d/%Y").date()
-                        except:
-                            try:
-                                warn_date = datetime.strptime(warn_date_str, "%b %d, %Y").date()
-                            except:
-                                pass
-
-                    layoff_date = None
-                    if layoff_date_str:
-                        try:
-                            layoff_date = datetime.strptime(layoff_date_str, "%m/%d/%Y").date()
-                        except:
-                            pass
-
-                    record = WarnRecord(
-                        employer=Employee(name=company),
-                        location=Address(
-                            street=street,
-                            municipality=municipality,
-                            state=state_code,
-                            zip=zip_code
-                        ),
-                        warn_date=warn_date,
-                        layoff_date=layoff_date,
-                        type=derive_warn_type(warn_type_str) if warn_type_str else None,
-                        impacted=clean_impacted(impacted_str),
-                        link=link
-                    )
-                    results.append(record.model_dump(mode='json'))
-                except Exception as e:
-                    print(f"[{state_code}] Error on {link}: {e}")
-                finally:
-                    detail_page.close()
-            
-            # Save progress after each page
-            with open(output_file, "w") as f:
-                json.dump(results, f, indent=2)
+            links = skip_known(known, links, state_code, page_num)
+            if links is None:
+                break
+
+            # gather() keeps link order whatever order the pages finish in
+            records = await asyncio.gather(*(scrape_detail(context, link, state_code, slots) for link in links))
 
             # Next page
-            next_link = page.query_selector("a.next_page, a[rel='next']")
+            next_url = None
+            next_link = await page.query_selector("a.next_page, a[rel='next']")
             if next_link:
-                page_url = next_link.get_attribute("href")
+                page_url = await next_link.get_attribute("href")
                 if page_url.startswith("/"):
                     # Reconstruct URL
                     domain = "/".join(page.url.split("/")[:3])
                     next_url = domain + page_url
                 else:
                     next_url = page_url
-                
+
+            # Save progress after each page
+            checkpoint.add_page(page_num, [r for r in records if r is not None], next_url, last=next_url is None)
+
+            if next_url:
                 print(f"[{state_code}] Moving to next page: {next_url}")
-                page.goto(next_url)
+                await page.goto(next_url)
                 page_num += 1
-                time.sleep(2)
+                await asyncio.sleep(PAGE_DELAY)
             else:
                 print(f"[{state_code}] No next page link found.")
                 break
-                
-        browser.close()
-        
-    print(f"[{state_code}] Finished. Total results: {len(results)}")
+
+
+async def scrape_details_with_browser(links, state_code, concurrency=DEFAULT_CONCURRENCY):
+    """Records for detail pages that need a browser, in link order (None on error)."""
+    slots = asyncio.Semaphore(concurrency)
+    async with async_browser_context(user_agent=USER_AGENT, ignore_https_errors=True) as context:
+        return await asyncio.gather(*(scrape_detail(context, link, state_code, slots) for link in links))
+
+
+def fetch_results_page(session, url):
+    """The parsed result page at url, submitting the search form first if it is the lookup page."""
+    response = session.get(url, timeout=30)
+    response.raise_for_status()
+    soup = BeautifulSoup(response.text, "lxml")
+    button = soup.select_one("input[name='commit']")
+    if soup.find("table") is None and button is not None and button.find_parent("form") is not None:
+        # The lookup page: submit the search form like clicking its button
+        form = button.find_parent("form")
+        params = [(i["name"], i.get("value", "")) for i in form.find_all("input") if i.get("name") and i.get("type") not in ("checkbox", "radio")]
+        response = session.get(urljoin(response.url, form.get("action") or url), params=params, timeout=30)
+        response.raise_for_status()
+        soup = BeautifulSoup(response.text, "lxml")
+    return soup, response.url
+
+
+def fetch_detail(session, link, state_code):
+    """Detail page fields, None if they need a browser. Errors propagate."""
+    print(f"[{state_code}] Scraping detail: {link}")
+    response = session.get(link, timeout=30)
+    response.raise_for_status()
+    return extract_detail_fields(response.text)
+
+
+def scrape_ajc_http(base_url, state_code, known, checkpoint, concurrency=DEFAULT_CONCURRENCY):
+    """
+    scrape_ajc_async without a browser: plain GETs on a pooled session and
+    BeautifulSoup. Detail pages without server-rendered fields are handed to
+    the browser; raises NeedsBrowser if the result list itself is not there.
+    """
+    print(f"Starting HTTP scrape for {state_code} at {base_url} ({concurrency} detail pages at once)")
+
+    # verify=False matches ignore_https_errors in the browser engine
+    session = make_session(concurrency, headers={"User-Agent": USER_AGENT}, verify=False)
+    with session, ThreadPoolExecutor(concurrency) as pool:
+        soup, page_url = fetch_results_page(session, checkpoint.next_url or base_url)
+        page_num = checkpoint.page + 1
+        while True:
+            print(f"[{state_code}] Processing page {page_num}...")
+            if soup.find("table") is None:
+                if page_num == 1:
+                    raise NeedsBrowser(f"no results table at {page_url}")
+                print(f"[{state_code}] Table not found on page {page_num}")
+                break
+
+            links = detail_links(soup, page_url)
+            print(f"[{state_code}] Found {len(links)} records on page {page_num}")
+            links = skip_known(known, links, state_code, page_num)
+            if links is None:
+                break
+
+            # {} marks a failed page, None one that needs a browser
+            def fetch(link):
+                try:
+                    return fetch_detail(session, link, state_code)
+                except Exception as e:
+                    print(f"[{state_code}] Error on {link}: {e}")
+                    return {}
+
+            # map() keeps link order
+            page_fields = list(pool.map(fetch, links))
+            records = []
+            for link, fields in zip(links, page_fields):
+                try:
+                    records.append(parse_detail(fields, link, state_code) if fields else None)
+                except Exception as e:
+                    print(f"[{state_code}] Error on {link}: {e}")
+                    records.append(None)
+
+            browser_links = [link for link, fields in zip(links, page_fields) if fields is None]
+            if browser_links:
+                print(f"[{state_code}] {len(browser_links)} detail pages need a browser")
+                browser_records = iter(asyncio.run(scrape_details_with_browser(browser_links, state_code, concurrency)))
+                records = [next(browser_records) if fields is None else record for record, fields in zip(records, page_fields)]
+
+            # Next page
+            next_link = soup.select_one("a.next_page, a[rel='next']")
+            next_url = urljoin(page_url, next_link["href"]) if next_link is not None and next_link.get("href") else None
+
+            # Save progress after each page
+            checkpoint.add_page(page_num, [r for r in records if r is not None], next_url, last=next_url is None)
+
+            if next_url is None:
+                print(f"[{state_code}] No next page link found.")
+                break
+            print(f"[{state_code}] Moving to next page: {next_url}")
+            time.sleep(PAGE_DELAY)
+            response = session.get(next_url, timeout=30)
+            response.raise_for_status()
+            soup, page_url = BeautifulSoup(response.text, "lxml"), response.url
+            page_num += 1
+
+
+def scrape_ajc(base_url, state_code, output_file, concurrency=DEFAULT_CONCURRENCY, engine=DEFAULT_ENGINE, full=None, resume=None):
+    """
+    Scrape an AJC warn_lookups site, loading up to `concurrency` detail pages at once.
+    The http engine falls back to the browser when the site needs JS.
+    Unless `full` (default: the WARN_FULL_REFRESH environment variable), only
+    notices missing from output_file are visited and merged into it.
+    Progress is checkpointed per results page; `resume` (default: WARN_RESUME)
+    continues a run that stopped part way.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {', '.join(ENGINES)}")
+    if full is None:
+        full = bool(os.environ.get(FULL_REFRESH_ENV))
+    started = time.perf_counter()
+    known = KnownNotices(output_file, full=full)
+    if known.ids:
+        print(f"[{state_code}] Incremental run, {len(known.ids)} notices already in {output_file}")
+    checkpoint = Checkpoint(output_file, resume=resume)
+
+    if not checkpoint.complete:
+        try:
+            if engine == "http":
+                scrape_ajc_http(base_url, state_code, known, checkpoint, concurrency)
+            else:
+                asyncio.run(scrape_ajc_async(base_url, state_code, known, checkpoint, concurrency))
+        except NeedsBrowser as e:
+            print(f"[{state_code}] {e}, falling back to the browser")
+            asyncio.run(scrape_ajc_async(base_url, state_code, known, checkpoint, concurrency))
+
+    results = checkpoint.compact(known.merge(checkpoint.records))
+    print(f"[{state_code}] Finished. Total results: {len(results)} ({len(checkpoint.records)} new) in {time.perf_counter() - started:.1f}s")
+    return results
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape an AJC warn_lookups site (default: Arizona).")
+    parser.add_argument("--full", action="store_true", help="Revisit every notice instead of only new ones")
+    parser.add_argument("--resume", action="store_true", help="Continue from the checkpoint of a run that stopped part way")
+    parser.add_argument("--engine", choices=ENGINES, default=DEFAULT_ENGINE)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    args = parser.parse_args()
+
     # Test with AZ
     az_url = "https://www.azjobconnection.gov/search/warn_lookups/new"
-    scrape_ajc(az_url, "az", "data/az.json")
+    scrape_ajc(az_url, "az", "data/az.json", concurrency=args.concurrency, engine=args.engine, full=args.full, resume=args.resume)
@@ -0,0 +1,227 @@
+import argparse
+import json
+import sqlite3
+import time
+from collections import Counter
+from datetime import date
+from src.output import read_records
+from src.registry import state_modules
+from src.utils import normalize_name
+
+DB_PATH = "data/warn.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    record_key TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    employer TEXT,
+    employer_norm TEXT COLLATE NOCASE,
+    street TEXT,
+    municipality TEXT,
+    zip TEXT,
+    warn_date TEXT,
+    layoff_date TEXT,
+    type TEXT,
+    impacted INTEGER,
+    link TEXT,
+    employer_id TEXT,
+    record TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_state ON records (state);
+CREATE INDEX IF NOT EXISTS records_warn_date ON records (warn_date);
+CREATE INDEX IF NOT EXISTS records_layoff_date ON records (layoff_date);
+CREATE INDEX IF NOT EXISTS records_employer_norm ON records (employer_norm);
+CREATE INDEX IF NOT EXISTS records_zip ON records (zip);
+"""
+# Added after the first release; ALTERed into older databases before its index is created
+EMPLOYER_ID_INDEX = "CREATE INDEX IF NOT EXISTS records_employer_id ON records (employer_id)"
+
+UPSERT = """
+INSERT INTO records (record_key, state, employer, employer_norm, street, municipality, zip,
+                     warn_date, layoff_date, type, impacted, link, employer_id, record, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (record_key) DO UPDATE SET
+    employer = excluded.employer,
+    street = excluded.street,
+    municipality = excluded.municipality,
+    zip = excluded.zip,
+    layoff_date = excluded.layoff_date,
+    type = excluded.type,
+    impacted = excluded.impacted,
+    link = excluded.link,
+    employer_id = excluded.employer_id,
+    record = excluded.record,
+    last_seen = excluded.last_seen
+"""
+
+
+def record_key(record: dict, state: str) -> str:
+    """state | employer | warn date | location: the identity of a notice across runs."""
+    location = record.get("location") or {}
+    place = " ".join(normalize_name(location.get(field)) for field in ("street", "municipality", "zip"))
+    employer = normalize_name((record.get("employer") or {}).get("name"))
+    return "|".join((state, employer, record.get("warn_date") or "", " ".join(place.split())))
+
+
+def unique_keys(records, state):
+    """
+    (record_key, record) for each record. Records that share a key (separate
+    notices of one employer, date and site, or two rows for one notice) get
+    "#2", "#3", ... in the order they appear, so none overwrites another.
+    """
+    seen = {}
+    for record in records:
+        key = record_key(record, state)
+        seen[key] = seen.get(key, 0) + 1
+        if seen[key] > 1:
+            key = f"{key}#{seen[key]}"
+        yield key, record
+
+
+def vanished_links(previous_links: Counter, current_links) -> set:
+    """
+    Links (reports, workbooks) that had several notices before and have none
+    now. A whole report dropping out is a failed download or parse far more
+    often than every one of its notices being withdrawn, so their notices are
+    held back rather than treated as removed.
+    """
+    return {link for link, count in previous_links.items() if count > 1 and link not in current_links}
+
+
+def connect(db_path=DB_PATH) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    # Readers keep working while a state is ingested
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    if "employer_id" not in {row["name"] for row in conn.execute("PRAGMA table_info(records)")}:
+        conn.execute("ALTER TABLE records ADD COLUMN employer_id TEXT")
+    conn.execute(EMPLOYER_ID_INDEX)
+    return conn
+
+
+def _row(key, record, state, now):
+    location = record.get("location") or {}
+    employer = (record.get("employer") or {}).get("name")
+    return (
+        key, state, employer, normalize_name(employer),
+        location.get("street"), location.get("municipality"), location.get("zip"),
+        record.get("warn_date"), record.get("layoff_date"), record.get("type"),
+        record.get("impacted"), record.get("link"), record.get("employer_id"), json.dumps(record), now, now,
+    )
+
+
+def ingest(conn, state, records, prune=True) -> dict:
+    """
+    Upsert one state's records in a single transaction. With prune, rows of
+    the state that are no longer in its output (corrected or withdrawn
+    notices) are deleted in the same transaction, except those of a report
+    that produced no records at all this time (see vanished_links).
+    Returns counts of inserted, updated and removed rows.
+    """
+    now = time.time()
+    rows = [_row(key, record, state, now) for key, record in unique_keys(records, state)]
+    with conn:
+        before = conn.execute("SELECT COUNT(*) FROM records WHERE state = ?", (state,)).fetchone()[0]
+        conn.executemany(UPSERT, rows)
+        removed = 0
+        if prune:
+            stale = conn.execute("SELECT record_key, link FROM records WHERE state = ? AND last_seen < ?", (state, now)).fetchall()
+            held = vanished_links(Counter(row["link"] for row in stale), {record.get("link") for record in records})
+            if held:
+                print(f"[{state}] Keeping rows of {len(held)} sources with no records this run: {', '.join(sorted(map(str, held)))}")
+            deleted = [(row["record_key"],) for row in stale if row["link"] not in held]
+            conn.executemany("DELETE FROM records WHERE record_key = ?", deleted)
+            removed = len(deleted)
+        after = conn.execute("SELECT COUNT(*) FROM records WHERE state = ?", (state,)).fetchone()[0]
+    inserted = after - before + removed
+    return {"inserted": inserted, "updated": len(rows) - inserted, "removed": removed}
+
+
+def ingest_states(states=None, db_path=DB_PATH, prune=True) -> dict:
+    """Ingest data/<state>.json (or its JSONL) for each state that has output."""
+    results = {}
+    conn = connect(db_path)
+    try:
+        for state in states or state_modules():
+            try:
+                records = list(read_records(f"data/{state}.json"))
+            except FileNotFoundError:
+                continue
+            results[state] = ingest(conn, state, records, prune)
+    finally:
+        conn.close()
+    return results
+
+
+def _like_pattern(text):
+    """employer_like as a pattern on normalize_name's output, keeping its % and _ wildcards."""
+    parts = []
+    for part in text.split("%"):
+        normalized = normalize_name(part)
+        # "% inc" must still match "inc" as a word
+        if normalized and part[:1].isspace():
+            normalized = " " + normalized
+        if normalized and part[-1:].isspace():
+            normalized += " "
+        parts.append(normalized)
+    return "%".join(parts)
+
+
+def _iso(value):
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def query(state=None, since=None, until=None, employer_like=None, employer_id=None, db_path=DB_PATH, limit=None) -> list[dict]:
+    """
+    WarnRecord dicts from the store, newest warn date first.
+    since/until bound the warn date (inclusive; dates or ISO strings).
+    employer_like is a LIKE pattern on the normalized employer name
+    ("acme%"); text without wildcards matches anywhere in the name.
+    employer_id (from src/employers.py) matches every spelling of one employer.
+    """
+    clauses, params = [], []
+    if state:
+        clauses.append("state = ?")
+        params.append(state.lower())
+    if since:
+        clauses.append("warn_date >= ?")
+        params.append(_iso(since))
+    if until:
+        clauses.append("warn_date <= ?")
+        params.append(_iso(until))
+    if employer_like:
+        pattern = _like_pattern(employer_like)
+        if "%" not in employer_like and "_" not in employer_like:
+            pattern = f"%{pattern}%"
+        clauses.append("employer_norm LIKE ?")
+        params.append(pattern)
+    if employer_id:
+        clauses.append("employer_id = ?")
+        params.append(employer_id)
+    sql = "SELECT record FROM records"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY warn_date DESC, state, employer_norm"
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+
+    conn = connect(db_path)
+    try:
+        return [json.loads(row["record"]) for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=f"Load every state's output into {DB_PATH}")
+    parser.add_argument("--states", type=lambda v: [s.strip().lower() for s in v.split(',') if s.strip()], help="Comma-separated states to ingest (default: all)")
+    parser.add_argument("--db", default=DB_PATH, help=f"SQLite database (default: {DB_PATH})")
+    parser.add_argument("--keep-missing", dest="prune", action="store_false", help="Keep rows that are no longer in a state's output")
+    args = parser.parse_args()
+
+    for state, counts in ingest_states(args.states, args.db, args.prune).items():
+        print(f"{state}: {counts['inserted']} inserted, {counts['updated']} updated, {counts['removed']} removed")
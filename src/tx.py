@@ -1,140 +1,89 @@
-import json
-import requests
 import pandas as pd
 import os
-from datetime import datetime
-from playwright.sync_api import sync_playwright
-from src.models import WarnRecord, Employee, Address
-from src.utils import clean_impacted, derive_warn_type
+import traceback
+from src.browser import browser_context
+from src.convert import ColumnMap, date_column, frame_to_records, impacted_column, is_present, text_column
+from src.dedup import Deduper
+from src.output import RecordWriter
+from src.registry import PartialScrape, ScraperKind, register
+from src.http_cache import DownloadCache
+from src.parse_cache import cached_records
+from src.xlsx import SheetReader, open_workbook
 
-def parse_date(val):
-    """Parse various date formats into date objects."""
-    if pd.isna(val) or val is None:
-        return None
-    if isinstance(val, (datetime, pd.Timestamp)):
-        return val.date()
-    date_str = str(val).strip()
-    for fmt in ("%m/%d/%Y", "%Y-%m-%d", "%m-%d-%Y", "%d/%m/%Y", "%m/%d/%y"):
-        try:
-            return datetime.strptime(date_str, fmt).date()
-        except ValueError:
-            continue
-    return None
+# Bump when parsing changes so cached records from the parse cache are rebuilt
+PARSER_VERSION = 3
 
-def get_col(row, aliases):
-    """Get column value by checking various possible header names."""
-    for alias in aliases:
-        if alias in row:
-            return row[alias]
-        for k in row.keys():
-            if str(k).replace('\n', ' ').strip().lower() == alias.lower():
-                return row[k]
-    return None
+DATE_FORMATS = ("%m/%d/%Y", "%Y-%m-%d", "%m-%d-%Y", "%d/%m/%Y", "%m/%d/%y")
 
-def process_xlsx(url):
-    """Download and process the XLSX file from Texas."""
-    print(f"Processing XLSX: {url}")
-    local_file = "data/tx_current.xlsx"
-    xls = None
+# Texas-specific column names, first match wins
+COLUMNS = {
+    'company': ['JOB_SITE_NAME', 'Company', 'Employer', 'Company Name'],
+    'city': ['CITY_NAME', 'City', 'Municipality'],
+    'county': ['COUNTY_NAME', 'County'],
+    'warn_date': ['NOTICE_DATE', 'WFDD_RECEIVED_DATE', 'Notice Date', 'Received Date'],
+    'layoff_date': ['LayOff_Date', 'Layoff_Date', 'Effective Date', 'Layoff Date'],
+    'impacted': ['TOTAL_LAYOFF_NUMBER', 'No. of Employees', 'Number of Employees'],
+}
+
+def parse_sheet(df, url, columns=None):
+    """Convert (a chunk of) the Texas WARN sheet into WarnRecord dicts."""
+    # Resolve column names once for the whole sheet
+    if columns is None:
+        columns = ColumnMap(df.columns, COLUMNS)
+        if columns.missing:
+            print(f"TX columns: {columns.describe()}")
+
+    company = columns.column(df, 'company')
+    impacted = columns.column(df, 'impacted')
+    county = columns.column(df, 'county')
+
+    # Zip and type are not in Texas data
+    frame = pd.DataFrame({
+        'company': text_column(company),
+        'municipality': text_column(columns.column(df, 'city')),
+        'warn_date': date_column(columns.column(df, 'warn_date'), DATE_FORMATS),
+        'layoff_date': date_column(columns.column(df, 'layoff_date'), DATE_FORMATS),
+        'impacted': impacted_column(impacted.where(is_present(impacted))),
+        # Build notes with county info if available
+        'notes': ("County: " + county.astype(str)).where(is_present(county), None),
+        'link': url,
+    }, index=df.index)
+    frame = frame[is_present(company)]
+
+    return frame_to_records(frame, "tx")
+
+def iter_xlsx(path, url):
+    """Stream records from the first sheet of the workbook, a chunk of rows at a time."""
+    workbook = open_workbook(path)
     try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.get(url, headers=headers)
-        with open(local_file, "wb") as f:
-            f.write(response.content)
-        
-        xls = pd.ExcelFile(local_file)
-        # Use first sheet or look for relevant sheet
-        sheet_name = xls.sheet_names[0]
-        
-        # Try to detect header row
-        df = pd.read_excel(xls, sheet_name=sheet_name)
-        
-        # Close handle immediately
-        xls.close()
-        xls = None
-        
-        results = []
-        for _, row in df.iterrows():
-            row_dict = row.to_dict()
-            
-            # Texas-specific column names
-            company = get_col(row_dict, [
-                'JOB_SITE_NAME', 'Company', 'Employer', 'Company Name'
-            ])
-            
-            city = get_col(row_dict, [
-                'CITY_NAME', 'City', 'Municipality'
-            ])
-            
-            county = get_col(row_dict, [
-                'COUNTY_NAME', 'County'
-            ])
-            
-            zip_code = None  # Not in Texas data
-            
-            warn_date = parse_date(get_col(row_dict, [
-                'NOTICE_DATE', 'WFDD_RECEIVED_DATE', 'Notice Date', 'Received Date'
-            ]))
-            
-            layoff_date = parse_date(get_col(row_dict, [
-                'LayOff_Date', 'Layoff_Date', 'Effective Date', 'Layoff Date'
-            ]))
-            
-            impacted = get_col(row_dict, [
-                'TOTAL_LAYOFF_NUMBER', 'No. of Employees', 'Number of Employees'
-            ])
-            
-            type_str = None  # Not explicitly in Texas data
-            
-            if not company or pd.isna(company):
-                continue
-            
-            # Build notes with county info if available
-            notes = None
-            if county and not pd.isna(county):
-                notes = f"County: {county}"
-            
-            record = WarnRecord(
-                employer=Employee(name=str(company).strip()),
-                location=Address(
-                    municipality=str(city).strip() if city and not pd.isna(city) else None,
-                    state="tx",
-                    zip=zip_code
-                ),
-                warn_date=warn_date,
-                layoff_date=layoff_date,
-                type=derive_warn_type(str(type_str)) if type_str and not pd.isna(type_str) else None,
-                impacted=clean_impacted(str(impacted)) if impacted and not pd.isna(impacted) else None,
-                notes=notes,
-                link=url
-            )
-            results.append(record.model_dump(mode='json'))
-        return results
-    except Exception as e:
-        print(f"Error processing XLSX {url}: {e}")
-        import traceback
-        traceback.print_exc()
-        return []
+        reader = SheetReader(workbook.worksheets[0], COLUMNS)
+        if reader.columns.missing:
+            print(f"TX columns: {reader.columns.describe()}")
+        for chunk in reader.chunks():
+            yield from parse_sheet(chunk, url, reader.columns)
     finally:
-        if xls:
-            xls.close()
-        if os.path.exists(local_file):
-            try:
-                os.remove(local_file)
-            except Exception as e:
-                print(f"Could not delete {local_file}: {e}")
+        workbook.close()
+
+def read_xlsx(path, url):
+    return list(iter_xlsx(path, url))
+
+def process_xlsx(url, cache=None):
+    """Download and process the XLSX file from Texas."""
+    print(f"Processing XLSX: {url}")
+    cache = cache or DownloadCache()
+    headers = {"User-Agent": "Mozilla/5.0"}
+    download = cache.get(url, headers=headers)
+    return cached_records(download.path, url, "tx-xlsx", PARSER_VERSION, lambda: iter_xlsx(download.path, url))
 
+@register("tx", ScraperKind.XLSX, browser=True)
 def scrape_tx():
     """Scrape Texas WARN data."""
     base_url = "https://www.twc.texas.gov/data-reports/warn-notice"
-    all_results = []
-    
     if not os.path.exists('data'):
         os.makedirs('data')
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+    with browser_context() as context:
+        page = context.new_page()
         print(f"Finding XLSX links on {base_url}")
         page.goto(base_url)
         
@@ -152,23 +101,37 @@ def scrape_tx():
                 return results;
             }
         """)
-        browser.close()
     
     print(f"Found {len(links)} XLSX link(s)")
     
     # Remove duplicates
     unique_links = {l['href']: l for l in links}.values()
     
-    for l in unique_links:
-        url = l['href']
-        print(f"Processing: {l['text']} ({url})")
-        all_results.extend(process_xlsx(url))
-    
-    # Save results
-    with open("data/tx.json", "w") as f:
-        json.dump(all_results, f, indent=2)
-    
-    print(f"Scraped {len(all_results)} records from Texas WARN to data/tx.json")
+    downloads = DownloadCache()
+    # Records stream from each workbook (or its parse cache entry) straight to the output;
+    # none are kept in memory. The yearly workbooks repeat notices near the turn of the year,
+    # so repeats are dropped on the way.
+    deduper = Deduper("tx")
+    failed = []
+    with RecordWriter("data/tx.json") as writer:
+        for l in unique_links:
+            url = l['href']
+            print(f"Processing: {l['text']} ({url})")
+            try:
+                writer.write_all(record for record in process_xlsx(url, downloads) if deduper.add(record, url))
+            except Exception as e:
+                # Records already written from this workbook stay; the run is reported PARTIAL
+                print(f"Error processing XLSX {url}: {e}")
+                traceback.print_exc()
+                failed.append(url)
+    all_results = writer.records()
+
+    print(deduper.report())
+    print(f"Scraped {len(all_results)} records from Texas WARN to {writer.path}")
+    print(f"TX {downloads.stats()}")
+    if failed:
+        raise PartialScrape("tx", failed, all_results)
+    return all_results
 
 if __name__ == "__main__":
     scrape_tx()
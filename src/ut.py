@@ -1,16 +1,17 @@
-import json
-from playwright.sync_api import sync_playwright
+from src.browser import browser_context
 from datetime import datetime
 from src.models import WarnRecord, Employee, Address
 from src.utils import clean_impacted
+from src.output import write_records
+from src.registry import ScraperKind, register
 
+@register("ut", ScraperKind.BROWSER)
 def scrape_ut():
     url = "https://jobs.utah.gov/employer/business/warnnotices.html"
     results = []
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+    with browser_context() as context:
+        page = context.new_page()
         print(f"Navigating to {url}")
         page.goto(url)
         
@@ -54,12 +55,9 @@ def scrape_ut():
                     )
                     results.append(record.model_dump(mode='json'))
         
-        browser.close()
-        
-    with open("data/ut.json", "w") as f:
-        json.dump(results, f, indent=2)
-    
+    write_records("data/ut.json", results)
     print(f"Scraped {len(results)} records to data/ut.json")
+    return results
 
 if __name__ == "__main__":
     scrape_ut()
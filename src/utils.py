@@ -1,6 +1,12 @@
 import re
 import os
+import math
+import pickle
+import hashlib
+import threading
+import functools
 import pandas as pd
+from types import MappingProxyType
 from typing import Optional
 from src.models import WarnType
 
@@ -21,67 +27,224 @@ def derive_warn_type(text: Optional[str]) -> Optional[WarnType]:
         
     return None
 
-def clean_impacted(val: str) -> Optional[int]:
-    if not val:
+def clean_impacted(val) -> Optional[int]:
+    """
+    Employee count of a cell: numbers rounded, text as the number it spells
+    ("1,234", "25.0") or else its digits ("approx. 50 employees").
+    The reference for convert.impacted_column, which must agree with it.
+    """
+    if val is None or isinstance(val, bool):
         return None
-    # Remove comma and non-numeric chars except digits
-    digits = re.sub(r'[^\d]', '', str(val))
+    if isinstance(val, (int, float)):
+        return int(round(abs(val))) if math.isfinite(val) else None
+    # Spreadsheet and PDF cells arrive as "25.0"; stripping the point would make that 250
+    text = str(val).strip().replace(',', '')
+    try:
+        return clean_impacted(float(text))
+    except ValueError:
+        pass
+    # Remove non-numeric chars except digits
+    digits = re.sub(r'[^\d]', '', text)
     if digits:
         return int(digits)
     return None
 
-def load_fips_places():
-    """Load FIPS place names from data/fips.txt."""
-    fips_file = 'data/fips.txt'
+# Dropped from employer names before comparing: "Acme Corp." and "ACME Corporation" are the same employer
+LEGAL_SUFFIXES = frozenset({
+    'inc', 'incorporated', 'llc', 'lc', 'ltd', 'limited', 'corp', 'corporation', 'co', 'company',
+    'lp', 'llp', 'plc', 'pc', 'the', 'dba',
+})
+
+def normalize_name(name) -> str:
+    """Lowercase, punctuation dropped and whitespace collapsed: "ACME, Inc." -> "acme inc"."""
+    return " ".join(re.sub(r"[^\w\s]", " ", str(name or "").lower()).split())
+
+FIPS_FILE = 'data/fips.txt'
+# Compiled gazetteer next to fips.txt, rebuilt whenever fips.txt changes
+FIPS_CACHE_FILE = 'data/fips.pickle'
+# Bump when the compiled layout or the parsing rules below change
+FIPS_CACHE_VERSION = 1
+
+_FIPS_SKIP_PREFIXES = ('Federal Information', 'digits', 'using', 'identify', '---', 'state-level', 'county-level')
+_FIPS_NAME_SUFFIXES = (' county', ' borough', ' census area', ' parish', ' municipality', ' city', ' town', ' village')
+
+
+def parse_fips_file(fips_file=FIPS_FILE):
+    """Parse FIPS place names from the plain text FIPS listing."""
     if not os.path.exists(fips_file):
         return {}
-    
+
+    # dict keys act as an insertion-ordered set per state
     places = {}
     with open(fips_file, 'r') as f:
-        lines = f.readlines()
-        
-    current_state_fips = None
-    
-    # Simple parser for the provided FIPS format
-    for line in lines:
-        line = line.strip()
-        if not line or line.startswith('Federal Information') or line.startswith('digits') or line.startswith('using') or line.startswith('identify') or line.startswith('---') or line.startswith('state-level') or line.startswith('county-level'):
-            continue
-            
-        # Try to parse state level: 01 ALABAMA
-        parts = line.split()
-        if len(parts) >= 2 and parts[0].isdigit() and len(parts[0]) == 2:
-            current_state_fips = parts[0]
-            continue
-            
-        # Try to parse county/place level: 01001 Autauga County
-        if len(parts) >= 2 and parts[0].isdigit() and len(parts[0]) == 5:
-            full_fips = parts[0]
-            state_fips = full_fips[:2]
-            # Join parts starting from index 1 to get the name
-            place_name = " ".join(parts[1:])
-            
-            if state_fips not in places:
-                places[state_fips] = []
-            
-            clean_name = place_name.lower()
-            if clean_name not in places[state_fips]:
-                places[state_fips].append(clean_name)
-                
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith(_FIPS_SKIP_PREFIXES):
+                continue
+
+            # State level lines (01 ALABAMA) only carry the state name
+            # County/place level lines look like: 01001 Autauga County
+            parts = line.split()
+            if len(parts) < 2 or len(parts[0]) != 5 or not parts[0].isdigit():
+                continue
+
+            state_places = places.setdefault(parts[0][:2], {})
+            clean_name = " ".join(parts[1:]).lower()
+            state_places[clean_name] = None
+
             # Also add cleaned version without common suffixes
-            suffixes = [' county', ' borough', ' census area', ' parish', ' municipality', ' city', ' town', ' village']
-            for suffix in suffixes:
+            for suffix in _FIPS_NAME_SUFFIXES:
                 if clean_name.endswith(suffix):
                     cleaned = clean_name[:-len(suffix)].strip()
-                    if cleaned and cleaned not in places[state_fips]:
-                        places[state_fips].append(cleaned)
+                    if cleaned:
+                        state_places.setdefault(cleaned, None)
                     break
 
+    return {state: list(names) for state, names in places.items()}
+
+
+def _fips_fingerprint(fips_file):
+    stat = os.stat(fips_file)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _fips_digest(fips_file):
+    with open(fips_file, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _read_fips_cache(cache_file, fips_file):
+    """Return the compiled places if the cache matches fips_file, else None."""
+    try:
+        with open(cache_file, 'rb') as f:
+            cached = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get('version') != FIPS_CACHE_VERSION:
+        return None
+
+    if cached.get('fingerprint') == _fips_fingerprint(fips_file):
+        return cached['places']
+    # mtime changes on checkout/copy even when content does not, fall back to the hash
+    if cached.get('sha256') == _fips_digest(fips_file):
+        _write_fips_cache(cache_file, fips_file, cached['places'], cached['sha256'])
+        return cached['places']
+    return None
+
+
+def _write_fips_cache(cache_file, fips_file, places, digest=None):
+    payload = {
+        'version': FIPS_CACHE_VERSION,
+        'fingerprint': _fips_fingerprint(fips_file),
+        'sha256': digest or _fips_digest(fips_file),
+        'places': places,
+    }
+    # Write to a temp file and rename so concurrent scrapers never read a partial cache
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"Could not write FIPS cache {cache_file}: {e}")
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+
+def load_fips_places(fips_file=FIPS_FILE, cache_file=FIPS_CACHE_FILE):
+    """
+    Load FIPS place names from data/fips.txt.
+    Uses the compiled cache when it is up to date, otherwise reparses and rebuilds it.
+    Pass cache_file=None to always parse the text file.
+    """
+    if not os.path.exists(fips_file):
+        return {}
+
+    if cache_file:
+        places = _read_fips_cache(cache_file, fips_file)
+        if places is not None:
+            return places
+
+    places = parse_fips_file(fips_file)
+    if cache_file:
+        _write_fips_cache(cache_file, fips_file, places)
     return places
 
 # Global cache for places
 _FIPS_PLACES = None
 
+# Per-state suffix indexes built from _FIPS_PLACES, keyed by state FIPS code
+_SUFFIX_INDEXES = {}
+_SUFFIX_INDEXES_LOCK = threading.Lock()
+
+
+class SuffixIndex:
+    """
+    Immutable reversed-character trie over a list of place names.
+    Finds the longest place name that ends a string on a word boundary
+    in O(len(text)) instead of scanning every known place.
+    """
+    __slots__ = ("_root",)
+
+    # Key marking a complete place name inside a trie node. Never a single character.
+    _END = "\0end"
+
+    def __init__(self, names):
+        root = {}
+        for name in names:
+            if not name:
+                continue
+            node = root
+            for ch in reversed(name):
+                node = node.setdefault(ch, {})
+            node[self._END] = name
+        self._root = _freeze_trie(root)
+
+    def longest_suffix(self, text: str, original: Optional[str] = None) -> Optional[str]:
+        """
+        Return the longest indexed name that `text` ends with, where the character
+        before the match in `original` (defaults to `text`) is not alphanumeric.
+        """
+        if original is None:
+            original = text
+        best = None
+        node = self._root
+        length = 0
+        for ch in reversed(text):
+            node = node.get(ch)
+            if node is None:
+                break
+            length += 1
+            name = node.get(self._END)
+            if name is not None:
+                # verify word boundary to avoid partial matches like "Weston" matching "Ton"
+                if len(original) > length and original[-length - 1].isalnum():
+                    continue
+                best = name
+        return best
+
+
+def _freeze_trie(node):
+    return MappingProxyType({k: (v if k == SuffixIndex._END else _freeze_trie(v)) for k, v in node.items()})
+
+
+def get_suffix_index(state_fips) -> Optional[SuffixIndex]:
+    """Return the shared suffix index of known places for a state, building it on first use."""
+    global _FIPS_PLACES
+    index = _SUFFIX_INDEXES.get(state_fips)
+    if index is not None:
+        return index
+    with _SUFFIX_INDEXES_LOCK:
+        if _FIPS_PLACES is None:
+            _FIPS_PLACES = load_fips_places()
+        if state_fips not in _FIPS_PLACES:
+            return None
+        index = _SUFFIX_INDEXES.get(state_fips)
+        if index is None:
+            index = SuffixIndex(_FIPS_PLACES[state_fips])
+            _SUFFIX_INDEXES[state_fips] = index
+    return index
+
 
 def standardize_address(street: Optional[str], city: Optional[str]) -> tuple[Optional[str], Optional[str]]:
     """
@@ -142,10 +305,6 @@ def standardize_address(street: Optional[str], city: Optional[str]) -> tuple[Opt
     return clean_part(street), clean_part(city)
 
 def parse_address(address_str, state_fips=None):
-    global _FIPS_PLACES
-    if _FIPS_PLACES is None:
-        _FIPS_PLACES = load_fips_places()
-
     if not address_str or pd.isna(address_str):
         return {"street": None, "municipality": None, "zip": None}
     
@@ -175,11 +334,7 @@ def parse_address(address_str, state_fips=None):
         "l.a.": "Los Angeles"
     }
 
-    known_cities = []
-    if state_fips and state_fips in _FIPS_PLACES:
-        known_cities = _FIPS_PLACES[state_fips]
-        # Sort by length descending to match longest first
-        known_cities.sort(key=len, reverse=True)
+    known_cities = get_suffix_index(state_fips) if state_fips else None
         
     extracted_city = None
     
@@ -216,22 +371,16 @@ def parse_address(address_str, state_fips=None):
             if extracted_city:
                 break
 
-            for known_city in known_cities:
-                # Check if address ends with this city (case insensitive)
-                if candidate_lower.endswith(known_city):
-                     # verify word boundary to avoid partial matches like "Weston" matching "Ton"
-                    if len(candidate) > len(known_city) and candidate[-len(known_city)-1].isalnum():
-                        continue
-
-                    # Extract original casing from candidate? Or use Title Case known city?
-                    # Using Title Case for known_city is safer for normalization
-                    city = known_city.title() 
-                    extracted_city = known_city
-                    
-                    # The rest is street
-                    street = candidate[:-len(known_city)].strip().rstrip(',').strip()
-                    break
-            if extracted_city:
+            # Longest known city the address ends with (case insensitive)
+            known_city = known_cities.longest_suffix(candidate_lower, candidate)
+            if known_city:
+                # Extract original casing from candidate? Or use Title Case known city?
+                # Using Title Case for known_city is safer for normalization
+                city = known_city.title() 
+                extracted_city = known_city
+                
+                # The rest is street
+                street = candidate[:-len(known_city)].strip().rstrip(',').strip()
                 break
         if not city:
             # Fallback logic if FIPS failed or no match found
@@ -321,3 +470,52 @@ def parse_address(address_str, state_fips=None):
         "municipality": std_city,
         "zip": zip_code
     }
+
+
+# Upper bound on distinct (address, state) pairs kept by parse_addresses
+ADDRESS_CACHE_SIZE = 65536
+
+ADDRESS_FIELDS = ("street", "municipality", "zip")
+
+
+@functools.lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def _parse_address_cached(address_str, state_fips):
+    parsed = parse_address(address_str, state_fips=state_fips)
+    return tuple(parsed[field] for field in ADDRESS_FIELDS)
+
+
+def _address_key(value):
+    """Cache key for an address cell; all missing values share one key."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return str(value)
+
+
+def parse_addresses(addresses, state_fips=None) -> pd.DataFrame:
+    """
+    Parse a column of addresses at once.
+    Each distinct address is parsed a single time and the result is kept in a
+    process wide LRU cache, so repeated addresses across calls are free.
+    Returns a DataFrame with street/municipality/zip columns aligned to the
+    input (same index when given a Series), ready to assign to a DataFrame.
+    """
+    if isinstance(addresses, pd.Series):
+        index = addresses.index
+        values = addresses.tolist()
+    else:
+        values = list(addresses)
+        index = pd.RangeIndex(len(values))
+
+    keys = [_address_key(v) for v in values]
+    parsed = {key: _parse_address_cached(key, state_fips) for key in dict.fromkeys(keys)}
+
+    columns = {
+        field: pd.Series([parsed[key][i] for key in keys], index=index, dtype=object)
+        for i, field in enumerate(ADDRESS_FIELDS)
+    }
+    return pd.DataFrame(columns, index=index)
+
+
+def address_cache_info():
+    """Hits, misses and size of the parse_addresses cache (functools.lru_cache CacheInfo)."""
+    return _parse_address_cached.cache_info()
@@ -1,5 +1,11 @@
+from src.registry import ScraperKind, register
 from src.scrape_ajc import scrape_ajc
 
+URL = "https://www.vermontjoblink.com/search/warn_lookups?q%5Bnotice_eq%5D=true&commit=Search"
+
+@register("vt", ScraperKind.HTML)
+def scrape_vt():
+    return scrape_ajc(URL, "vt", "data/vt.json")
+
 if __name__ == "__main__":
-    url = "https://www.vermontjoblink.com/search/warn_lookups?q%5Bnotice_eq%5D=true&commit=Search"
-    scrape_ajc(url, "vt", "data/vt.json")
+    scrape_vt()
@@ -1,18 +1,21 @@
-import json
-from playwright.sync_api import sync_playwright
+from src.browser import browser_context
 from datetime import datetime
 import time
 from src.models import WarnRecord, Employee, Address
 from src.utils import clean_impacted, derive_warn_type
+from src.registry import ScraperKind, register
+from src.checkpoint import Checkpoint
 
+@register("wa", ScraperKind.BROWSER)
 def scrape_wa():
     # Direct URL to the WARN database
     url = "https://fortress.wa.gov/esd/file/WARN/Public/SearchWARN.aspx"
-    results = []
-    
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+    checkpoint = Checkpoint("data/wa.json")
+    if checkpoint.complete:
+        return checkpoint.compact()
+
+    with browser_context() as context:
+        page = context.new_page()
         print(f"Navigating to {url}")
         page.goto(url)
         
@@ -45,6 +48,7 @@ def scrape_wa():
             """)
             
             print(f"Found {len(rows_data)} records on page {page_num}")
+            page_records = []
             for row in rows_data:
                 if len(row) < 7:
                     continue
@@ -83,7 +87,7 @@ def scrape_wa():
                     impacted=clean_impacted(impacted_str),
                     notes=f"Action: {action_type}, Type: {layoff_type}"
                 )
-                results.append(record.model_dump(mode='json'))
+                page_records.append(record.model_dump(mode='json'))
             
             # Check for next page
             target_page = str(page_num + 1)
@@ -99,19 +103,20 @@ def scrape_wa():
                 }
             """, target_page)
             
+            # Pages done by a resumed run are only paged through
+            if not checkpoint.done(page_num):
+                checkpoint.add_page(page_num, page_records, last=not next_page_clicked)
+
             if not next_page_clicked:
                 print("No more pages found.")
                 break
                 
             page_num += 1
             time.sleep(3) # Wait for page reload
-            
-        browser.close()
         
-    with open("data/wa.json", "w") as f:
-        json.dump(results, f, indent=2)
-    
+    results = checkpoint.compact()
     print(f"Scraped {len(results)} records to data/wa.json")
+    return results
 
 if __name__ == "__main__":
     scrape_wa()
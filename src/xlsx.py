@@ -0,0 +1,78 @@
+import openpyxl
+import pandas as pd
+from src.convert import ColumnMap
+
+# Rows per DataFrame handed to the whole-column converters
+CHUNK_ROWS = 5000
+# Cell text read as missing, the same strings pd.read_excel treats as NaN
+NA_STRINGS = frozenset({
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+})
+
+
+def open_workbook(path):
+    """Open an XLSX for streaming: rows are parsed as they are read and never held as a DOM."""
+    return openpyxl.load_workbook(path, read_only=True, data_only=True, keep_links=False)
+
+
+def _cell(value):
+    """A cell value as pd.read_excel would give it."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value in NA_STRINGS:
+        return None
+    return value
+
+
+def _headers(row):
+    return [f"Unnamed: {i}" if value is None else value for i, value in enumerate(row)]
+
+
+class SheetReader:
+    """
+    The rows of one sheet, read lazily as tuples holding only the columns
+    matched by `aliases`. `header` is the 0-based row with the column names
+    (like pd.read_excel's header=); they are resolved once into `columns`,
+    a ColumnMap. Blank rows are skipped.
+    """
+
+    def __init__(self, sheet, aliases: dict, header=0, contains: dict = None):
+        # Sheets often report wrong dimensions; read until the rows run out
+        sheet.reset_dimensions()
+        self._rows = sheet.iter_rows(values_only=True)
+        header_row = ()
+        for _ in range(header + 1):
+            header_row = next(self._rows, ())
+        self.columns = ColumnMap(_headers(header_row), aliases, contains)
+        self.fields = list(self.columns.columns)
+        self._positions = [self.columns.positions[field] for field in self.fields]
+
+    def __iter__(self):
+        positions = self._positions
+        for row in self._rows:
+            values = tuple(_cell(row[p]) if p < len(row) else None for p in positions)
+            if any(value is not None for value in values):
+                yield values
+
+    def chunks(self, size=CHUNK_ROWS):
+        """
+        DataFrames of at most `size` rows, one column per matched field under its
+        sheet header, so `columns.column(chunk, field)` works on every chunk.
+        """
+        rows = []
+        for values in self:
+            rows.append(values)
+            if len(rows) == size:
+                yield self._frame(rows)
+                rows = []
+        if rows:
+            yield self._frame(rows)
+
+    def _frame(self, rows):
+        # Build column by column as object data, then let each column settle on a dtype
+        frame = pd.DataFrame({
+            self.columns.columns[field]: pd.Series([row[i] for row in rows], dtype=object)
+            for i, field in enumerate(self.fields)
+        })
+        return frame.infer_objects()
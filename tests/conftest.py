@@ -0,0 +1,14 @@
+from datetime import date
+import pytest
+from src.models import record_dict
+
+
+@pytest.fixture
+def record():
+    """Factory for WarnRecord dicts as the scrapers write them, through models.record_dict."""
+    def make(name, warn_date="2024-01-05", impacted=10, city="Austin", state="tx", link=None, employer_id=None, street=None, zip=None):
+        result = record_dict(company=name, street=street, municipality=city, state=state, zip=zip,
+                             warn_date=date.fromisoformat(warn_date), impacted=impacted, link=link)
+        result["employer_id"] = employer_id
+        return result
+    return make
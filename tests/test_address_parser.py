@@ -33,3 +33,54 @@ def test_parse_address(address_input, state_fips, expected_municipality, expecte
         assert result['street'] == expected_street
     else:
         assert result['street'] is None
+
+
+def test_suffix_index_longest_word_bounded_match():
+    from src.utils import SuffixIndex
+
+    index = SuffixIndex(["ton", "weston", "san diego", "diego"])
+    assert index.longest_suffix("123 main st san diego") == "san diego"
+    assert index.longest_suffix("1 elm st weston") == "weston"
+    # "ton" must not match inside "Boston"
+    assert index.longest_suffix("1 elm st boston") is None
+    assert index.longest_suffix("ton") == "ton"
+
+
+def test_parse_address_does_not_mutate_places():
+    from src import utils
+
+    parse_address("5651 Copley Dr. Suite A  San Diego Ca", state_fips="06")
+    assert utils._FIPS_PLACES["06"] == utils.load_fips_places()["06"]
+
+
+def test_fips_cache_rebuilds_when_source_changes(tmp_path):
+    from src.utils import load_fips_places
+
+    fips_file = tmp_path / "fips.txt"
+    cache_file = tmp_path / "fips.pickle"
+    fips_file.write_text("06 CALIFORNIA\n06001 Alameda County\n")
+
+    assert load_fips_places(str(fips_file), str(cache_file)) == {"06": ["alameda county", "alameda"]}
+    assert cache_file.exists()
+
+    fips_file.write_text("06 CALIFORNIA\n06001 Alameda County\n06003 Alpine County\n")
+    places = load_fips_places(str(fips_file), str(cache_file))
+    assert places["06"] == ["alameda county", "alameda", "alpine county", "alpine"]
+
+
+def test_parse_addresses_aligns_with_input_and_caches():
+    import pandas as pd
+    from src.utils import parse_addresses, address_cache_info
+
+    addresses = pd.Series(["East Greenwich, RI", None, "East Greenwich, RI", "Lincoln, RI"], index=[10, 11, 12, 13])
+    before = address_cache_info()
+    parsed = parse_addresses(addresses, state_fips="44")
+    after = address_cache_info()
+
+    assert list(parsed.index) == [10, 11, 12, 13]
+    assert parsed["municipality"].tolist() == ["EAST GREENWICH", None, "EAST GREENWICH", "LINCOLN"]
+    assert parsed.loc[11].tolist() == [None, None, None]
+    # Duplicates within one call are parsed once
+    assert (after.hits + after.misses) - (before.hits + before.misses) == 3
+    assert parse_addresses(["Lincoln, RI"], state_fips="44").loc[0, "municipality"] == "LINCOLN"
+    assert address_cache_info().hits == after.hits + 1
@@ -0,0 +1,35 @@
+import json
+from src.changes import update_feed
+from src.output import write_records
+
+
+def test_feed_lists_changes_since_last_run(record, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_records("data/tx.json", [record("Acme"), record("Beta"), record("Gamma")], compress=False, legacy_json=False)
+    assert update_feed(["tx"], run="2024-01-06T00:00:00+00:00") == {"tx": None}
+    assert not (tmp_path / "data/changes.jsonl").exists()
+
+    # Headcount corrected, one withdrawn, one new; a new employer_id alone is not a change
+    write_records("data/tx.json", [record("Acme", impacted=12), record("Beta", employer_id="emp-1"), record("Delta")], compress=False, legacy_json=False)
+    assert update_feed(["tx"], run="2024-01-07T00:00:00+00:00") == {"tx": {"added": 1, "changed": 1, "removed": 1}}
+    feed = [json.loads(line) for line in open("data/changes.jsonl")]
+    assert [(e["change"], e["record"]["employer"]["name"]) for e in feed] == [("changed", "Acme"), ("added", "Delta"), ("removed", "Gamma")]
+    assert feed[0]["previous"]["impacted"] == 10 and feed[0]["record"]["impacted"] == 12
+    assert {e["run"] for e in feed} == {"2024-01-07T00:00:00+00:00"}
+
+    assert update_feed(["tx"]) == {"tx": {"added": 0, "changed": 0, "removed": 0}}
+
+
+def test_report_with_no_records_is_not_withdrawn(record, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pdf, xlsx = "https://example.com/2023.pdf", "https://example.com/2024.xlsx"
+    write_records("data/ca.json", [record("Acme", link=pdf), record("Beta", link=pdf), record("Gamma", link=xlsx)], compress=False, legacy_json=False)
+    update_feed(["ca"])
+
+    # The PDF failed to download this run; only Gamma is really gone
+    write_records("data/ca.json", [record("Delta", link=xlsx)], compress=False, legacy_json=False)
+    assert update_feed(["ca"]) == {"ca": {"added": 1, "changed": 0, "removed": 1}}
+
+    # Back again: nothing to report for its notices
+    write_records("data/ca.json", [record("Acme", link=pdf), record("Beta", link=pdf), record("Delta", link=xlsx)], compress=False, legacy_json=False)
+    assert update_feed(["ca"]) == {"ca": {"added": 0, "changed": 0, "removed": 0}}
@@ -0,0 +1,45 @@
+import json
+import os
+from src.checkpoint import Checkpoint, checkpoint_path
+
+
+def test_resume_keeps_only_finished_pages(tmp_path):
+    output_file = str(tmp_path / "ok.json")
+    checkpoint = Checkpoint(output_file, resume=False)
+    checkpoint.add_page(1, [{"n": 1}, {"n": 2}], next_url="https://example.com/?page=2")
+    checkpoint.add_page(2, [{"n": 3}], next_url="https://example.com/?page=3")
+    # Crash part way through page 3, mid-line
+    with open(checkpoint_path(output_file), "a") as f:
+        f.write(json.dumps({"record": {"n": 4}}) + "\n")
+        f.write('{"record": {"n"')
+
+    resumed = Checkpoint(output_file, resume=True)
+    assert resumed.records == [{"n": 1}, {"n": 2}, {"n": 3}]
+    assert resumed.page == 2
+    assert resumed.next_url == "https://example.com/?page=3"
+    assert resumed.done(2) and not resumed.done(3)
+    assert not resumed.complete
+
+    resumed.add_page(3, [{"n": 5}], last=True)
+    again = Checkpoint(output_file, resume=True)
+    assert again.records == [{"n": 1}, {"n": 2}, {"n": 3}, {"n": 5}]
+    assert again.complete
+
+
+def test_compact_writes_output_once_and_drops_log(tmp_path):
+    output_file = str(tmp_path / "wa.json")
+    checkpoint = Checkpoint(output_file)
+    checkpoint.add_page(1, [{"n": 1}], last=True)
+    assert not os.path.exists(output_file)
+
+    assert checkpoint.compact() == [{"n": 1}]
+    with open(output_file) as f:
+        assert json.load(f) == [{"n": 1}]
+    assert not os.path.exists(checkpoint_path(output_file))
+
+
+def test_without_resume_starts_over(tmp_path):
+    output_file = str(tmp_path / "az.json")
+    Checkpoint(output_file).add_page(1, [{"n": 1}], next_url="https://example.com/?page=2")
+    fresh = Checkpoint(output_file, resume=False)
+    assert fresh.records == [] and fresh.page == 0
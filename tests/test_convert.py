@@ -0,0 +1,58 @@
+import datetime
+import pandas as pd
+from src.convert import date_column, frame_to_records, impacted_column, warn_type_column
+from src.models import WarnType
+from src.utils import clean_impacted
+
+
+def test_impacted_column_matches_clean_impacted():
+    values = pd.Series(['1,234', None, float('nan'), 25.0, 7, '', 'n/a', '12 employees', 0, '12.5', '25.0', '1,234.6', -4, 'inf'], dtype=object)
+    assert impacted_column(values).tolist() == [1234, None, None, 25, 7, None, None, 12, 0, 12, 25, 1235, 4, None]
+    assert impacted_column(values).tolist() == [clean_impacted(v) for v in values]
+    # Float columns must not pick up an extra digit from "25.0"
+    assert impacted_column(pd.Series([25.0, None, 3.0])).tolist() == [25, None, 3]
+
+
+def test_date_column_tries_formats_in_order():
+    values = pd.Series(['1/5/2024', ' 2024-02-03 ', datetime.datetime(2023, 1, 2), None, 'junk', '13/01/2024'], dtype=object)
+    parsed = date_column(values, ("%m/%d/%Y", "%Y-%m-%d", "%d/%m/%Y"))
+    assert parsed.tolist() == [
+        datetime.date(2024, 1, 5), datetime.date(2024, 2, 3), datetime.date(2023, 1, 2),
+        None, None, datetime.date(2024, 1, 13),
+    ]
+
+
+def test_warn_type_column_follows_derive_warn_type_priority():
+    values = pd.Series(['Closure Permanent', 'Temporary layoff', None, 'nothing', 'Layoff'], dtype=object)
+    assert warn_type_column(values).tolist() == [
+        WarnType.CLOSURE, WarnType.TEMPORARY_LAYOFF, None, None, WarnType.PERMANENT_LAYOFF,
+    ]
+
+
+def test_frame_to_records_fills_missing_columns():
+    frame = pd.DataFrame({'company': ['Acme', 'Beta'], 'impacted': [10, None], 'link': 'https://example.com/a.xlsx'})
+    records = frame_to_records(frame, "tx")
+    assert records[0]['employer']['name'] == 'Acme'
+    assert records[0]['location']['state'] == 'tx'
+    assert records[1]['impacted'] is None
+    assert records[1]['link'] == 'https://example.com/a.xlsx'
+
+
+def test_column_map_resolves_once_and_reports_missing():
+    from src.convert import ColumnMap
+
+    headers = ['Company Name (* Denotes update)', 'No. Of\nEmployees', 'Notice Date']
+    columns = ColumnMap(headers, {
+        'company': ['Company Name', 'Company'],
+        'impacted': ['No. Of Employees'],
+        'warn_date': ['Processed Date', 'Notice Date'],
+        'layoff_date': ['Effective Date'],
+    }, contains={'company': 'company'})
+
+    assert columns.positions == {'company': 0, 'impacted': 1, 'warn_date': 2}
+    assert columns.matched['warn_date'] == 'Notice Date'
+    assert columns.missing == ['layoff_date']
+
+    df = pd.DataFrame([['Acme', 5, '1/1/2024']], columns=headers)
+    assert columns.column(df, 'impacted').tolist() == [5]
+    assert columns.column(df, 'layoff_date').tolist() == [None]
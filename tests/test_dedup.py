@@ -0,0 +1,32 @@
+from src.dedup import Deduper, fingerprint
+
+
+def test_exact_duplicates_ignore_suffixes_and_punctuation(record):
+    assert fingerprint(record("Acme, Inc.")) == fingerprint(record("ACME Incorporated"))
+    deduper = Deduper("ca")
+    kept = deduper.filter([record("Acme, Inc."), record("Acme Corp")], "xlsx")
+    kept += deduper.filter([record("ACME INC"), record("Acme", city="San Jose")], "pdf")
+    assert [r["employer"]["name"] for r in kept] == ["Acme, Inc.", "Acme"]
+    assert deduper.counts["xlsx"] == {"records": 2, "exact": 1, "near": 0}
+    assert deduper.counts["pdf"] == {"records": 2, "exact": 1, "near": 0}
+
+
+def test_near_duplicates_are_conservative(record):
+    deduper = Deduper()
+    assert deduper.add(record("Lockheed Martin Space Systems"))
+    # A typo in one source is the same notice
+    assert not deduper.add(record("Lockheed Martin Space Sytems"))
+    assert deduper.counts[None]["near"] == 1
+    # Different buildings, headcounts or days are different notices
+    assert deduper.add(record("Cepheid B3"))
+    assert deduper.add(record("Cepheid B6"))
+    assert deduper.add(record("Lockheed Martin Space Systemz", impacted=99))
+    assert deduper.add(record("Lockheed Martin Space Sytems", warn_date="2024-01-06"))
+
+
+def test_sites_in_one_city_are_separate_notices(record):
+    deduper = Deduper("ca")
+    sites = [record("Synopsys, Inc.", street=street, city="Sunnyvale", zip="94085") for street in ("800 N MARY AVE", "770 N MARY AVE")]
+    assert deduper.filter(sites, "xlsx") == sites
+    # The same site again, from another report, is still a repeat
+    assert not deduper.add(record("SYNOPSYS INC", street="800 N Mary Ave.", city="Sunnyvale", zip="94085-1234"), "pdf")
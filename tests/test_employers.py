@@ -0,0 +1,48 @@
+from src.employers import assign_ids, canonical_name, cluster_names, load_ids, resolve_states
+from src.output import load_records, write_records
+
+
+def test_canonical_name():
+    assert canonical_name("Amazon.com Services LLC") == "amazon services"
+    assert canonical_name("AMAZON.COM SERVICES, L.L.C.") == "amazon services"
+    assert canonical_name("Acme Holdings Inc. d/b/a Burger Barn") == "acme holdings"
+    assert canonical_name("The Boeing Company") == "boeing"
+    assert canonical_name(None) == ""
+
+
+def test_cluster_names():
+    names = ["amazon services", "amazn services", "amazon", "lockheed martin", "lockheed martin space",
+             "lockheed martin aeronautics", "cepheid b3", "cepheid b6", "si international", "stg international"]
+    groups = cluster_names(names)
+    assert ["amazn services", "amazon", "amazon services"] in groups
+    # Ambiguous prefixes, different numbers and different first words stay apart
+    assert ["lockheed martin"] in groups
+    assert ["cepheid b3"] in groups and ["si international"] in groups
+    assert len(groups) == 8
+
+
+def test_sites_with_a_shared_prefix_stay_apart():
+    names = ["four seasons hotel austin", "four seasons hotel houston", "abm texas tcc northeast", "abm texas tcc northwest",
+             "management training gist state jail", "management training lindsey state jail",
+             "jeld wen windows and doors", "jeld wen windows doors", "berry plastics adhes", "berry plastics adhesives"]
+    groups = cluster_names(names)
+    # Different words are different sites; "and" and truncated words are spellings
+    assert ["jeld wen windows and doors", "jeld wen windows doors"] in groups
+    assert ["berry plastics adhes", "berry plastics adhesives"] in groups
+    assert len(groups) == 8
+
+
+def test_ids_are_stable_across_runs(record, tmp_path, monkeypatch):
+    first = assign_ids([["acme"], ["beta"]])
+    again = assign_ids([["acme", "acme widgets"], ["beta"], ["gamma"]], first)
+    assert again["acme"] == again["acme widgets"] == first["acme"]
+    assert again["beta"] == first["beta"]
+    assert again["gamma"] not in (first["acme"], first["beta"])
+
+    monkeypatch.chdir(tmp_path)
+    write_records("data/tx.json", [record("Amazon.com Services LLC"), record("Beta Corp")], compress=False, legacy_json=False)
+    write_records("data/wa.json", [record("AMAZON.COM SERVICES, LLC")], compress=False, legacy_json=False)
+    assert resolve_states(["tx", "wa"], "data/employers.json") == {"tx": 2, "wa": 1}
+    tx, wa = load_records("data/tx.json"), load_records("data/wa.json")
+    assert tx[0]["employer_id"] == wa[0]["employer_id"] != tx[1]["employer_id"]
+    assert load_ids("data/employers.json")["amazon services"] == tx[0]["employer_id"]
@@ -0,0 +1,46 @@
+import datetime
+import pytest
+from src.export import COLUMNS, export_parquet, flatten_record, load_parquet
+from src.output import write_records
+
+pytest.importorskip("pyarrow")
+
+RECORD = {
+    "employer": {"name": "Acme", "address": None},
+    "location": {"street": "1 Main St", "municipality": "Austin", "state": "tx", "zip": "78701"},
+    "union": {"name": "Union", "address": {"street": None, "municipality": "Providence", "state": "RI", "zip": "02906"}},
+    "contact": None,
+    "warn_date": "2024-03-01",
+    "layoff_date": None,
+    "type": "Closure",
+    "impacted": 12,
+    "notes": None,
+    "link": "https://example.com/warn.xlsx",
+}
+
+
+def test_flatten_record_fills_every_column():
+    row = flatten_record(RECORD, "tx")
+    assert set(row) == set(COLUMNS) | {"state", "warn_year"}
+    assert row["location_municipality"] == "Austin"
+    assert row["union_municipality"] == "Providence"
+    assert row["employer_street"] is None
+    assert row["warn_year"] == 2024
+
+
+def test_load_reads_only_requested_slice(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    older = dict(RECORD, warn_date="2019-05-02", impacted=None)
+    undated = dict(RECORD, warn_date=None)
+    write_records("data/tx.json", [RECORD, older, undated], compress=False, legacy_json=False)
+    write_records("data/ca.json", [dict(RECORD, warn_date="2024-07-01")], compress=False, legacy_json=False)
+
+    assert export_parquet("data/warn.parquet", states=["tx", "ca"]) == 4
+    everything = load_parquet("data/warn.parquet")
+    assert len(everything) == 4
+    assert str(everything["state"].dtype) == "category"
+
+    tx_2024 = load_parquet("data/warn.parquet", columns=["employer_name", "warn_date", "impacted"], states=["tx"], years=[2024])
+    assert list(tx_2024.columns) == ["employer_name", "warn_date", "impacted"]
+    assert tx_2024.to_dict("records") == [{"employer_name": "Acme", "warn_date": datetime.date(2024, 3, 1), "impacted": 12}]
+    assert load_parquet("data/warn.parquet", columns=["impacted"], years=[2019])["impacted"].isna().all()
@@ -0,0 +1,34 @@
+import threading
+import time
+from src.fetch import fetch_partitions
+
+
+def test_partitions_keep_order_and_respect_per_host_limit():
+    in_flight = {}
+    peak = {}
+    lock = threading.Lock()
+
+    def fetch(url):
+        host = url.split("/")[2]
+        with lock:
+            in_flight[host] = in_flight.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), in_flight[host])
+        time.sleep(0.05)
+        with lock:
+            in_flight[host] -= 1
+        if url.endswith("2019"):
+            raise ValueError("missing year")
+        return url[-4:]
+
+    urls = [f"https://a.example.gov/warn{year}" for year in range(2010, 2026)] + ["https://b.example.gov/warn2024"]
+    start = time.perf_counter()
+    results = fetch_partitions(urls, fetch, workers=8, per_host=3)
+    elapsed = time.perf_counter() - start
+
+    assert [url for url, _, _ in results] == urls
+    assert [result for url, result, error in results if not error] == [u[-4:] for u in urls if not u.endswith("2019")]
+    errors = [(url, error) for url, _, error in results if error]
+    assert len(errors) == 1 and isinstance(errors[0][1], ValueError)
+    assert peak["a.example.gov"] == 3
+    # 16 partitions, 3 at a time: about 6 rounds instead of 17 sequential fetches
+    assert elapsed < 17 * 0.05
@@ -0,0 +1,71 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from src.http_cache import DownloadCache
+
+FILES = {"/a.pdf": b"a" * 1000, "/b.xlsx": b"b" * 1000, "/c.pdf": b"c" * 1000}
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = FILES.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        etag = f'"{len(body)}-{self.path}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_unchanged_file_is_revalidated_not_downloaded(tmp_path, server):
+    cache = DownloadCache(cache_dir=str(tmp_path))
+    first = cache.get(f"{server}/a.pdf")
+    second = cache.get(f"{server}/a.pdf")
+    assert first.status == 200 and not first.not_modified
+    assert second.not_modified
+    assert second.content == FILES["/a.pdf"]
+    assert (cache.hits, cache.misses, cache.bytes_saved) == (1, 1, 1000)
+    assert cache.stats().startswith("download cache: 1 not modified, 1 downloaded")
+
+
+def test_errors_raise_and_are_not_cached(tmp_path, server):
+    cache = DownloadCache(cache_dir=str(tmp_path))
+    with pytest.raises(requests.HTTPError) as e:
+        cache.get(f"{server}/missing.pdf")
+    assert e.value.response.status_code == 404
+    assert os.listdir(tmp_path) == []
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, server):
+    cache = DownloadCache(cache_dir=str(tmp_path), max_bytes=2000)
+    a = cache.get(f"{server}/a.pdf")
+    b = cache.get(f"{server}/b.xlsx")
+    # Make a.pdf older than b.xlsx, then use it again so b.xlsx is least recently used
+    os.utime(a.path, (0, 0))
+    os.utime(b.path, (1, 1))
+    cache.get(f"{server}/a.pdf")
+    cache.get(f"{server}/c.pdf")
+    assert os.path.exists(a.path)
+    assert not os.path.exists(b.path)
+    assert len([n for n in os.listdir(tmp_path) if n.endswith(".body")]) == 2
@@ -0,0 +1,41 @@
+import datetime
+import numpy as np
+import pytest
+from pydantic import ValidationError
+from src.models import WarnRecord, Employee, Address, WarnType, record_dict
+
+LINK = "https://example.com/warn.xlsx"
+
+
+def model_dump(union=None, **fields):
+    return WarnRecord(
+        employer=Employee(name=fields.get('company')),
+        location=Address(street=fields.get('street'), municipality=fields.get('municipality'), state=fields.get('state'), zip=fields.get('zip')),
+        union=union,
+        warn_date=fields.get('warn_date'),
+        layoff_date=fields.get('layoff_date'),
+        type=fields.get('type'),
+        impacted=fields.get('impacted'),
+        notes=fields.get('notes'),
+        link=fields.get('link'),
+    ).model_dump(mode='json')
+
+
+@pytest.mark.parametrize("fields", [
+    # Normalized values take the fast path
+    dict(company="Acme", municipality="Austin", state="tx", warn_date=datetime.date(2024, 1, 5), type=WarnType.CLOSURE, impacted=12, link=LINK),
+    dict(company="Acme", state="tx", link="https://example.com"),
+    dict(company=None, state="tx"),
+    # Anything else is validated by the models
+    dict(company="Acme", state="tx", warn_date=datetime.datetime(2024, 1, 5), impacted=np.int64(3), type="Closure"),
+    dict(company="Acme", state="RI", union={'name': "Union", 'address': {'state': "RI"}}),
+])
+def test_record_dict_matches_model_dump(fields):
+    assert record_dict(**fields) == model_dump(**fields)
+
+
+def test_record_dict_rejects_bad_values():
+    with pytest.raises(ValidationError):
+        record_dict(company="Acme", state="tx", link="not a url")
+    with pytest.raises(ValidationError):
+        record_dict(company=12, state="tx")
@@ -0,0 +1,41 @@
+import json
+import pytest
+from src.output import RecordWriter, jsonl_path, load_records, write_records
+
+RECORDS = [{"employer": {"name": "Acme"}, "impacted": 10, "notes": "Café"}, {"employer": {"name": "Beta"}, "impacted": None}]
+
+
+def test_legacy_json_matches_json_dump(tmp_path):
+    output_file = str(tmp_path / "tx.json")
+    write_records(output_file, RECORDS, compress=False, legacy_json=True)
+    with open(output_file) as f:
+        assert f.read() == json.dumps(RECORDS, indent=2)
+    assert load_records(output_file) == RECORDS
+
+    write_records(output_file, [], compress=False, legacy_json=True)
+    with open(output_file) as f:
+        assert f.read() == "[]"
+
+
+def test_gzip_replaces_plain_jsonl(tmp_path):
+    output_file = str(tmp_path / "tx.json")
+    write_records(output_file, RECORDS[:1], compress=False, legacy_json=False)
+    write_records(output_file, RECORDS, compress=True, legacy_json=False)
+    assert not (tmp_path / "tx.jsonl").exists()
+    assert not (tmp_path / "tx.json").exists()
+    assert jsonl_path(output_file, True).endswith("tx.jsonl.gz")
+    assert load_records(output_file) == RECORDS
+
+
+def test_failed_scrape_keeps_previous_output(tmp_path):
+    output_file = str(tmp_path / "tx.json")
+    write_records(output_file, RECORDS, compress=False, legacy_json=False)
+    with pytest.raises(RuntimeError):
+        with RecordWriter(output_file, compress=False, legacy_json=False) as writer:
+            writer.write_all(RECORDS[:1])
+            # Lines are readable while the scrape is still running
+            with open(writer.partial_path) as f:
+                assert len(f.readlines()) == 1
+            raise RuntimeError("scrape failed")
+    assert load_records(output_file) == RECORDS
+    assert not (tmp_path / "tx.jsonl.partial").exists()
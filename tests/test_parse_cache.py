@@ -0,0 +1,70 @@
+import pytest
+from src.parse_cache import cached_parse
+
+URL = "https://example.com/2024_WARN.pdf"
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "2024_WARN.pdf"
+    path.write_bytes(b"%PDF first")
+    return path
+
+
+def counting_parser(records):
+    calls = []
+
+    def parse():
+        calls.append(1)
+        return records
+    return parse, calls
+
+
+def test_same_bytes_are_parsed_once(tmp_path, source):
+    parse, calls = counting_parser([{"n": 1}])
+    cache_dir = str(tmp_path / "cache")
+    assert cached_parse(str(source), URL, "nm-pdf", 1, parse, cache_dir) == [{"n": 1}]
+    assert cached_parse(str(source), URL, "nm-pdf", 1, parse, cache_dir) == [{"n": 1}]
+    assert len(calls) == 1
+
+
+def test_changed_bytes_or_version_reparse(tmp_path, source):
+    parse, calls = counting_parser([{"n": 1}])
+    cache_dir = str(tmp_path / "cache")
+    cached_parse(str(source), URL, "nm-pdf", 1, parse, cache_dir)
+    cached_parse(str(source), URL, "nm-pdf", 2, parse, cache_dir)
+    source.write_bytes(b"%PDF second")
+    cached_parse(str(source), URL, "nm-pdf", 2, parse, cache_dir)
+    assert len(calls) == 3
+
+
+def test_failed_parse_is_not_cached(tmp_path, source):
+    cache_dir = str(tmp_path / "cache")
+
+    def broken():
+        raise ValueError("bad table")
+    with pytest.raises(ValueError):
+        cached_parse(str(source), URL, "nm-pdf", 1, broken, cache_dir)
+
+    parse, calls = counting_parser([{"n": 1}])
+    assert cached_parse(str(source), URL, "nm-pdf", 1, parse, cache_dir) == [{"n": 1}]
+    assert len(calls) == 1
+
+
+def test_records_stream_and_partial_reads_are_not_cached(tmp_path, source):
+    from src.parse_cache import cached_records
+    cache_dir = str(tmp_path / "cache")
+    produced = []
+
+    def produce():
+        for n in range(3):
+            produced.append(n)
+            yield {"n": n}
+
+    records = cached_records(str(source), URL, "tx-xlsx", 1, produce, cache_dir)
+    assert next(records) == {"n": 0} and produced == [0]
+    records.close()
+    assert list(cached_records(str(source), URL, "tx-xlsx", 1, produce, cache_dir)) == [{"n": 0}, {"n": 1}, {"n": 2}]
+    assert produced == [0, 0, 1, 2]
+    assert list(cached_records(str(source), URL, "tx-xlsx", 1, produce, cache_dir)) == [{"n": 0}, {"n": 1}, {"n": 2}]
+    assert produced == [0, 0, 1, 2]
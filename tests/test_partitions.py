@@ -0,0 +1,59 @@
+from datetime import datetime
+from src.partitions import PartitionStore
+
+THIS_YEAR = datetime.now().year
+OLD_YEAR = THIS_YEAR - 5
+
+
+def test_old_years_seal_and_are_skipped(tmp_path):
+    store = PartitionStore("md", horizon=2, reseal=False, root=str(tmp_path))
+    store.write(OLD_YEAR, [{"n": 1}])
+    store.write(THIS_YEAR, [{"n": 2}])
+
+    store = PartitionStore("md", horizon=2, reseal=False, root=str(tmp_path))
+    assert store.pending([THIS_YEAR, OLD_YEAR]) == [THIS_YEAR]
+    assert store.assemble([THIS_YEAR, OLD_YEAR]) == [{"n": 2}, {"n": 1}]
+
+
+def test_empty_old_year_is_not_sealed(tmp_path):
+    store = PartitionStore("md", horizon=2, reseal=False, root=str(tmp_path))
+    store.write(OLD_YEAR, [])
+    store.write("current", [{"n": 1}])
+    assert store.pending(["current", OLD_YEAR]) == ["current", OLD_YEAR]
+
+
+def test_reseal_refetches_everything(tmp_path):
+    store = PartitionStore("md", horizon=2, reseal=False, root=str(tmp_path))
+    store.write(OLD_YEAR, [{"n": 1}])
+
+    store = PartitionStore("md", horizon=2, reseal=True, root=str(tmp_path))
+    assert store.pending([OLD_YEAR]) == [OLD_YEAR]
+    store.write(OLD_YEAR, [{"n": 3}])
+    assert PartitionStore("md", horizon=2, reseal=False, root=str(tmp_path)).pending([OLD_YEAR]) == []
+    assert store.assemble([OLD_YEAR]) == [{"n": 3}]
+
+
+def test_new_parser_version_refetches_sealed_years(tmp_path):
+    store = PartitionStore("md", horizon=2, reseal=False, root=str(tmp_path), version=1)
+    store.write(OLD_YEAR, [{"n": 1}])
+    assert PartitionStore("md", horizon=2, reseal=False, root=str(tmp_path), version=1).pending([OLD_YEAR]) == []
+
+    store = PartitionStore("md", horizon=2, reseal=False, root=str(tmp_path), version=2)
+    assert store.pending([OLD_YEAR]) == [OLD_YEAR]
+    store.write(OLD_YEAR, [{"n": 1, "employer_id": None}])
+    assert PartitionStore("md", horizon=2, reseal=False, root=str(tmp_path), version=2).pending([OLD_YEAR]) == []
+
+
+def test_refresh_keeps_last_copy_of_failed_years(tmp_path):
+    store = PartitionStore("md", horizon=2, reseal=False, root=str(tmp_path))
+    store.write(THIS_YEAR, [{"n": 1}])
+    urls = {THIS_YEAR: "https://a.example.gov/this", OLD_YEAR: "https://a.example.gov/old"}
+
+    def parse(url, text):
+        if url.endswith("this"):
+            raise ValueError("table missing")
+        return [{"n": text}]
+
+    failed = store.refresh(urls, lambda url: url[-3:], parse)
+    assert failed == [THIS_YEAR]
+    assert store.assemble(urls) == [{"n": 1}, {"n": "old"}]
@@ -0,0 +1,18 @@
+from benchmarks.pdf_fixture import ROWS_PER_PAGE, write_fixture
+from src import ca
+from src.pdf_tables import extract_page_tables
+
+
+def test_process_pool_keeps_page_order(tmp_path):
+    path = write_fixture(str(tmp_path / "ca.pdf"), pages=8)
+    serial = extract_page_tables(path, "extract_table", workers=1)
+    parallel = extract_page_tables(path, "extract_table", workers=2)
+    assert len(serial) == 8
+    assert parallel == serial
+
+
+def test_ca_parse_pdf_reads_every_row(tmp_path):
+    path = write_fixture(str(tmp_path / "ca.pdf"), pages=2)
+    records = ca.parse_pdf(path, "https://edd.ca.gov/warn.pdf", workers=1)
+    assert len(records) == 2 * ROWS_PER_PAGE
+    assert all(r["location"]["state"] == "ca" for r in records)
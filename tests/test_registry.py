@@ -0,0 +1,28 @@
+from src.registry import ScraperKind, all_scrapers, state_modules
+
+
+def test_every_state_module_registers_an_entry_point():
+    scrapers = all_scrapers()
+    assert list(scrapers) == state_modules()
+    for state, scraper in scrapers.items():
+        assert scraper.state == state
+        assert callable(scraper.scrape)
+        assert isinstance(scraper.kind, ScraperKind)
+        assert scraper.output_file == f"data/{state}.json"
+
+
+def test_partial_scrape_is_reported_and_not_a_success(monkeypatch):
+    from src.registry import SCRAPERS, PartialScrape, Scraper
+    from src.run_all import ScraperJob
+
+    def scrape():
+        raise PartialScrape("zz", ["https://example.com/2024.pdf"], [{"n": 1}, {"n": 2}])
+
+    monkeypatch.setitem(SCRAPERS, "zz", Scraper(state="zz", scrape=scrape, kind=ScraperKind.HTML))
+    job = ScraperJob(SCRAPERS["zz"])
+    job.start()
+    job._worker.join()
+    job.finish()
+    assert job.status == "PARTIAL"
+    assert job.records == 2
+    assert "2024.pdf" in job.error
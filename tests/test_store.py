@@ -0,0 +1,61 @@
+from src.store import connect, ingest, query
+from src.utils import normalize_name
+
+LINK = "https://example.com/warn.xlsx"
+
+
+def test_normalize_name():
+    assert normalize_name("  ACME, Inc. ") == "acme inc"
+    assert normalize_name(None) == ""
+
+
+def test_ingest_upserts_and_prunes(record, tmp_path):
+    db = str(tmp_path / "warn.db")
+    conn = connect(db)
+    first = [record("Acme, Inc.", "2024-01-05"), record("Beta LLC", "2023-06-01"), record("Gamma", "2022-02-02")]
+    assert ingest(conn, "tx", first) == {"inserted": 3, "updated": 0, "removed": 0}
+
+    # Same notice with a corrected headcount and different punctuation, one new, one withdrawn
+    second = [record("ACME Inc", "2024-01-05", impacted=12), record("Beta LLC", "2023-06-01"), record("Delta", "2024-03-01")]
+    assert ingest(conn, "tx", second) == {"inserted": 1, "updated": 2, "removed": 1}
+    conn.close()
+
+    rows = query(db_path=db)
+    assert [r["employer"]["name"] for r in rows] == ["Delta", "ACME Inc", "Beta LLC"]
+    assert rows[1]["impacted"] == 12
+
+
+def test_query_filters(record, tmp_path):
+    db = str(tmp_path / "warn.db")
+    conn = connect(db)
+    ingest(conn, "tx", [record("Acme Inc", "2024-01-05"), record("Beta LLC", "2023-06-01")])
+    ingest(conn, "ca", [record("Acme Holdings", "2024-02-01", city="Fresno")])
+    conn.close()
+
+    assert len(query(state="TX", db_path=db)) == 2
+    assert [r["warn_date"] for r in query(since="2024-01-01", db_path=db)] == ["2024-02-01", "2024-01-05"]
+    assert [r["warn_date"] for r in query(until="2024-01-05", state="tx", db_path=db)] == ["2024-01-05", "2023-06-01"]
+    assert len(query(employer_like="ACME", db_path=db)) == 2
+    assert len(query(employer_like="acme h%", db_path=db)) == 1
+    # Matched against the normalized name, like the stored employer_norm
+    assert len(query(employer_like="Acme, Inc.", db_path=db)) == 1
+    assert len(query(employer_like="Acme H%", db_path=db)) == 1
+
+
+def test_notices_sharing_a_key_are_all_stored(record, tmp_path):
+    conn = connect(str(tmp_path / "warn.db"))
+    # One employer, date and site; separate notices with their own counts
+    notices = [record("Hostess Brands", "2012-05-04", impacted=n, link=f"https://example.com/notice/{n}") for n in (71, 73, 75)]
+    assert ingest(conn, "az", notices) == {"inserted": 3, "updated": 0, "removed": 0}
+    assert ingest(conn, "az", notices) == {"inserted": 0, "updated": 3, "removed": 0}
+    assert sorted(r["impacted"] for r in query(state="az", db_path=str(tmp_path / "warn.db"))) == [71, 73, 75]
+    conn.close()
+
+
+def test_prune_keeps_rows_of_a_report_with_no_records(record, tmp_path):
+    conn = connect(str(tmp_path / "warn.db"))
+    pdf = "https://example.com/2023.pdf"
+    ingest(conn, "ca", [record("Acme", "2023-01-05", link=pdf), record("Beta", "2023-02-01", link=pdf), record("Gamma", "2024-01-05", link=LINK)])
+    # The PDF failed this run; Gamma was withdrawn
+    assert ingest(conn, "ca", [record("Delta", "2024-03-01", link=LINK)]) == {"inserted": 1, "updated": 0, "removed": 1}
+    conn.close()
@@ -0,0 +1,43 @@
+import datetime
+import openpyxl
+import pytest
+from src import tx
+from src.xlsx import SheetReader, open_workbook
+
+LINK = "https://example.com/warn.xlsx"
+
+
+@pytest.fixture
+def workbook_path(tmp_path):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["TX WARN notices"])
+    sheet.append(["NOTICE_DATE", "Unused", "JOB_SITE_NAME", "TOTAL_LAYOFF_NUMBER", "CITY_NAME"])
+    for i in range(7):
+        sheet.append([datetime.datetime(2024, 1, i + 1), "x", f"Company {i}", float(i * 10), "Austin"])
+    sheet.append([])
+    sheet.append([None, "x", "N/A", "", None])
+    path = tmp_path / "tx.xlsx"
+    workbook.save(path)
+    return str(path)
+
+
+def test_reader_yields_only_mapped_columns(workbook_path):
+    workbook = open_workbook(workbook_path)
+    reader = SheetReader(workbook.active, tx.COLUMNS, header=1)
+    rows = list(reader)
+    workbook.close()
+    assert reader.fields == ['company', 'city', 'warn_date', 'impacted']
+    assert reader.columns.missing == ['county', 'layoff_date']
+    assert rows[0] == ("Company 0", "Austin", datetime.datetime(2024, 1, 1), 0)
+    # The blank row is skipped, "N/A" and "" read as missing
+    assert len(rows) == 7
+
+
+def test_chunks_keep_row_order(workbook_path):
+    workbook = open_workbook(workbook_path)
+    reader = SheetReader(workbook.active, tx.COLUMNS, header=1)
+    chunks = list(reader.chunks(size=3))
+    workbook.close()
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert [name for chunk in chunks for name in chunk['JOB_SITE_NAME']] == [f"Company {i}" for i in range(7)]